@@ -0,0 +1,122 @@
+"""
+Author-centric search strategy: take the top N authors of the current
+keyword search results, pull their publications, then do the same for
+their most-cited collaborators.
+
+Author records and their paper lists (paperId, title and year only) come
+from one POST /author/batch, so a whole ranking of authors costs one
+request; only the papers kept per author are then hydrated via
+/paper/batch. Both are cached per record by SemanticScholarInterface, so
+authors and papers that recur across reviews cost nothing the second time.
+Papers are deduplicated against the results the expansion started from.
+"""
+import logging
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from literature_reviewer.tools.components.data_ingestion.semantic_scholar import (
+    SemanticScholarInterface,
+    _run_sync,
+)
+from literature_reviewer.tools.components.data_ingestion.s2_deduplication import S2ResultDeduplicator
+
+logger = logging.getLogger(__name__)
+
+
+def rank_authors(papers: List[Dict], exclude_ids=()) -> List[Tuple[str, int]]:
+    """
+    Counts how many of the given papers each author appears on, most
+    frequent first (ties broken by authorId for determinism).
+    """
+    counts = Counter()
+    for paper in papers:
+        if not paper:
+            continue
+        for author in paper.get("authors") or []:
+            author_id = author.get("authorId")
+            if author_id and author_id not in exclude_ids:
+                counts[author_id] += 1
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+class AuthorExpander:
+    def __init__(
+        self,
+        s2_interface: SemanticScholarInterface,
+        top_n_authors: int = 5,
+        papers_per_author: int = 100,
+        top_n_collaborators: int = 0,
+        collaborator_candidates: int = 50,
+    ):
+        """
+        :param top_n_authors: Authors taken from the current result set.
+        :param papers_per_author: `limit` on each author's paper list.
+        :param top_n_collaborators: Most-cited co-authors of the top authors whose papers are pulled too.
+        :param collaborator_candidates: Most frequent co-authors considered when picking the most-cited ones.
+        """
+        self.s2_interface = s2_interface
+        self.top_n_authors = top_n_authors
+        self.papers_per_author = papers_per_author
+        self.top_n_collaborators = top_n_collaborators
+        self.collaborator_candidates = collaborator_candidates
+
+
+    def expand(self, search_results: List[Dict]) -> List[Dict]:
+        return _run_sync(self.async_expand(search_results))
+
+
+    async def async_expand(self, search_results: List[Dict]) -> List[Dict]:
+        """
+        Returns papers by the top authors (and collaborators) that are not
+        already in search_results, with "matchedQueries" naming the author
+        each paper was found through.
+        """
+        deduplicator = S2ResultDeduplicator()
+        for paper in search_results:
+            deduplicator.add(paper)
+        new_papers = []
+
+        top_author_ids = [author_id for author_id, _ in rank_authors(search_results)[:self.top_n_authors]]
+        top_authors, top_author_papers = await self.s2_interface.async_get_authors_with_papers(
+            top_author_ids, limit=self.papers_per_author
+        )
+        self._collect(top_authors, top_author_ids, top_author_papers, deduplicator, new_papers)
+
+        if self.top_n_collaborators > 0:
+            collaborator_ids = await self._top_collaborators(top_author_ids, top_author_papers)
+            collaborators, collaborator_papers = await self.s2_interface.async_get_authors_with_papers(
+                collaborator_ids, limit=self.papers_per_author
+            )
+            self._collect(collaborators, collaborator_ids, collaborator_papers, deduplicator, new_papers)
+
+        logger.info(f"Author expansion found {len(new_papers)} new papers")
+        return new_papers
+
+
+    async def _top_collaborators(self, author_ids: List[str], author_papers: List[List[Dict]]) -> List[str]:
+        """
+        Co-authors of the top authors, most frequent first, re-ranked by
+        citation count.
+        """
+        all_papers = [paper for papers in author_papers for paper in papers]
+        candidate_ids = [
+            author_id for author_id, _ in
+            rank_authors(all_papers, exclude_ids=set(author_ids))[:self.collaborator_candidates]
+        ]
+        candidates = await self.s2_interface.async_get_authors(candidate_ids)
+        ranked = sorted(
+            (candidate for candidate in candidates if candidate),
+            key=lambda candidate: candidate.get("citationCount") or 0,
+            reverse=True,
+        )
+        return [candidate["authorId"] for candidate in ranked[:self.top_n_collaborators]]
+
+
+    @staticmethod
+    def _collect(authors, author_ids, author_papers, deduplicator, new_papers):
+        for author, author_id, papers in zip(authors, author_ids, author_papers):
+            author_name = (author or {}).get("name", author_id)
+            for paper in papers:
+                record = deduplicator.add(paper, query=f"papers of author {author_name}")
+                if record is not None:
+                    new_papers.append(record)
@@ -0,0 +1,175 @@
+"""
+Budgeted best-first expansion of the citation graph around seed papers.
+
+Keyword queries miss papers that use different vocabulary for the same
+work. Following /references and /citations from papers we already have
+finds them, but the graph fans out quickly, so the crawl is:
+- best-first: the frontier is ordered by embedding similarity of each
+  paper (title + abstract) to the user goals,
+- batched: the top few frontier papers are expanded concurrently,
+- bounded: hard caps on new papers, API requests and wall time.
+
+Papers are deduplicated with S2ResultDeduplicator and requests go through
+SemanticScholarInterface, so the response cache applies as well.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Sequence
+
+from literature_reviewer.tools.components.data_ingestion.semantic_scholar import (
+    SemanticScholarInterface,
+    _run_sync,
+)
+from literature_reviewer.tools.components.data_ingestion.s2_deduplication import S2ResultDeduplicator
+
+logger = logging.getLogger(__name__)
+
+
+def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _paper_text(paper: Dict) -> str:
+    text = "\n".join(part for part in (paper.get("title"), paper.get("abstract")) if part)
+    # embedding APIs reject empty strings
+    return text or paper["paperId"]
+
+
+class CitationGraphExpander:
+    def __init__(
+        self,
+        s2_interface: SemanticScholarInterface,
+        embedding_function,
+        user_goals_text: str,
+        max_papers: int = 50,
+        max_requests: int = 200,
+        max_seconds: float = 300.0,
+        batch_size: int = 8,
+        neighbours_per_paper: int = 50,
+        directions: Sequence[str] = ("references", "citations"),
+        min_similarity: Optional[float] = None,
+    ):
+        """
+        :param embedding_function: Anything with langchain's embed_query/embed_documents.
+        :param max_papers: Stop once this many new papers have been found.
+        :param max_requests: Upper bound on /references + /citations calls.
+        :param max_seconds: Wall-time budget for the whole crawl.
+        :param batch_size: Frontier papers expanded concurrently per step.
+        :param neighbours_per_paper: `limit` for each /references or /citations call.
+        :param min_similarity: New papers scoring below this are neither kept nor expanded.
+        """
+        self.s2_interface = s2_interface
+        self.embedding_function = embedding_function
+        self.user_goals_text = user_goals_text
+        self.max_papers = max_papers
+        self.max_requests = max_requests
+        self.max_seconds = max_seconds
+        self.batch_size = batch_size
+        self.neighbours_per_paper = neighbours_per_paper
+        self.directions = tuple(directions)
+        self.min_similarity = min_similarity
+        self.num_requests = 0
+
+
+    def expand(self, seed_papers: List[Dict]) -> List[Dict]:
+        return _run_sync(self.async_expand(seed_papers))
+
+
+    async def async_expand(self, seed_papers: List[Dict]) -> List[Dict]:
+        """
+        Returns the new papers found around the seeds, most similar to the
+        user goals first, each carrying its "similarityToGoals" score and
+        the edges it was reached through under "matchedQueries".
+        """
+        start_time = time.monotonic()
+        self.num_requests = 0
+
+        deduplicator = S2ResultDeduplicator()
+        for paper in seed_papers:
+            deduplicator.add(paper)
+
+        goals_embedding = await asyncio.to_thread(self.embedding_function.embed_query, self.user_goals_text)
+
+        # heap entries: (-score, tie-breaker, paper); seeds go first
+        tie_breaker = itertools.count()
+        frontier = [
+            (-math.inf, next(tie_breaker), paper)
+            for paper in seed_papers if paper and paper.get("paperId")
+        ]
+        heapq.heapify(frontier)
+        found_papers = []
+
+        requests_per_paper = len(self.directions)
+        while frontier and len(found_papers) < self.max_papers:
+            remaining_seconds = self.max_seconds - (time.monotonic() - start_time)
+            affordable_papers = (self.max_requests - self.num_requests) // requests_per_paper
+            if remaining_seconds <= 0 or affordable_papers <= 0:
+                break
+
+            batch = [
+                heapq.heappop(frontier)[2]
+                for _ in range(min(self.batch_size, affordable_papers, len(frontier)))
+            ]
+            try:
+                new_papers = await asyncio.wait_for(
+                    self._expand_batch(batch, deduplicator), timeout=remaining_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Citation graph expansion hit its time budget mid-batch")
+                break
+
+            scores = await self._score(new_papers, goals_embedding)
+            for paper, score in zip(new_papers, scores):
+                paper["similarityToGoals"] = score
+                if self.min_similarity is not None and score < self.min_similarity:
+                    continue
+                found_papers.append(paper)
+                heapq.heappush(frontier, (-score, next(tie_breaker), paper))
+
+        found_papers.sort(key=lambda paper: paper["similarityToGoals"], reverse=True)
+        found_papers = found_papers[:self.max_papers]
+        logger.info(
+            f"Citation graph expansion found {len(found_papers)} new papers with "
+            f"{self.num_requests} requests in {time.monotonic() - start_time:.1f}s"
+        )
+        return found_papers
+
+
+    async def _expand_batch(self, batch: List[Dict], deduplicator: S2ResultDeduplicator) -> List[Dict]:
+        paper_ids = [paper["paperId"] for paper in batch]
+        self.num_requests += len(paper_ids) * len(self.directions)
+
+        async with self.s2_interface._client_session() as session:
+            per_direction_results = await asyncio.gather(*[
+                self.s2_interface.async_get_related_papers(
+                    paper_ids,
+                    direction=direction,
+                    limit=self.neighbours_per_paper,
+                    session=session,
+                )
+                for direction in self.directions
+            ])
+
+        new_papers = []
+        for direction, per_paper_neighbours in zip(self.directions, per_direction_results):
+            for paper_id, neighbours in zip(paper_ids, per_paper_neighbours):
+                for neighbour in neighbours:
+                    record = deduplicator.add(neighbour, query=f"{direction} of {paper_id}")
+                    if record is not None:
+                        new_papers.append(record)
+        return new_papers
+
+
+    async def _score(self, papers: List[Dict], goals_embedding: List[float]) -> List[float]:
+        if not papers:
+            return []
+        embeddings = await asyncio.to_thread(
+            self.embedding_function.embed_documents, [_paper_text(paper) for paper in papers]
+        )
+        return [_cosine_similarity(goals_embedding, embedding) for embedding in embeddings]
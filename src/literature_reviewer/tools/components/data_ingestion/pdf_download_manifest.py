@@ -0,0 +1,121 @@
+"""
+Per-run record of what happened to each paper's PDF.
+
+Every paper with an open-access link gets a row: pending when its download
+is submitted, then downloaded, or failed with the reason and the number of
+attempts so far, or excluded once the evaluation rejects it. Lookups go by
+paperId instead of listing the download folder per result, failed URLs are
+not retried forever, and rows are committed as each download finishes, so
+a crashed run picks up exactly the papers that never completed.
+"""
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from literature_reviewer.tools.components.data_ingestion.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DOWNLOADED = "downloaded"
+FAILED = "failed"
+EXCLUDED = "excluded"
+
+
+class PDFDownloadManifest(SQLiteStore):
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        super().__init__(manifest_path, schema=[
+            """
+            CREATE TABLE IF NOT EXISTS downloads (
+                paper_id TEXT PRIMARY KEY,
+                url TEXT,
+                state TEXT NOT NULL,
+                reason TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+            """,
+        ])
+
+
+    def get(self, paper_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT paper_id, url, state, reason, attempts FROM downloads WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("paper_id", "url", "state", "reason", "attempts"), row))
+
+
+    def state(self, paper_id: str) -> Optional[str]:
+        entry = self.get(paper_id)
+        return entry["state"] if entry else None
+
+
+    def mark_pending(self, paper_id: str, url: str):
+        self._upsert(
+            """
+            INSERT INTO downloads (paper_id, url, state, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (paper_id) DO UPDATE SET url = excluded.url, state = excluded.state, updated_at = excluded.updated_at
+            """,
+            (paper_id, url, PENDING, time.time()),
+        )
+
+
+    def mark_downloaded(self, paper_id: str):
+        self._upsert(
+            """
+            INSERT INTO downloads (paper_id, state, attempts, updated_at) VALUES (?, ?, 1, ?)
+            ON CONFLICT (paper_id) DO UPDATE SET
+                state = excluded.state, reason = NULL, attempts = attempts + 1, updated_at = excluded.updated_at
+            """,
+            (paper_id, DOWNLOADED, time.time()),
+        )
+
+
+    def mark_failed(self, paper_id: str, reason: str):
+        self._upsert(
+            """
+            INSERT INTO downloads (paper_id, state, reason, attempts, updated_at) VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT (paper_id) DO UPDATE SET
+                state = excluded.state, reason = excluded.reason, attempts = attempts + 1, updated_at = excluded.updated_at
+            """,
+            (paper_id, FAILED, reason, time.time()),
+        )
+
+
+    def mark_excluded(self, paper_ids: Iterable[str]):
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                """
+                INSERT INTO downloads (paper_id, state, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (paper_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at
+                """,
+                [(paper_id, EXCLUDED, now) for paper_id in paper_ids],
+            )
+            self._connection.commit()
+
+
+    def _upsert(self, statement: str, values: tuple):
+        with self._lock:
+            self._connection.execute(statement, values)
+            self._connection.commit()
+
+
+    def paper_ids_in_state(self, state: str) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT paper_id FROM downloads WHERE state = ? ORDER BY paper_id", (state,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT state, COUNT(*) FROM downloads GROUP BY state"
+            ).fetchall()
+        return dict(rows)
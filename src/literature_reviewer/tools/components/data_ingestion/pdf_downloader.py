@@ -0,0 +1,296 @@
+"""
+Concurrent download manager for open-access PDFs.
+
+Publisher servers vary wildly in speed, so downloading one paper at a
+time spends most of a run waiting on the slowest hosts in sequence.
+Downloads here run on a thread pool with:
+- one keep-alive requests.Session per worker thread (connection pooling),
+- a global cap (worker count) and a per-host cap on concurrent downloads,
+  so no single publisher gets hammered. Jobs wait in a queue per host and
+  are handed to the pool only when their host has a free slot, so a host
+  with many queued papers never ties up workers that other hosts could use,
+- separate connect and read timeouts,
+- progress metrics (counts, bytes, throughput) logged as downloads finish.
+
+Bodies are streamed in chunks to a temporary file next to the target and
+renamed into place only once complete, so memory per worker is bounded by
+the chunk size and an interrupted download never leaves a partial PDF
+behind. Responses that do not start with %PDF- (paywall and landing pages)
+or that grow past `max_bytes` are abandoned after the first chunk that
+gives them away.
+
+With a PDFStore (store_path, or the PDF_STORE_PATH environment variable)
+papers fetched by any earlier run are linked from the store instead of
+downloaded, and new downloads are added to it.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from literature_reviewer.tools.components.data_ingestion.pdf_store import PDFStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "literature-reviewer/0.0 (open-access PDF downloader)"
+PDF_MAGIC = b"%PDF-"
+
+
+class DownloadRejected(ValueError):
+    """
+    The server answered, but not with an acceptable PDF.
+    """
+
+
+class DownloadResult(NamedTuple):
+    paper_id: str
+    url: str
+    path: str
+    ok: bool
+    num_bytes: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    from_store: bool = False
+
+
+class DownloadStats:
+    """
+    Running totals across all downloads of a manager. Thread-safe.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.from_store = 0
+        self.num_bytes = 0
+        self.failures_by_host = Counter()
+
+    def record(self, result: DownloadResult):
+        with self._lock:
+            if result.ok and result.from_store:
+                self.succeeded += 1
+                self.from_store += 1
+            elif result.ok:
+                self.succeeded += 1
+                self.num_bytes += result.num_bytes
+            else:
+                self.failed += 1
+                self.failures_by_host[urlparse(result.url).netloc] += 1
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    def summary(self) -> str:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return (
+            f"{self.completed}/{self.submitted} downloads done "
+            f"({self.succeeded} ok of which {self.from_store} from the PDF store, {self.failed} failed), "
+            f"{self.num_bytes / 1e6:.1f} MB in {elapsed:.1f}s "
+            f"({self.num_bytes / 1e6 / elapsed:.2f} MB/s, {self.completed / elapsed:.2f} files/s)"
+        )
+
+
+class PDFDownloadManager:
+    def __init__(
+        self,
+        max_workers: int = 16,
+        max_per_host: int = 4,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        user_agent: str = DEFAULT_USER_AGENT,
+        progress_every: int = 10,
+        max_bytes: int = 100 * 1024 * 1024,
+        chunk_size: int = 64 * 1024,
+        store_path: Optional[str] = None,
+        store_max_bytes: int = 5 * 1024 * 1024 * 1024,
+    ):
+        """
+        :param max_workers: Global cap on concurrent downloads.
+        :param max_per_host: Cap on concurrent downloads from any one host.
+        :param connect_timeout: Seconds to establish a connection.
+        :param read_timeout: Seconds to wait between bytes from the server.
+        :param progress_every: Log a progress line after this many completed downloads.
+        :param max_bytes: Downloads larger than this are abandoned.
+        :param chunk_size: Bytes read from the socket and written to disk at a time.
+        :param store_path: Folder of the cross-run PDF store. Defaults to the 'PDF_STORE_PATH' environment variable; no store if neither is set.
+        :param store_max_bytes: Size cap of the PDF store.
+        """
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.timeout = (connect_timeout, read_timeout)
+        self.user_agent = user_agent
+        self.progress_every = progress_every
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.stats = DownloadStats()
+        store_path = store_path or os.getenv("PDF_STORE_PATH")
+        self.store = PDFStore(store_path, max_bytes=store_max_bytes) if store_path else None
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: List[Future] = []
+        self._thread_local = threading.local()
+        self._sessions: List[requests.Session] = []
+        # jobs waiting for a slot on their host, and downloads running per host
+        self._host_queues: Dict[str, deque] = defaultdict(deque)
+        self._host_active: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-download")
+        self.stats = DownloadStats()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wait()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        for session in self._sessions:
+            session.close()
+        self._sessions = []
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_per_host, pool_maxsize=self.max_per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = self.user_agent
+            self._thread_local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def submit(self, paper_id: str, url: str, path: str) -> Future:
+        """
+        Queues a download of `url` to `path`. Returns a future resolving to
+        a DownloadResult; download errors are captured there, not raised.
+        """
+        if self._executor is None:
+            raise RuntimeError("PDFDownloadManager must be used as a context manager")
+        future = Future()
+        job = (paper_id, url, path, future)
+        host = urlparse(url).netloc
+        with self._lock:
+            self.stats.submitted += 1
+            self._futures.append(future)
+            if self._host_active[host] >= self.max_per_host:
+                self._host_queues[host].append(job)
+                return future
+            self._host_active[host] += 1
+        self._executor.submit(self._run_job, host, job)
+        return future
+
+    def _run_job(self, host: str, job: tuple):
+        """
+        Runs one download in a pool thread, then hands the host's slot to
+        its next queued job (or frees it) before resolving the job's future.
+        """
+        paper_id, url, path, future = job
+        try:
+            result = self._download(paper_id, url, path)
+        except Exception as e:
+            self._release_host(host)
+            future.set_exception(e)
+            return
+        self._release_host(host)
+        future.set_result(result)
+
+    def _release_host(self, host: str):
+        with self._lock:
+            if self._host_queues[host]:
+                next_job = self._host_queues[host].popleft()
+            else:
+                next_job = None
+                self._host_active[host] -= 1
+        if next_job is not None:
+            self._executor.submit(self._run_job, host, next_job)
+
+    def wait(self) -> List[DownloadResult]:
+        results = [future.result() for future in self._futures]
+        self._futures = []
+        if results:
+            logger.info(self.stats.summary())
+        return results
+
+    def download_all(self, jobs: Iterable[Tuple[str, str, str]]) -> List[DownloadResult]:
+        """
+        Convenience for a whole batch of (paper_id, url, path) jobs.
+        """
+        with self:
+            for paper_id, url, path in jobs:
+                self.submit(paper_id, url, path)
+            return self.wait()
+
+    def _download(self, paper_id: str, url: str, path: str) -> DownloadResult:
+        start = time.monotonic()
+        try:
+            if self.store is not None and self.store.link_into(paper_id, path):
+                result = DownloadResult(
+                    paper_id, url, path, True, os.path.getsize(path), time.monotonic() - start, from_store=True
+                )
+                logger.info(f"Linked PDF from store: {paper_id}")
+                self.stats.record(result)
+                return result
+
+            num_bytes, sha256 = self._stream_to_file(url, path)
+            if self.store is not None:
+                self.store.add(paper_id, path, source_url=url, sha256=sha256)
+            result = DownloadResult(paper_id, url, path, True, num_bytes, time.monotonic() - start)
+            logger.info(f"Downloaded PDF: {paper_id} ({num_bytes / 1e3:.0f} kB in {result.seconds:.1f}s)")
+        except Exception as e:
+            result = DownloadResult(paper_id, url, path, False, 0, time.monotonic() - start, str(e))
+            logger.error(f"Failed to download PDF: {url}. Error: {str(e)}")
+
+        self.stats.record(result)
+        if self.progress_every and self.stats.completed % self.progress_every == 0:
+            logger.info(self.stats.summary())
+        return result
+
+    def _stream_to_file(self, url: str, path: str) -> Tuple[int, str]:
+        """
+        Streams the response body into `path` via a temporary file and
+        returns the number of bytes written and their SHA-256.
+        """
+        with self._session().get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            declared_length = response.headers.get("Content-Length")
+            if declared_length and declared_length.isdigit() and int(declared_length) > self.max_bytes:
+                raise DownloadRejected(f"Content-Length {declared_length} exceeds the {self.max_bytes} byte limit")
+
+            temp_path = f"{path}.part"
+            num_bytes = 0
+            digest = hashlib.sha256()
+            head = b""
+            try:
+                with open(temp_path, "wb") as temp_file:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        if len(head) < len(PDF_MAGIC):
+                            head += chunk[:len(PDF_MAGIC)]
+                            if len(head) >= len(PDF_MAGIC) and not head.startswith(PDF_MAGIC):
+                                content_type = response.headers.get("Content-Type", "unknown")
+                                raise DownloadRejected(f"Response is not a PDF (Content-Type: {content_type})")
+                        num_bytes += len(chunk)
+                        if num_bytes > self.max_bytes:
+                            raise DownloadRejected(f"Download exceeds the {self.max_bytes} byte limit")
+                        digest.update(chunk)
+                        temp_file.write(chunk)
+                if not head.startswith(PDF_MAGIC):
+                    raise DownloadRejected("Response is too short to be a PDF")
+                os.replace(temp_path, path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        return num_bytes, digest.hexdigest()
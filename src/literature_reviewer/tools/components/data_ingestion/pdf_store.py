@@ -0,0 +1,201 @@
+"""
+Content-addressed PDF store shared between review runs.
+
+Every run writes its PDFs to a fresh timestamped downloaded_pdfs folder,
+so without a shared store each rerun downloads the same papers again.
+Here each PDF is kept once under its SHA-256, with a SQLite manifest
+mapping paperIds to content hashes. Run folders get hardlinks into the
+store (a copy where hardlinks are not possible), and the least recently
+used files are evicted once the store passes a size cap. Evicting a file
+does not affect run folders that already link to it.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import time
+from typing import Dict, Optional
+
+from literature_reviewer.tools.components.data_ingestion.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+def sha256_of_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PDFStore(SQLiteStore):
+    def __init__(
+        self,
+        store_path: str,
+        max_bytes: int = 5 * 1024 * 1024 * 1024,
+    ):
+        """
+        :param store_path: Folder holding the manifest and the PDFs. Created if missing.
+        :param max_bytes: Upper bound on the summed size of stored PDFs.
+        """
+        self.store_path = store_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(os.path.join(store_path, "objects"), exist_ok=True)
+        super().__init__(os.path.join(store_path, "manifest.sqlite"), schema=[
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS papers (
+                paper_id TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL REFERENCES blobs (sha256),
+                source_url TEXT
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS blobs_last_accessed ON blobs (last_accessed)",
+        ])
+
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.store_path, "objects", sha256[:2], f"{sha256}.pdf")
+
+
+    def lookup(self, paper_id: str) -> Optional[str]:
+        """
+        Returns the stored PDF for paper_id, or None if it was never stored
+        or has been evicted.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT sha256 FROM papers WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            sha256 = row[0]
+            blob_path = self.blob_path(sha256)
+            if not os.path.exists(blob_path):
+                # removed behind the store's back; forget it
+                self._forget_blob(sha256)
+                self._connection.commit()
+                self.misses += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE blobs SET last_accessed = ? WHERE sha256 = ?", (time.time(), sha256)
+            )
+            self._connection.commit()
+            self.hits += 1
+        return blob_path
+
+
+    def link_into(self, paper_id: str, dest_path: str) -> bool:
+        """
+        Places the stored PDF for paper_id at dest_path. Returns False if
+        the store does not have it.
+        """
+        blob_path = self.lookup(paper_id)
+        if blob_path is None:
+            return False
+        _link_or_copy(blob_path, dest_path)
+        return True
+
+
+    def add(self, paper_id: str, file_path: str, source_url: Optional[str] = None, sha256: Optional[str] = None) -> str:
+        """
+        Stores the PDF at file_path under its content hash and records it
+        for paper_id. Returns the hash.
+        """
+        sha256 = sha256 or sha256_of_file(file_path)
+        blob_path = self.blob_path(sha256)
+        size = os.path.getsize(file_path)
+        if size > self.max_bytes:
+            logger.info(f"Not storing PDF for {paper_id} of {size} bytes, larger than the store")
+            return sha256
+
+        now = time.time()
+        with self._lock:
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                _link_or_copy(file_path, blob_path)
+            self._connection.execute(
+                """
+                INSERT INTO blobs (sha256, size, created_at, last_accessed) VALUES (?, ?, ?, ?)
+                ON CONFLICT (sha256) DO UPDATE SET last_accessed = excluded.last_accessed
+                """,
+                (sha256, size, now, now),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO papers (paper_id, sha256, source_url) VALUES (?, ?, ?)",
+                (paper_id, sha256, source_url),
+            )
+            self._evict_to_size()
+            self._connection.commit()
+        return sha256
+
+
+    def _forget_blob(self, sha256: str):
+        self._connection.execute("DELETE FROM papers WHERE sha256 = ?", (sha256,))
+        self._connection.execute("DELETE FROM blobs WHERE sha256 = ?", (sha256,))
+
+
+    def _evict_to_size(self):
+        total_size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs"
+        ).fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+
+        rows = self._connection.execute(
+            "SELECT sha256, size FROM blobs ORDER BY last_accessed ASC"
+        ).fetchall()
+        for sha256, size in rows:
+            if total_size <= self.max_bytes:
+                break
+            blob_path = self.blob_path(sha256)
+            if os.path.exists(blob_path):
+                os.remove(blob_path)
+            self._forget_blob(sha256)
+            total_size -= size
+            self.evictions += 1
+
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            papers = self._connection.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+            blobs, total_size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "papers": papers,
+            "files": blobs,
+            "bytes": total_size,
+        }
+
+
+def _link_or_copy(source_path: str, dest_path: str):
+    """
+    Hardlinks source_path to dest_path, copying instead across
+    filesystems. An existing dest_path is replaced.
+    """
+    temp_path = f"{dest_path}.link"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    try:
+        os.link(source_path, temp_path)
+    except OSError:
+        shutil.copyfile(source_path, temp_path)
+    os.replace(temp_path, dest_path)
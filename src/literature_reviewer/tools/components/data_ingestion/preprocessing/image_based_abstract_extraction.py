@@ -1,4 +1,12 @@
+"""
+Vision-model fallback for papers whose abstract is not available as text.
+
+Only the first page_limit pages are rendered (the abstract is near the
+start), at a modest DPI, and each page is sent as a downscaled grayscale
+JPEG, which keeps both rendering time and image payloads small.
+"""
 import base64, io, json
+from PIL import Image
 from pdf2image import convert_from_path
 from literature_reviewer.agents.components.model_call import ModelInterface
 from literature_reviewer.agents.components.frameworks_and_models import PromptFramework, Model
@@ -6,9 +14,22 @@ from literature_reviewer.tools.components.input_output_models.response_formats i
 from literature_reviewer.tools.components.prompts.literature_search_query import generate_abstract_extraction_from_image_sys_prompt
 
 
-def extract_abstract_from_pdf(pdf_path: str, model_interface: ModelInterface, page_limit: int=2) -> str | None:
+def extract_abstract_from_pdf(
+    pdf_path: str,
+    model_interface: ModelInterface,
+    page_limit: int=2,
+    dpi: int=100,
+    max_dimension: int=1600,
+    jpeg_quality: int=70,
+) -> str | None:
+    """
+    :param page_limit: Pages rendered and sent, starting from the first.
+    :param dpi: Rendering resolution.
+    :param max_dimension: Pages are downscaled so their longer side is at most this many pixels.
+    :param jpeg_quality: JPEG quality (1-95) of the images sent to the model.
+    """
     try:
-        images = convert_from_path(pdf_path)
+        images = convert_from_path(pdf_path, dpi=dpi, first_page=1, last_page=page_limit, grayscale=True)
     except Exception as e:
         return f"Warning: Unable to convert PDF to images. Error: {str(e)}"
     
@@ -16,9 +37,7 @@ def extract_abstract_from_pdf(pdf_path: str, model_interface: ModelInterface, pa
     full_abstract_found = False
     for page_num, page in enumerate(images):
         # Convert the current page image to base64
-        buffered = io.BytesIO()
-        page.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
+        img_str = encode_page_as_jpeg(page, max_dimension=max_dimension, jpeg_quality=jpeg_quality)
 
         # Prepare the system and user prompts
         system_prompt = generate_abstract_extraction_from_image_sys_prompt()
@@ -35,13 +54,25 @@ def extract_abstract_from_pdf(pdf_path: str, model_interface: ModelInterface, pa
         abstract += response["abstract_text"].strip() + " "
         full_abstract_found = response["contains_full_abstract"]
 
-        # Check if the abstract is complete
-        if full_abstract_found or page_num >= page_limit:  # Assume abstract doesn't go beyond 3rd page
+        # Check if the abstract is complete (only page_limit pages were rendered)
+        if full_abstract_found:
             break
 
     return abstract.strip() if abstract else None
 
 
+def encode_page_as_jpeg(page: Image.Image, max_dimension: int=1600, jpeg_quality: int=70) -> str:
+    """
+    Downscales a rendered page to at most max_dimension pixels on its longer
+    side and returns it as a base64 grayscale JPEG.
+    """
+    page = page.convert("L")
+    page.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    buffered = io.BytesIO()
+    page.save(buffered, format="JPEG", quality=jpeg_quality, optimize=True)
+    return base64.b64encode(buffered.getvalue()).decode()
+
+
 
 if __name__ == "__main__":
     pdf_path = "/home/christian/literature-reviewer/framework_outputs/gpt4o_mini_mechanobiology_lg_embedding_more_pdfs_20240930_031238/downloaded_pdfs/ee64c41ea80a3c869a940465f271b54a3e6a36e0.pdf"
@@ -3,12 +3,46 @@ Handles extracting text from pdf using langchain's inbuilt functionality
 
 Thanks to: https://github.com/pixegami/rag-tutorial-v2/blob/main/populate_database.py
 For logic here. For some reason I had to turn it into a class...
+
+With a cache_path, per-page text and chunks are cached by file hash (see
+pdf_extraction_cache), so only new or changed PDFs are parsed.
+
+pypdf parsing is pure Python and CPU-bound; with num_workers > 1 files are
+parsed in a process pool. Files are handled in sorted order and results
+are collected in that order, so chunk order does not depend on which
+worker finishes first.
+
+iter_chunks_with_ids streams chunks one PDF at a time for callers that
+embed in batches instead of holding the whole corpus.
+
+Page text is cleaned with text_normalization.normalize_text as it is
+parsed, in the worker process, before it is split or cached.
+
+With chunk_size_unit="tokens", chunk_size and chunk_overlap count tokens
+and chunks come from token_chunker.TokenChunker, which packs paragraphs
+and sections instead of cutting at a character count.
 """
-import os, logging
+import hashlib, os, logging, time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+import pypdf
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain.schema.document import Document
 from pypdf.errors import PdfStreamError, PdfReadError
+from literature_reviewer.tools.components.data_ingestion.pdf_store import sha256_of_file
+from literature_reviewer.tools.components.data_ingestion.preprocessing.pdf_extraction_cache import PDFExtractionCache
+from literature_reviewer.tools.components.data_ingestion.preprocessing.text_normalization import (
+    normalize_flat_text,
+    normalize_text,
+)
+from literature_reviewer.tools.components.data_ingestion.preprocessing.token_chunker import DEFAULT_ENCODING, TokenChunker
+
+# part of the extraction cache key; bump the suffix when loading or splitting changes
+EXTRACTOR_VERSION = f"pypdf-{pypdf.__version__}/recursive-character-splitter/2"
+TOKEN_EXTRACTOR_VERSION = f"pypdf-{pypdf.__version__}/token-chunker-{DEFAULT_ENCODING}/1"
+# 128 bits of SHA-256 per chunk ID
+CHUNK_ID_HEX_DIGITS = 32
 
 
 class LangchainPDFTextExtractor:
@@ -17,50 +51,171 @@ class LangchainPDFTextExtractor:
         input_folder=None,
         chunk_size=800,
         chunk_overlap=80,
-        extract_images=False
+        extract_images=False,
+        cache_path=None,
+        num_workers=1,
+        worker_chunksize=4,
+        chunk_size_unit="characters",
     ):
+        if chunk_size_unit not in ("characters", "tokens"):
+            raise ValueError(f"chunk_size_unit must be 'characters' or 'tokens', not {chunk_size_unit!r}")
         self.input_folder = input_folder
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.extract_images = extract_images
+        self.cache = PDFExtractionCache(cache_path) if cache_path else None
+        self.num_workers = num_workers
+        self.worker_chunksize = worker_chunksize
+        self.chunk_size_unit = chunk_size_unit
+        self.extractor_version = TOKEN_EXTRACTOR_VERSION if chunk_size_unit == "tokens" else EXTRACTOR_VERSION
+        self._token_chunker = None
+        self.load_stats = {}
 
 
     def pdf_directory_to_chunks_with_ids(self):
-        documents = self._load_documents()
-        chunks = self._split_documents(documents)
-        return self._calculate_chunk_ids(chunks)
-
-    
-    def _load_documents(self):
-        all_documents = []
-        for filename in os.listdir(self.input_folder):
-            if filename.lower().endswith('.pdf'):
-                file_path = os.path.join(self.input_folder, filename)
-                try:
-                    # Check if the file is actually a PDF
-                    with open(file_path, 'rb') as f:
-                        if not f.read(5).startswith(b'%PDF-'):
-                            logging.warning(f"File {filename} is not a valid PDF. Skipping.")
-                            continue
-
-                    loader = PyPDFLoader(file_path)
-                    documents = loader.load()
-                    all_documents.extend(documents)
-                    logging.info(f"Successfully loaded {filename}")
-                except (PdfStreamError, PdfReadError) as e:
-                    logging.error(f"Error loading PDF {filename}: {str(e)}")
-                except Exception as e:
-                    logging.error(f"Unexpected error loading PDF {filename}: {str(e)}")
-        
-        if not all_documents:
+        return list(self.iter_chunks_with_ids())
+
+
+    def iter_chunks_with_ids(self):
+        """
+        Yields chunks with IDs one PDF at a time, so memory use does not
+        grow with the number of PDFs in the folder. Parsing runs at most a
+        bounded number of files ahead of the consumer.
+        """
+        num_files = 0
+        num_chunks = 0
+        for chunks in self._iter_file_chunks():
+            num_files += 1
+            num_chunks += len(chunks)
+            yield from self._calculate_chunk_ids(chunks)
+
+        if not num_chunks:
             logging.warning("No documents were successfully loaded.")
         else:
-            logging.info(f"Successfully loaded {len(all_documents)} documents in total.")
-        
-        return all_documents
+            logging.info(f"Split {num_files} PDFs into {num_chunks} chunks in total.")
+        if self.cache is not None:
+            logging.info(f"Extraction cache: {self.cache.hits} PDFs reused, {self.cache.misses} parsed.")
+
+
+    def _pdf_filenames(self):
+        return sorted(filename for filename in os.listdir(self.input_folder) if filename.lower().endswith('.pdf'))
+
+
+    def _iter_file_chunks(self):
+        """
+        Yields the chunks of each PDF in filename order, taken from the
+        extraction cache where possible.
+        """
+        filenames = self._pdf_filenames()
+        if self.cache is None:
+            for _, documents in self._load_pdfs(filenames):
+                if documents:
+                    yield self._split_documents(documents)
+            return
+
+        cache_key = (self.chunk_size, self.chunk_overlap, self.extractor_version)
+        hashes = {}
+        for filename in filenames:
+            try:
+                hashes[filename] = sha256_of_file(os.path.join(self.input_folder, filename))
+            except OSError as e:
+                logging.error(f"Error reading PDF {filename}: {str(e)}")
+        to_parse = [filename for filename, sha256 in hashes.items() if not self.cache.has(sha256, *cache_key)]
+        parsed = self._load_pdfs(to_parse)
+        to_parse = set(to_parse)
+
+        for filename, sha256 in hashes.items():
+            if filename not in to_parse:
+                _, cached_chunks = self.cache.get(sha256, *cache_key)
+                yield _documents_from_cache(cached_chunks, os.path.join(self.input_folder, filename))
+                continue
+
+            _, documents = next(parsed)
+            if not documents:
+                continue
+            chunks = self._split_documents(documents)
+            self.cache.put(
+                sha256, *cache_key,
+                pages=_documents_to_cache(documents),
+                chunks=_documents_to_cache(chunks),
+            )
+            yield chunks
+        # let the parsing generator finish, which shuts down its pool
+        for _ in parsed:
+            pass
+
+
+    def _load_pdfs(self, filenames):
+        """
+        Yields (filename, documents) in the order of filenames, parsing in a
+        process pool when num_workers > 1. Files are submitted in tasks of
+        worker_chunksize files, at most two tasks per worker ahead of the
+        consumer. Timings end up in load_stats.
+        """
+        self.load_stats = {"files": 0, "pages": 0, "parse_seconds": 0.0, "pool_startup_seconds": 0.0}
+        start = time.monotonic()
+
+        if self.num_workers > 1 and len(filenames) > 1:
+            num_workers = min(self.num_workers, len(filenames))
+            pool = ProcessPoolExecutor(max_workers=num_workers)
+            try:
+                pool.submit(_worker_ready).result()
+                self.load_stats["pool_startup_seconds"] = time.monotonic() - start
+                logging.info(
+                    f"Started PDF parsing pool of {num_workers} workers "
+                    f"in {self.load_stats['pool_startup_seconds']:.2f}s"
+                )
+                pending = deque()
+                for index in range(0, len(filenames), self.worker_chunksize):
+                    task_filenames = filenames[index:index + self.worker_chunksize]
+                    task_paths = [os.path.join(self.input_folder, filename) for filename in task_filenames]
+                    pending.append((task_filenames, pool.submit(_load_pdf_files, task_paths)))
+                    if len(pending) >= 2 * num_workers:
+                        yield from self._collect_task(*pending.popleft())
+                while pending:
+                    yield from self._collect_task(*pending.popleft())
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+        else:
+            for filename in filenames:
+                yield filename, self._record_load(filename, *_load_pdf_file(os.path.join(self.input_folder, filename)))
+
+        wall_seconds = time.monotonic() - start
+        self.load_stats["wall_seconds"] = wall_seconds
+        if self.load_stats["files"]:
+            logging.info(
+                f"Parsed {self.load_stats['files']} PDFs ({self.load_stats['pages']} pages) in {wall_seconds:.2f}s: "
+                f"{self.load_stats['files'] / wall_seconds:.2f} files/s, {self.load_stats['pages'] / wall_seconds:.1f} pages/s, "
+                f"{self.load_stats['parse_seconds']:.2f}s of parsing across {max(self.num_workers, 1)} worker(s)"
+            )
+
+
+    def _collect_task(self, task_filenames, future):
+        for filename, result in zip(task_filenames, future.result()):
+            yield filename, self._record_load(filename, *result)
+
+
+    def _record_load(self, filename, documents, seconds, problem):
+        """
+        Logs the outcome of one _load_pdf_file call, which cannot log
+        reliably from a worker process, and adds it to load_stats.
+        """
+        if problem:
+            level, message = problem
+            logging.log(level, message)
+            return []
+        self.load_stats["files"] += 1
+        self.load_stats["pages"] += len(documents)
+        self.load_stats["parse_seconds"] += seconds
+        logging.info(f"Successfully loaded {filename} ({len(documents)} pages in {seconds:.2f}s)")
+        return documents
 
 
     def _split_documents(self, documents: list[Document]):
+        if self.chunk_size_unit == "tokens":
+            if self._token_chunker is None:
+                self._token_chunker = TokenChunker(chunk_tokens=self.chunk_size, overlap_tokens=self.chunk_overlap)
+            return self._token_chunker.split_documents(documents)
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=self.chunk_size,
             chunk_overlap=self.chunk_overlap,
@@ -72,30 +227,80 @@ class LangchainPDFTextExtractor:
 
     @staticmethod
     def _calculate_chunk_ids(chunks):
-        """        
-        This will create IDs like "data/monopoly.pdf:6:2"
-        Page Source : Page Number : Chunk Index
         """
+        This will create IDs like "649def34f8be52c8b66281af98ae884c09aef38b:3f0a9c...":
+        Paper ID : hash of the paper ID and the chunk's normalized text
 
-        last_page_id = None
-        current_chunk_index = 0
+        The paper ID is the PDF's filename without extension (the Semantic
+        Scholar paperId for downloaded papers) and is also stored as
+        "paper_id". The path stays in "source" but is not part of the ID, so
+        the same paper in another run folder gets the same IDs and a shared
+        collection does not embed it again. Identical chunks within a paper
+        are told apart by how often the text occurred before.
+        """
+        occurrences = Counter()
 
         for chunk in chunks:
-            source = chunk.metadata.get("source")
-            page = chunk.metadata.get("page")
-            current_page_id = f"{source}:{page}"
+            paper_id = os.path.splitext(os.path.basename(chunk.metadata.get("source", "")))[0]
+            text = normalize_flat_text(chunk.page_content)
+            occurrences[(paper_id, text)] += 1
+            digest = hashlib.sha256(
+                f"{paper_id}\n{occurrences[(paper_id, text)]}\n{text}".encode("utf-8")
+            ).hexdigest()[:CHUNK_ID_HEX_DIGITS]
 
-            # If the page ID is the same as the last one, increment the index.
-            if current_page_id == last_page_id:
-                current_chunk_index += 1
-            else:
-                current_chunk_index = 0
+            chunk.metadata["paper_id"] = paper_id
+            chunk.metadata["id"] = f"{paper_id}:{digest}"
 
-            # Calculate the chunk ID.
-            chunk_id = f"{current_page_id}:{current_chunk_index}"
-            last_page_id = current_page_id
+        return chunks
 
-            # Add it to the page meta-data.
-            chunk.metadata["id"] = chunk_id
 
-        return chunks
+def _worker_ready():
+    return True
+
+
+def _load_pdf_files(file_paths):
+    return [_load_pdf_file(file_path) for file_path in file_paths]
+
+
+def _load_pdf_file(file_path):
+    """
+    Parses one PDF into one normalized Document per page. Top-level so it
+    can run in a worker process; returns (documents, seconds, problem) where problem
+    is a (log level, message) pair instead of logging.
+    """
+    filename = os.path.basename(file_path)
+    start = time.monotonic()
+    try:
+        # Check if the file is actually a PDF
+        with open(file_path, 'rb') as f:
+            if not f.read(5).startswith(b'%PDF-'):
+                return [], 0.0, (logging.WARNING, f"File {filename} is not a valid PDF. Skipping.")
+
+        documents = PyPDFLoader(file_path).load()
+        for document in documents:
+            document.page_content = normalize_text(document.page_content)
+        return documents, time.monotonic() - start, None
+    except (PdfStreamError, PdfReadError) as e:
+        return [], 0.0, (logging.ERROR, f"Error loading PDF {filename}: {str(e)}")
+    except Exception as e:
+        return [], 0.0, (logging.ERROR, f"Unexpected error loading PDF {filename}: {str(e)}")
+
+
+def _documents_to_cache(documents):
+    """
+    Drops the source path, which is re-attached on load.
+    """
+    return [
+        {
+            "page_content": document.page_content,
+            "metadata": {key: value for key, value in document.metadata.items() if key != "source"},
+        }
+        for document in documents
+    ]
+
+
+def _documents_from_cache(entries, file_path):
+    return [
+        Document(page_content=entry["page_content"], metadata={"source": file_path, **entry["metadata"]})
+        for entry in entries
+    ]
@@ -4,9 +4,15 @@ load_dotenv()
 import json
 import logging
 import os
-import re
 import subprocess
 
+from literature_reviewer.tools.components.data_ingestion.preprocessing.marker_folder_conversion import ShardedMarkerConverter
+from literature_reviewer.tools.components.data_ingestion.preprocessing.marker_worker import MarkerWorker
+from literature_reviewer.tools.components.data_ingestion.preprocessing.text_normalization import (
+    normalize_flat_text,
+    normalize_markdown,
+)
+
 
 class MarkerPDFTextExtractor:
     def __init__(
@@ -17,7 +23,19 @@ class MarkerPDFTextExtractor:
         marker_single_input_filename: str = None,
         marker_single_batch_multiplier: int = 2,
         marker_single_max_pages: int = 10,
+        marker_worker: MarkerWorker = None,
+        marker_threads_per_worker: int = None,
+        marker_timeout_per_file: float = 600.0,
     ):
+        """
+        :param marker_worker: A started MarkerWorker. When given, single-file
+            extraction is sent to it instead of starting marker_single, so
+            the models are loaded once across calls.
+        :param marker_threads_per_worker: CPU threads per worker in
+            extract_folder_pdfs_to_markdown_sharded; an even split of the cores if None.
+        :param marker_timeout_per_file: Seconds before the sharded folder mode
+            gives up on a PDF and restarts the worker converting it.
+        """
         self.pdf_inputs_folder = pdf_inputs_folder
         self.marker_min_length = marker_min_length
         self.marker_num_workers = marker_num_workers
@@ -25,6 +43,9 @@ class MarkerPDFTextExtractor:
         self.marker_single_input_filename = marker_single_input_filename
         self.marker_single_batch_multiplier = marker_single_batch_multiplier
         self.marker_single_max_pages = marker_single_max_pages
+        self.marker_worker = marker_worker
+        self.marker_threads_per_worker = marker_threads_per_worker
+        self.marker_timeout_per_file = marker_timeout_per_file
 
 
     def extract_folder_pdfs_to_markdown(self):
@@ -32,15 +53,15 @@ class MarkerPDFTextExtractor:
         output_folder = os.path.join(input_folder, self.markdown_conversions_folder)
         os.makedirs(output_folder, exist_ok=True)
 
-        existing_files = set(os.listdir(output_folder))
+        existing_files = self._get_existing_file_sets(output_folder)
 
         command = [
             "marker",
             input_folder,
             output_folder,
+            "--workers",
+            str(self.marker_num_workers),
         ]
-        if self.marker_min_length is not None:
-            command.extend(["--workers", str(self.marker_num_workers)])
         if self.marker_min_length is not None:
             command.extend(["--min_length", str(self.marker_min_length)])
             
@@ -68,6 +89,35 @@ class MarkerPDFTextExtractor:
             return None
 
 
+    def extract_folder_pdfs_to_markdown_sharded(self):
+        """
+        Converts the folder with marker_num_workers long-lived workers instead
+        of the marker CLI. PDFs already converted with the same content hash
+        are skipped, and a PDF that exceeds marker_timeout_per_file is given
+        up on without holding back the rest. Returns the conversion summary.
+        """
+        input_folder = self.pdf_inputs_folder
+        output_folder = os.path.join(input_folder, self.markdown_conversions_folder)
+        os.makedirs(output_folder, exist_ok=True)
+
+        existing_files = self._get_existing_file_sets(output_folder)
+
+        converter = ShardedMarkerConverter(
+            num_workers=self.marker_num_workers,
+            threads_per_worker=self.marker_threads_per_worker,
+            timeout_per_file=self.marker_timeout_per_file,
+            batch_multiplier=self.marker_single_batch_multiplier,
+            max_pages=self.marker_single_max_pages,
+        )
+        logging.info(f"Starting sharded marker extraction for {input_folder}")
+        summary = converter.convert_folder(input_folder, output_folder)
+
+        logging.info(f"Starting corrections for {output_folder}")
+        self._correct_new_files(output_folder, existing_files, markdown_normalized=True)
+        logging.info(f"Corrections completed for {output_folder}")
+        return summary
+
+
     def extract_single_pdf_to_markdown(self):
         input_folder = self.pdf_inputs_folder
         input_file = os.path.join(self.pdf_inputs_folder, self.marker_single_input_filename)
@@ -76,6 +126,9 @@ class MarkerPDFTextExtractor:
 
         existing_files = self._get_existing_file_sets(output_folder)
 
+        if self.marker_worker is not None:
+            return self._extract_single_pdf_with_worker(input_file, output_folder, existing_files)
+
         filename = os.path.basename(self.pdf_inputs_folder)
         output_file = os.path.join(output_folder, f"{os.path.splitext(filename)[0]}.md")
 
@@ -109,6 +162,15 @@ class MarkerPDFTextExtractor:
             logging.error(f"Marker stderr: {e.stderr}")
             return None
      
+    def _extract_single_pdf_with_worker(self, input_file: str, output_folder: str, existing_files: dict):
+        result = self.marker_worker.convert(input_file, output_folder, max_pages=self.marker_single_max_pages)
+        if not result.ok:
+            logging.error(f"Error running marker worker on {input_file}: {result.error}")
+            return None
+        logging.info(f"Marker extraction completed for {input_file}")
+        self._correct_new_files(output_folder, existing_files, markdown_normalized=True)
+        return result.output_path
+
     @staticmethod
     def _get_existing_file_sets(parent_output_folder: str): 
         existing_files = {}
@@ -118,7 +180,11 @@ class MarkerPDFTextExtractor:
                 existing_files[folder_name] = set(os.listdir(folder_path))
         return existing_files
      
-    def _correct_new_files(self, output_folder: str, existing_files: dict):
+    def _correct_new_files(self, output_folder: str, existing_files: dict, markdown_normalized: bool = False):
+        """
+        :param markdown_normalized: The markdown was normalized before it was
+            saved (MarkerWorker output), so only the JSON files are rewritten.
+        """
         logging.info(f"Existing files: {existing_files}")
         
         new_files = {}
@@ -136,7 +202,8 @@ class MarkerPDFTextExtractor:
                 file_path = os.path.join(folder_path, filename)
                 logging.info(f"Processing file: {file_path}")
                 if filename.endswith('.md'):
-                    self._postprocess_converted_md(file_path)
+                    if not markdown_normalized:
+                        self._postprocess_converted_md(file_path)
                 elif filename.endswith('.json'):
                     self._postprocess_converted_json(file_path)
                 else:
@@ -146,25 +213,11 @@ class MarkerPDFTextExtractor:
     def _postprocess_converted_md(filename):
         logging.info(f"Starting MD corrections for {filename}")
         """
-        Corrects some easy errors in converted markdown file.
-        Corrections are defined as tuples of (pattern, replacement).
+        Corrects some easy errors in converted markdown file,
+        see text_normalization.normalize_markdown.
         """
-        corrections = (
-            ('.Png', '.png'),
-            ('.Jpg', '.jpg'),
-            ('.Jpeg', '.jpeg'),
-            ('.Gif', '.gif'),
-            ('**', ''),
-            ('__', ''),
-            ('\u0aa0', ' '),
-            ('_Image_', '_image_'),
-        )
-
         with open(filename, 'r', encoding='utf-8') as file:
-            content = file.read()
-
-        for pattern, replacement in corrections:
-            content = content.replace(pattern, replacement)
+            content = normalize_markdown(file.read())
 
         with open(filename, 'w', encoding='utf-8') as file:
             file.write(content)
@@ -175,33 +228,15 @@ class MarkerPDFTextExtractor:
     def _postprocess_converted_json(filename):
         logging.info(f"Starting JSON corrections for {filename}")
         """
-        Corrects common errors in the converted JSON file.
-        Corrections are defined as tuples of (pattern, replacement).
+        Corrects common errors in the converted JSON file,
+        see text_normalization.normalize_flat_text.
         """
-        corrections = (
-            ('\u0aa0', ' '),
-            ('\r\n', ' '),
-            ('\n', ' '),
-            ('\r', ' '),
-            ('\t', ' '),
-            ('\v', ' '),
-            ('\f', ' '),
-        )
-
         with open(filename, 'r', encoding='utf-8') as file:
             data = json.load(file)
 
         def apply_corrections(obj):
             if isinstance(obj, str):
-                for pattern, replacement in corrections:
-                    obj = obj.replace(pattern, replacement)
-                # Replace any remaining control characters with space
-                obj = re.sub(r'[\x00-\x1F\x7F-\x9F]', ' ', obj)
-                # Collapse multiple spaces into a single space
-                obj = re.sub(r'\s+', ' ', obj)
-                # Trim leading and trailing spaces
-                obj = obj.strip()
-                return obj
+                return normalize_flat_text(obj)
             elif isinstance(obj, list):
                 return [apply_corrections(item) for item in obj]
             elif isinstance(obj, dict):
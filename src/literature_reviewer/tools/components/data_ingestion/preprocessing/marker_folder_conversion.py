@@ -0,0 +1,185 @@
+"""
+Parallel Marker conversion of a folder of PDFs.
+
+PDFs are spread over several MarkerWorker processes, each with its own
+CPU-thread budget. Every worker holds one file at a time and picks up the
+next file when it finishes, so the load balances itself. A file that runs
+past the per-file timeout gets its worker killed and relaunched, and the
+file is reported as failed; one pathological PDF cannot stall the batch.
+The relaunched worker reloads its models in the background while the
+others keep converting.
+
+A manifest in the output folder records the SHA-256 of every converted
+PDF. Files whose current hash matches and whose output still exists are
+skipped, so reruns only convert new or changed PDFs.
+"""
+import json
+import logging
+import os
+import queue
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from literature_reviewer.tools.components.data_ingestion.pdf_store import sha256_of_file
+from literature_reviewer.tools.components.data_ingestion.preprocessing.marker_worker import MarkerJobResult, MarkerWorker
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "conversion_manifest.json"
+# job id of the failed result reported for a file whose worker was abandoned
+ABANDONED_JOB_ID = -1
+
+
+class ShardedMarkerConverter:
+    def __init__(
+        self,
+        num_workers: int = 2,
+        threads_per_worker: Optional[int] = None,
+        timeout_per_file: float = 600.0,
+        batch_multiplier: int = 2,
+        max_pages: Optional[int] = None,
+        poll_interval: float = 0.2,
+    ):
+        """
+        :param num_workers: Worker processes, each holding its own copy of the models.
+        :param threads_per_worker: CPU threads per worker. Defaults to an even split of the machine's cores.
+        :param timeout_per_file: Seconds after which a conversion is abandoned and its worker restarted.
+        :param max_pages: Pages converted per PDF; all if None.
+        """
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // num_workers)
+        self.timeout_per_file = timeout_per_file
+        self.batch_multiplier = batch_multiplier
+        self.max_pages = max_pages
+        self.poll_interval = poll_interval
+
+
+    def convert_folder(self, input_folder: str, output_folder: str) -> Dict[str, List[str]]:
+        """
+        Converts every PDF in input_folder that has no up-to-date output.
+        Returns the filenames that were converted, skipped and failed.
+        """
+        os.makedirs(output_folder, exist_ok=True)
+        manifest_path = os.path.join(output_folder, MANIFEST_FILENAME)
+        manifest = _load_manifest(manifest_path)
+        summary = {"converted": [], "skipped": [], "failed": []}
+
+        hashes = {}
+        to_convert = deque()
+        for filename in sorted(os.listdir(input_folder)):
+            if not filename.lower().endswith(".pdf"):
+                continue
+            sha256 = sha256_of_file(os.path.join(input_folder, filename))
+            entry = manifest.get(filename)
+            if entry and entry["sha256"] == sha256 and os.path.exists(entry["output_path"]):
+                summary["skipped"].append(filename)
+                continue
+            hashes[filename] = sha256
+            to_convert.append(filename)
+
+        logger.info(
+            f"Converting {len(to_convert)} PDFs with {self.num_workers} Marker workers "
+            f"({self.threads_per_worker} threads each); {len(summary['skipped'])} already converted"
+        )
+        if not to_convert:
+            return summary
+
+        workers = [
+            MarkerWorker(batch_multiplier=self.batch_multiplier, num_threads=self.threads_per_worker)
+            for _ in range(min(self.num_workers, len(to_convert)))
+        ]
+        for worker in workers:
+            worker.launch()
+        # worker index -> (filename, job id, start time)
+        in_flight = {}
+        # indexes of workers relaunched after a failure, still loading models
+        restarting = set()
+        try:
+            for worker in workers:
+                worker.wait_until_ready()
+
+            while to_convert or in_flight:
+                for index in sorted(restarting):
+                    try:
+                        if not workers[index].is_ready(timeout=0 if in_flight else self.poll_interval):
+                            continue
+                    except RuntimeError as e:
+                        logger.error(f"Marker worker {index} could not be restarted ({e}); continuing without it")
+                        workers[index] = None
+                    restarting.discard(index)
+                if not in_flight and not restarting and not any(workers):
+                    raise RuntimeError(f"No Marker workers left with {len(to_convert)} PDFs still to convert")
+
+                for index, worker in enumerate(workers):
+                    if worker is not None and index not in in_flight and index not in restarting and to_convert:
+                        filename = to_convert.popleft()
+                        job_id = worker.submit(os.path.join(input_folder, filename), output_folder, self.max_pages)
+                        in_flight[index] = (filename, job_id, time.monotonic())
+
+                for index in list(in_flight):
+                    filename, job_id, started_at = in_flight[index]
+                    result = self._poll(workers[index], filename, started_at)
+                    if result is None:
+                        continue
+                    del in_flight[index]
+                    if result.ok:
+                        manifest[filename] = {"sha256": hashes[filename], "output_path": result.output_path}
+                        _save_manifest(manifest_path, manifest)
+                        summary["converted"].append(filename)
+                    else:
+                        summary["failed"].append(filename)
+                    if result.job_id == ABANDONED_JOB_ID:
+                        # relaunch without waiting for the models, so the
+                        # other workers keep being polled meanwhile
+                        workers[index].close(timeout=0)
+                        workers[index].launch()
+                        restarting.add(index)
+        finally:
+            for index, worker in enumerate(workers):
+                if worker is not None:
+                    worker.close(timeout=0 if index in restarting else 30.0)
+
+        logger.info(
+            f"Marker folder conversion done: {len(summary['converted'])} converted, "
+            f"{len(summary['skipped'])} skipped, {len(summary['failed'])} failed"
+        )
+        return summary
+
+
+    def _poll(self, worker: MarkerWorker, filename: str, started_at: float) -> Optional[MarkerJobResult]:
+        """
+        Returns the worker's result if it is done, a failed result with
+        ABANDONED_JOB_ID if it timed out or died, and None while it is still
+        busy. The caller restarts abandoned workers.
+        """
+        try:
+            return worker.next_result(timeout=self.poll_interval)
+        except queue.Empty:
+            elapsed = time.monotonic() - started_at
+            if elapsed < self.timeout_per_file:
+                return None
+            error = f"timed out after {elapsed:.0f}s"
+        except RuntimeError as e:
+            error = str(e)
+
+        logger.error(f"Marker conversion of {filename} failed ({error}); restarting its worker")
+        return MarkerJobResult(ABANDONED_JOB_ID, filename, False, seconds=time.monotonic() - started_at, error=error)
+
+
+def _load_manifest(manifest_path: str) -> Dict[str, Dict]:
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except json.JSONDecodeError:
+        logger.warning(f"Ignoring unreadable conversion manifest {manifest_path}")
+        return {}
+
+
+def _save_manifest(manifest_path: str, manifest: Dict[str, Dict]):
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(temp_path, manifest_path)
@@ -0,0 +1,271 @@
+"""
+Long-lived Marker conversion worker.
+
+Running the marker/marker_single CLIs starts a new interpreter per call,
+which reloads the layout, OCR and texify models (tens of seconds on CPU)
+before any page is converted. MarkerWorker instead starts one process that
+loads the models once and then takes conversion jobs from a queue, so a
+folder converted one file at a time pays for model loading once.
+
+Jobs and results travel over multiprocessing queues. The worker is started
+with the spawn method, as marker's own CLI does, so no torch state is
+inherited from the parent. Per-job timings give pages/s, and queue_depth
+tells how many submitted jobs have not come back yet. The markdown is
+cleaned with text_normalization.normalize_markdown before it is saved.
+
+num_threads caps the CPU threads torch and the BLAS libraries use inside a
+worker, so several workers can share a machine without oversubscribing it.
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+THREAD_LIMIT_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+
+class MarkerJobResult(NamedTuple):
+    job_id: int
+    pdf_path: str
+    ok: bool
+    output_path: Optional[str] = None
+    num_pages: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _marker_worker_main(job_queue, result_queue, batch_multiplier: int, num_threads: Optional[int] = None):
+    """
+    Worker process: loads the Marker models, reports the load time, then
+    converts jobs until it receives None.
+    """
+    if num_threads:
+        # must happen before torch is imported
+        for env_var in THREAD_LIMIT_ENV_VARS:
+            os.environ[env_var] = str(num_threads)
+        import torch
+        torch.set_num_threads(num_threads)
+
+    from marker.convert import convert_single_pdf
+    from marker.models import load_all_models
+    from marker.output import save_markdown
+
+    from literature_reviewer.tools.components.data_ingestion.preprocessing.text_normalization import normalize_markdown
+
+    start = time.monotonic()
+    models = load_all_models()
+    result_queue.put(("ready", time.monotonic() - start))
+
+    while True:
+        job = job_queue.get()
+        if job is None:
+            break
+        job_id, pdf_path, output_folder, max_pages = job
+        start = time.monotonic()
+        try:
+            full_text, images, metadata = convert_single_pdf(
+                pdf_path, models, max_pages=max_pages, batch_multiplier=batch_multiplier
+            )
+            filename = os.path.basename(pdf_path)
+            full_text = normalize_markdown(full_text)
+            subfolder_path = save_markdown(output_folder, filename, full_text, images, metadata)
+            output_path = os.path.join(subfolder_path, f"{filename.rsplit('.', 1)[0]}.md")
+            result_queue.put(MarkerJobResult(
+                job_id, pdf_path, True, output_path, metadata.get("pages", 0), time.monotonic() - start
+            ))
+        except Exception as e:
+            result_queue.put(MarkerJobResult(
+                job_id, pdf_path, False, seconds=time.monotonic() - start, error=str(e)
+            ))
+
+
+class MarkerWorker:
+    def __init__(
+        self,
+        batch_multiplier: int = 2,
+        startup_timeout: float = 900.0,
+        num_threads: Optional[int] = None,
+    ):
+        """
+        :param batch_multiplier: Passed to marker's convert_single_pdf; higher uses more memory for speed.
+        :param startup_timeout: Seconds allowed for the worker to load its models.
+        :param num_threads: CPU threads the worker may use; unlimited if None.
+        """
+        self.batch_multiplier = batch_multiplier
+        self.num_threads = num_threads
+        self.startup_timeout = startup_timeout
+        self.model_load_seconds = None
+
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._launched_at = None
+        self._job_queue = None
+        self._result_queue = None
+        self._next_job_id = 0
+        self._pending: Dict[int, str] = {}
+        self._finished: Dict[int, MarkerJobResult] = {}
+        self._num_pages = 0
+        self._num_jobs = 0
+        self._convert_seconds = 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        """
+        Starts the worker and blocks until its models are loaded.
+        """
+        if self.is_alive:
+            return
+        self.launch()
+        self.wait_until_ready()
+
+    def launch(self):
+        """
+        Starts the worker process without waiting for it, so several workers
+        can load their models at the same time.
+        """
+        self.model_load_seconds = None
+        self._launched_at = time.monotonic()
+        self._job_queue = self._context.Queue()
+        self._result_queue = self._context.Queue()
+        self._process = self._context.Process(
+            target=_marker_worker_main,
+            args=(self._job_queue, self._result_queue, self.batch_multiplier, self.num_threads),
+            daemon=True,
+        )
+        self._process.start()
+
+    def wait_until_ready(self):
+        while not self.is_ready(timeout=1.0):
+            pass
+
+    def is_ready(self, timeout: float = 0.0) -> bool:
+        """
+        Whether the launched worker has loaded its models, waiting at most
+        timeout seconds. Raises RuntimeError if it died or is still loading
+        after startup_timeout.
+        """
+        if self.model_load_seconds is not None:
+            return True
+        try:
+            _, self.model_load_seconds = self._result_queue.get(timeout=timeout)
+        except queue.Empty:
+            if not self.is_alive or time.monotonic() - self._launched_at >= self.startup_timeout:
+                self.close()
+                raise RuntimeError("Marker worker failed to load its models (is marker-pdf installed?)")
+            return False
+        logger.info(f"Marker worker (pid {self._process.pid}) loaded models in {self.model_load_seconds:.1f}s")
+        return True
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Jobs submitted whose results have not been collected yet.
+        """
+        return len(self._pending)
+
+    def submit(self, pdf_path: str, output_folder: str, max_pages: Optional[int] = None) -> int:
+        if not self.is_alive:
+            raise RuntimeError("Marker worker is not running; call start() first")
+        job_id = self._next_job_id
+        self._next_job_id += 1
+        self._pending[job_id] = pdf_path
+        self._job_queue.put((job_id, pdf_path, output_folder, max_pages))
+        return job_id
+
+    def next_result(self, timeout: Optional[float] = None) -> MarkerJobResult:
+        """
+        Returns the next finished job. Raises queue.Empty after timeout, and
+        RuntimeError if the worker dies (e.g. killed for running out of memory).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = 1.0 if deadline is None else min(max(deadline - time.monotonic(), 0), 1.0)
+            try:
+                result = self._result_queue.get(timeout=wait)
+                break
+            except queue.Empty:
+                if not self.is_alive:
+                    raise RuntimeError(f"Marker worker exited with {self.queue_depth} jobs outstanding")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+        self._pending.pop(result.job_id, None)
+        self._record(result)
+        return result
+
+    def result(self, job_id: int, timeout: Optional[float] = None) -> MarkerJobResult:
+        """
+        Waits for a specific job, keeping other results for later calls.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while job_id not in self._finished:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            result = self.next_result(timeout=remaining)
+            self._finished[result.job_id] = result
+        return self._finished.pop(job_id)
+
+    def convert(
+        self,
+        pdf_path: str,
+        output_folder: str,
+        max_pages: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> MarkerJobResult:
+        return self.result(self.submit(pdf_path, output_folder, max_pages), timeout=timeout)
+
+    def convert_many(self, pdf_paths: List[str], output_folder: str, max_pages: Optional[int] = None) -> List[MarkerJobResult]:
+        job_ids = [self.submit(pdf_path, output_folder, max_pages) for pdf_path in pdf_paths]
+        return [self.result(job_id) for job_id in job_ids]
+
+    def _record(self, result: MarkerJobResult):
+        self._num_jobs += 1
+        self._convert_seconds += result.seconds
+        name = os.path.basename(result.pdf_path)
+        if result.ok:
+            self._num_pages += result.num_pages
+            pages_per_second = result.num_pages / result.seconds if result.seconds else 0.0
+            logger.info(
+                f"Converted {name}: {result.num_pages} pages in {result.seconds:.1f}s "
+                f"({pages_per_second:.2f} pages/s), queue depth {self.queue_depth}"
+            )
+        else:
+            logger.error(f"Marker failed on {name} after {result.seconds:.1f}s: {result.error}")
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "model_load_seconds": self.model_load_seconds or 0.0,
+            "jobs": self._num_jobs,
+            "pages": self._num_pages,
+            "convert_seconds": self._convert_seconds,
+            "pages_per_second": self._num_pages / self._convert_seconds if self._convert_seconds else 0.0,
+            "queue_depth": self.queue_depth,
+        }
+
+    def close(self, timeout: float = 30.0):
+        """
+        Asks the worker to finish its queued jobs and exit; terminates it
+        if it does not within timeout.
+        """
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            self._job_queue.put(None)
+            self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._process = None
+        self._pending.clear()
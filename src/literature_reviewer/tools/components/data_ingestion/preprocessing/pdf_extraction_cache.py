@@ -0,0 +1,113 @@
+"""
+On-disk cache of PDF text extraction results.
+
+Extraction runs over a whole folder, so without a cache every call parses
+every PDF again, including the ones handled by earlier batches or runs.
+Entries are keyed by the file's SHA-256 together with the chunking
+parameters and the extractor version, and hold the per-page text and the
+chunks. The file path is not part of the key: paths are attached again
+when entries are loaded, so a PDF that moved or was linked into another
+run folder is still a hit.
+"""
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from literature_reviewer.tools.components.data_ingestion.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+class PDFExtractionCache(SQLiteStore):
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.hits = 0
+        self.misses = 0
+        super().__init__(cache_path, schema=[
+            """
+            CREATE TABLE IF NOT EXISTS extractions (
+                sha256 TEXT NOT NULL,
+                chunk_size INTEGER NOT NULL,
+                chunk_overlap INTEGER NOT NULL,
+                extractor_version TEXT NOT NULL,
+                pages TEXT NOT NULL,
+                chunks TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (sha256, chunk_size, chunk_overlap, extractor_version)
+            )
+            """,
+        ])
+
+
+    def has(
+        self,
+        sha256: str,
+        chunk_size: int,
+        chunk_overlap: int,
+        extractor_version: str,
+    ) -> bool:
+        """
+        Cheap existence check; this is what the hit and miss counters count.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT 1 FROM extractions
+                WHERE sha256 = ? AND chunk_size = ? AND chunk_overlap = ? AND extractor_version = ?
+                """,
+                (sha256, chunk_size, chunk_overlap, extractor_version),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False
+            self.hits += 1
+        return True
+
+
+    def get(
+        self,
+        sha256: str,
+        chunk_size: int,
+        chunk_overlap: int,
+        extractor_version: str,
+    ) -> Optional[Tuple[List[Dict], List[Dict]]]:
+        """
+        Returns (pages, chunks) as stored by put(), or None on a miss.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT pages, chunks FROM extractions
+                WHERE sha256 = ? AND chunk_size = ? AND chunk_overlap = ? AND extractor_version = ?
+                """,
+                (sha256, chunk_size, chunk_overlap, extractor_version),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), json.loads(row[1])
+
+
+    def put(
+        self,
+        sha256: str,
+        chunk_size: int,
+        chunk_overlap: int,
+        extractor_version: str,
+        pages: List[Dict],
+        chunks: List[Dict],
+    ):
+        """
+        :param pages: One {"page_content", "metadata"} dict per page.
+        :param chunks: One {"page_content", "metadata"} dict per chunk.
+        """
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO extractions
+                (sha256, chunk_size, chunk_overlap, extractor_version, pages, chunks, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (sha256, chunk_size, chunk_overlap, extractor_version, json.dumps(pages), json.dumps(chunks), time.time()),
+            )
+            self._connection.commit()
@@ -0,0 +1,86 @@
+"""
+Heuristic abstract extraction from a PDF's text layer.
+
+Most born-digital papers carry an "Abstract" heading on the first page,
+so the abstract can be cut out of the pypdf text without a vision-model
+call. The result comes with a confidence score built from how clearly it
+was delimited and whether its length is plausible; callers fall back to
+image_based_abstract_extraction below a threshold (e.g. scanned PDFs with
+no text layer, or layouts the heuristics do not recognise).
+"""
+import logging
+import re
+from typing import NamedTuple, Optional
+
+from pypdf import PdfReader
+
+from literature_reviewer.tools.components.data_ingestion.preprocessing.text_normalization import (
+    normalize_flat_text,
+    normalize_text,
+)
+
+logger = logging.getLogger(__name__)
+
+# "Abstract", "ABSTRACT", "A B S T R A C T" (Elsevier), optionally followed by
+# a colon, dash or full stop, and "Summary" as used by some journals
+ABSTRACT_HEADING = re.compile(
+    r"^\s*(?:a\s?b\s?s\s?t\s?r\s?a\s?c\s?t|summary)\b\s*[:.—–-]?\s*",
+    re.IGNORECASE | re.MULTILINE,
+)
+# the first thing after the abstract: keywords, or the first section heading
+ABSTRACT_END = re.compile(
+    r"^\s*(?:(?i:key\s?words|index terms|introduction\s*$|background\s*$)|(?:1\.?|I\.)\s+[A-Z][A-Za-z ]{2,40}$)",
+    re.MULTILINE,
+)
+
+MIN_PLAUSIBLE_WORDS = 50
+MAX_PLAUSIBLE_WORDS = 500
+MAX_UNDELIMITED_CHARS = 3000
+
+
+class TextLayerAbstract(NamedTuple):
+    text: Optional[str]
+    confidence: float
+
+
+def extract_abstract_from_text_layer(pdf_path: str, page_limit: int = 2) -> TextLayerAbstract:
+    """
+    Looks for the abstract in the text of the first page_limit pages.
+
+    Confidence is 0 when there is no text layer or no abstract heading.
+    A heading found on the page is worth 0.4, a recognised end (keywords or
+    the first section) another 0.2, and a length of 50 to 500 words the
+    remaining 0.4. The length only counts for a delimited abstract: without
+    an end the text is a fixed-size slice that runs into the body, whose
+    word count says nothing about the abstract. Either way, an abstract
+    missing its end or of implausible length stays below 0.7.
+    """
+    try:
+        reader = PdfReader(pdf_path)
+        pages = reader.pages[:page_limit]
+        text = "\n".join(page.extract_text() or "" for page in pages)
+    except Exception as e:
+        logger.warning(f"Unable to read the text layer of {pdf_path}: {str(e)}")
+        return TextLayerAbstract(None, 0.0)
+
+    heading = ABSTRACT_HEADING.search(text)
+    if heading is None:
+        return TextLayerAbstract(None, 0.0)
+
+    confidence = 0.4
+    remainder = text[heading.end():]
+    end = ABSTRACT_END.search(remainder)
+    if end is not None:
+        abstract = remainder[:end.start()]
+        confidence += 0.2
+    else:
+        abstract = remainder[:MAX_UNDELIMITED_CHARS]
+
+    abstract = normalize_flat_text(normalize_text(abstract))
+    num_words = len(abstract.split())
+    if num_words == 0:
+        return TextLayerAbstract(None, 0.0)
+    if end is not None and MIN_PLAUSIBLE_WORDS <= num_words <= MAX_PLAUSIBLE_WORDS:
+        confidence += 0.4
+
+    return TextLayerAbstract(abstract, round(confidence, 2))
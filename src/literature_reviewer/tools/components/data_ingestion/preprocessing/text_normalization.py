@@ -0,0 +1,200 @@
+"""
+Text cleanup shared by the PDF extractors.
+
+Each normalizer makes one pass for the single-character fixes (ligatures,
+odd spaces, control characters, invisible characters) through a
+str.translate table, and one pass of a precompiled regex that covers every
+whitespace fix, instead of one full scan of the document per correction.
+The markdown fixes are plain literals and stay str.replace calls.
+
+The extractors apply these to text as it streams through: pypdf pages
+before they are split into chunks, and Marker output before it is saved,
+so converted files are not read back and rewritten.
+
+Run this module to print throughput in MB/s next to the code it replaced:
+python -m literature_reviewer.tools.components.data_ingestion.preprocessing.text_normalization
+"""
+import re
+import time
+from typing import Dict
+
+LIGATURES = {
+    "ﬀ": "ff",
+    "ﬁ": "fi",
+    "ﬂ": "fl",
+    "ﬃ": "ffi",
+    "ﬄ": "ffl",
+    "ﬅ": "st",
+    "ﬆ": "st",
+}
+SPACES = " ઠ             　"
+INVISIBLE = "­​‌‍⁠﻿"
+CONTROL_CHARACTERS = "".join(chr(code) for code in [*range(0x00, 0x20), *range(0x7f, 0xa0)])
+
+
+def _character_table(keep: str = "") -> Dict[str, str]:
+    """
+    :param keep: Characters left as they are, e.g. newlines where the line
+        structure matters.
+    """
+    table = {**LIGATURES, **{char: "" for char in INVISIBLE}, **{char: " " for char in SPACES + CONTROL_CHARACTERS}}
+    if "\n" in keep:
+        # a lone carriage return ends a line too ("\r\n" is folded before the table)
+        table["\r"] = "\n"
+    return {char: replacement for char, replacement in table.items() if char not in keep}
+
+
+class _CharacterFixes:
+    """
+    str.translate is a C loop for ASCII text but a dict lookup per
+    character otherwise, so non-ASCII text (most PDFs) goes through a
+    character-class regex instead, which only stops at the few characters
+    that need fixing. Both give the same result.
+
+    "\r\n" is folded into "\n" first, as a per-character table would turn
+    it into two line breaks.
+    """
+    def __init__(self, table: Dict[str, str]):
+        self.table = table
+        self.ascii_table = str.maketrans({char: replacement for char, replacement in table.items() if char.isascii()})
+        self.pattern = re.compile("[" + "".join(re.escape(char) for char in table) + "]")
+        self._replace = lambda match: table[match.group()]
+
+    def __call__(self, text: str) -> str:
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+        if text.isascii():
+            return text.translate(self.ascii_table)
+        return self.pattern.sub(self._replace, text)
+
+
+# line structure is kept for the chunker
+_fix_characters = _CharacterFixes(_character_table(keep="\n"))
+# and tabs for indented code and tables in markdown
+_fix_markdown_characters = _CharacterFixes(_character_table(keep="\n\t"))
+_fix_characters_flat = _CharacterFixes(_character_table())
+
+# every alternative has to start at a hyphen, space or newline, which lets
+# the regex engine skip ahead; the callback decides what the run becomes
+_LAYOUT_WHITESPACE = re.compile(r"[-\n ][\n ]+")
+# a soft hyphen marks a hyphenation point, so at a line break it is one
+_SOFT_HYPHEN_LINE_BREAK = re.compile("\u00ad *\n *")
+_WHITESPACE_RUNS = re.compile(r"\s{2,}")
+# in the order MarkerPDFTextExtractor applied them
+_MARKDOWN_REPLACEMENTS = (
+    (".Png", ".png"), (".Jpg", ".jpg"), (".Jpeg", ".jpeg"), (".Gif", ".gif"),
+    ("**", ""), ("__", ""), ("_Image_", "_image_"),
+)
+
+
+def _collapse_whitespace(run: str) -> str:
+    newlines = run.count("\n")
+    if newlines > 1:
+        return "\n\n"
+    return "\n" if newlines else " "
+
+
+def _layout_fix(match: re.Match) -> str:
+    run = match.group()
+    if run[0] != "-":
+        return _collapse_whitespace(run)
+    # a word hyphenated across a line break goes back on one line, keeping
+    # the hyphen: "self-\nreported" is a compound, and without a dictionary
+    # it cannot be told apart from a broken word like "teth-\nering"
+    text, start, end = match.string, match.start(), match.end()
+    if run == "-\n" and start and text[start - 1].isalpha() and end < len(text) and text[end].islower():
+        return "-"
+    return "-" + _collapse_whitespace(run[1:])
+
+
+def normalize_text(text: str) -> str:
+    """
+    For text layers: expands ligatures, drops soft hyphens and zero-width
+    characters, rejoins words split by a soft hyphen at a line break, puts
+    words hyphenated across lines back on one line (hyphen kept) and
+    collapses spaces. Paragraph breaks survive as a single blank line.
+    """
+    if "\u00ad" in text:
+        text = _SOFT_HYPHEN_LINE_BREAK.sub("", text)
+    return _LAYOUT_WHITESPACE.sub(_layout_fix, _fix_characters(text)).strip()
+
+
+def normalize_markdown(text: str) -> str:
+    """
+    For Marker output: normalize_text's character fixes except that tabs
+    are kept, plus lowercase image extensions and no bold/underline markers.
+
+    The markdown fixes are the literal replacements of the cleanup this
+    replaced, as each str.replace is a C scan that outruns one regex with a
+    Python callback per "**". The character table is a pass that cleanup
+    did not have, and it is all of the gap to
+    previous_markdown_corrections in benchmark_normalization.
+    """
+    text = _fix_markdown_characters(text)
+    for pattern, replacement in _MARKDOWN_REPLACEMENTS:
+        text = text.replace(pattern, replacement)
+    return text
+
+
+def normalize_flat_text(text: str) -> str:
+    """
+    For JSON string values: every control character and run of whitespace
+    becomes one space.
+    """
+    return _WHITESPACE_RUNS.sub(" ", _fix_characters_flat(text)).strip()
+
+
+def _previous_markdown_corrections(text: str) -> str:
+    # MarkerPDFTextExtractor's markdown cleanup before this module, for comparison
+    for pattern, replacement in (
+        ('.Png', '.png'), ('.Jpg', '.jpg'), ('.Jpeg', '.jpeg'), ('.Gif', '.gif'),
+        ('**', ''), ('__', ''), ('\u0aa0', ' '), ('_Image_', '_image_'),
+    ):
+        text = text.replace(pattern, replacement)
+    return text
+
+
+def _previous_json_corrections(text: str) -> str:
+    # and its JSON string cleanup
+    for pattern, replacement in (
+        ('\u0aa0', ' '), ('\r\n', ' '), ('\n', ' '), ('\r', ' '), ('\t', ' '), ('\v', ' '), ('\f', ' '),
+    ):
+        text = text.replace(pattern, replacement)
+    text = re.sub(r'[\x00-\x1F\x7F-\x9F]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def benchmark_normalization(num_bytes: int = 8 * 1024 * 1024, repeat: int = 3) -> Dict[str, float]:
+    """
+    Returns the best-of-repeat throughput in MB/s of each normalizer, and
+    of the code they replaced, on about num_bytes of pypdf-like text.
+    """
+    paragraph = (
+        "The effect of vertebral growth modulation on scoliosis progression was measured in 42\n"
+        "patients with adolescent idiopathic scoliosis treated with anterior vertebral body teth-\n"
+        "ering. Results were **signiﬁcant** at p < 0.05 for curves above 40° (see ![](_Image_2.Png)).  \n\n\n"
+    )
+    text = paragraph * max(1, num_bytes // len(paragraph.encode("utf-8")))
+    megabytes = len(text.encode("utf-8")) / 1e6
+
+    results = {}
+    for name, normalize in (
+        ("normalize_text", normalize_text),
+        ("normalize_markdown", normalize_markdown),
+        ("previous_markdown_corrections", _previous_markdown_corrections),
+        ("normalize_flat_text", normalize_flat_text),
+        ("previous_json_corrections", _previous_json_corrections),
+    ):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            normalize(text)
+            best = min(best, time.perf_counter() - start)
+        results[name] = megabytes / best
+    return results
+
+
+if __name__ == "__main__":
+    for name, megabytes_per_second in benchmark_normalization().items():
+        print(f"{name:>30}: {megabytes_per_second:8.1f} MB/s")
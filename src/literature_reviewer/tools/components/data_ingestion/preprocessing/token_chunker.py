@@ -0,0 +1,183 @@
+"""
+Token-sized, structure-aware chunking.
+
+RecursiveCharacterTextSplitter with length_function=len gives chunks of a
+fixed number of characters, which vary a lot in tokens (equations,
+references and tables tokenize far worse than prose). Embedding batches
+and cluster-summary prompts are paid for in tokens, so this chunker
+measures in tokens and packs chunks close to a target size.
+
+Text (already normalized, so paragraphs are separated by a blank line) is
+cut into paragraphs, and further at section headings. Chunks are packed
+from whole paragraphs in order and run across page boundaries within a
+PDF. A new section starts a new chunk once the current one is at least
+half full. Only paragraphs longer than the target are split, at sentences
+and, failing that, at words. A chunk that was cut for size starts with
+up to overlap_tokens of the end of the previous one.
+
+Token counts come from tiktoken; get_tokenizer caches one encoding per
+name for the process, as loading the BPE ranks is the expensive part.
+"""
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from langchain.schema.document import Document
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# "# Methods", "2.1 Study Design", "IV. Results", or a bare common section name
+_HEADING_LINE = (
+    r"(?:#{1,6} +\S[^\n]*"
+    r"|(?:\d{1,2}(?:\.\d{1,2})*\.?|[IVX]{1,5}\.) +[A-Z][^\n.]{1,80}"
+    r"|(?i:abstract|introduction|background|(?:materials and )?methods?|results|discussion"
+    r"|conclusions?|references|acknowledge?ments) *:?)"
+)
+SECTION_HEADING = re.compile(_HEADING_LINE + r"$")
+# paragraphs are also cut before a heading line inside them
+_BEFORE_HEADING = re.compile(r"\n(?=" + _HEADING_LINE + r"(?:\n|$))")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\[])")
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(encoding_name: str = DEFAULT_ENCODING):
+    import tiktoken
+    return tiktoken.get_encoding(encoding_name)
+
+
+def tiktoken_counter(encoding_name: str = DEFAULT_ENCODING) -> Callable[[str], int]:
+    encoding = get_tokenizer(encoding_name)
+    # special tokens such as <|endoftext|> in paper text are counted as plain text
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+class _Piece(NamedTuple):
+    text: str
+    num_tokens: int
+    separator: str
+    starts_section: bool
+    metadata: Dict
+
+
+class TokenChunker:
+    def __init__(
+        self,
+        chunk_tokens: int = 256,
+        overlap_tokens: int = 32,
+        encoding_name: str = DEFAULT_ENCODING,
+        count_tokens: Optional[Callable[[str], int]] = None,
+    ):
+        """
+        :param chunk_tokens: Target chunk size; chunks are packed up to it and only exceed it
+            when a single word does.
+        :param overlap_tokens: Tokens repeated from the end of a chunk that was cut for size.
+        :param count_tokens: Token counter; a cached tiktoken encoding_name counter by default.
+        """
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.count_tokens = count_tokens or tiktoken_counter(encoding_name)
+
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        """
+        Splits page documents into chunk documents. Consecutive pages of the
+        same source are chunked as one text; each chunk takes the metadata
+        of the page it starts on, plus its num_tokens.
+        """
+        chunks = []
+        pieces = []
+        source = None
+        for document in documents:
+            if pieces and document.metadata.get("source") != source:
+                chunks.extend(self._pack(pieces))
+                pieces = []
+            source = document.metadata.get("source")
+            pieces.extend(self._pieces(document))
+        chunks.extend(self._pack(pieces))
+        return chunks
+
+
+    def _pieces(self, document: Document) -> List[_Piece]:
+        """
+        Paragraphs of the page, each with its token count; paragraphs longer
+        than chunk_tokens are broken into sentence or word runs.
+        """
+        pieces = []
+        for paragraph in _PARAGRAPH_BREAK.split(document.page_content):
+            for block in _BEFORE_HEADING.split(paragraph):
+                block = block.strip()
+                if not block:
+                    continue
+                starts_section = SECTION_HEADING.match(block.split("\n", 1)[0]) is not None
+                num_tokens = self.count_tokens(block)
+                if num_tokens <= self.chunk_tokens:
+                    pieces.append(_Piece(block, num_tokens, "\n\n", starts_section, document.metadata))
+                    continue
+                for index, (text, num_tokens) in enumerate(self._split_long_block(block)):
+                    pieces.append(_Piece(
+                        text, num_tokens, "\n\n" if index == 0 else " ", starts_section and index == 0, document.metadata
+                    ))
+        return pieces
+
+
+    def _split_long_block(self, block: str) -> List[tuple]:
+        runs = []
+        for sentence in _SENTENCE_END.split(block):
+            num_tokens = self.count_tokens(sentence)
+            if num_tokens <= self.chunk_tokens:
+                runs.append((sentence, num_tokens))
+                continue
+            # no usable sentence boundary (tables, reference lists): cut at words
+            words, run_tokens = [], 0
+            for word in sentence.split():
+                word_tokens = self.count_tokens(" " + word)
+                if words and run_tokens + word_tokens > self.chunk_tokens:
+                    runs.append((" ".join(words), run_tokens))
+                    words, run_tokens = [], 0
+                words.append(word)
+                run_tokens += word_tokens
+            if words:
+                runs.append((" ".join(words), run_tokens))
+        return runs
+
+
+    def _pack(self, pieces: List[_Piece]) -> List[Document]:
+        """
+        Greedily fills chunks with whole pieces. Token totals are the sum
+        of the pieces' counts, which can differ from counting the joined
+        text by a token at a join.
+        """
+        chunks = []
+        current: List[_Piece] = []
+        current_tokens = 0
+        for piece in pieces:
+            too_big = current_tokens + piece.num_tokens > self.chunk_tokens
+            new_section = piece.starts_section and current_tokens >= self.chunk_tokens // 2
+            if current and (too_big or new_section):
+                chunks.append(self._chunk(current, current_tokens))
+                current = self._overlap(current) if too_big and not piece.starts_section else []
+                current_tokens = sum(overlap_piece.num_tokens for overlap_piece in current)
+                if current_tokens + piece.num_tokens > self.chunk_tokens:
+                    current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece.num_tokens
+        if current:
+            chunks.append(self._chunk(current, current_tokens))
+        return chunks
+
+
+    def _overlap(self, pieces: List[_Piece]) -> List[_Piece]:
+        overlap, overlap_tokens = [], 0
+        for piece in reversed(pieces[1:]):
+            if overlap_tokens + piece.num_tokens > self.overlap_tokens:
+                break
+            overlap.insert(0, piece)
+            overlap_tokens += piece.num_tokens
+        return overlap
+
+
+    @staticmethod
+    def _chunk(pieces: List[_Piece], num_tokens: int) -> Document:
+        text = pieces[0].text + "".join(piece.separator + piece.text for piece in pieces[1:])
+        return Document(page_content=text, metadata={**pieces[0].metadata, "num_tokens": num_tokens})
@@ -0,0 +1,62 @@
+"""
+Rate limiting for outbound API calls (Semantic Scholar for now).
+
+A single AsyncTokenBucket is meant to be shared by every request an
+interface makes, so concurrent queries together stay within the
+quota of the API key rather than each query pacing itself.
+"""
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket limiter for asyncio code.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Each acquire() takes one token, waiting for it if none are left.
+    Waiters reserve their token up front (the balance can go negative),
+    so they are released in arrival order, spaced 1/rate seconds apart.
+
+    No asyncio primitives are held, so one bucket can be reused across
+    event loops (e.g. successive asyncio.run calls from sync wrappers).
+    """
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive.")
+        if capacity < 1:
+            raise ValueError("Token bucket capacity must be at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def reserve(self) -> float:
+        """
+        Takes a token and returns how many seconds the caller must wait
+        before using it. Does not block.
+        """
+        self._refill()
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    def pause(self, seconds: float):
+        """
+        Holds back every caller for at least `seconds`, e.g. when the server
+        answers 429 with a Retry-After header.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,127 @@
+"""
+Cross-query deduplication of Semantic Scholar results.
+
+The same paper is routinely returned by several queries. Each copy used to
+be downloaded, extracted and sent to the LLM for an inclusion verdict on
+its own. The index below collapses copies onto one record, matching on
+paperId, DOI, or normalized title together with the year or the first
+author's surname, and keeps track of every query that found the paper
+under "matchedQueries". A title alone is not enough: short generic titles
+("Editorial", "Reply to the letter") are shared by unrelated papers.
+"""
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_title(title: Optional[str]) -> Optional[str]:
+    """
+    Casefolds, strips accents and punctuation and collapses whitespace, so
+    "Spine Growth: A Review." and "spine growth - a review" compare equal.
+    """
+    if not title:
+        return None
+    decomposed = unicodedata.normalize("NFKD", title)
+    ascii_only = decomposed.encode("ascii", "ignore").decode("ascii")
+    normalized = _NON_ALPHANUMERIC.sub(" ", ascii_only.casefold()).strip()
+    return normalized or None
+
+
+def dedup_keys(paper: Dict) -> List[str]:
+    keys = []
+    if paper.get("paperId"):
+        keys.append(f"paperId:{paper['paperId']}")
+    doi = (paper.get("externalIds") or {}).get("DOI")
+    if doi:
+        keys.append(f"doi:{doi.strip().lower()}")
+    title = normalize_title(paper.get("title"))
+    if title:
+        if paper.get("year"):
+            keys.append(f"title:{title}|year:{paper['year']}")
+        first_author = _first_author_surname(paper)
+        if first_author:
+            keys.append(f"title:{title}|author:{first_author}")
+    return keys
+
+
+def _first_author_surname(paper: Dict) -> Optional[str]:
+    authors = paper.get("authors") or []
+    name = normalize_title((authors[0] or {}).get("name")) if authors else None
+    return name.split()[-1] if name else None
+
+
+class S2ResultDeduplicator:
+    """
+    Index of unique papers in first-seen order. Each paper is stored as a
+    copy, so the caller's dicts are never modified. Duplicates are merged
+    into the first record: missing or empty fields are filled from the copy
+    and the matching queries are appended to its "matchedQueries" list.
+    """
+    def __init__(self):
+        self._papers: List[Dict] = []
+        self._index_by_key: Dict[str, int] = {}
+        self.num_duplicates = 0
+
+    def __len__(self):
+        return len(self._papers)
+
+    def __contains__(self, paper: Dict) -> bool:
+        return self._find(paper) is not None
+
+    def _find(self, paper: Dict) -> Optional[int]:
+        for key in dedup_keys(paper):
+            if key in self._index_by_key:
+                return self._index_by_key[key]
+        return None
+
+    def add(self, paper: Optional[Dict], query: Optional[str] = None) -> Optional[Dict]:
+        """
+        Adds a paper. Returns the stored record if the paper had not been
+        seen before, None otherwise. Callers holding on to the stored record
+        also see provenance added by later duplicates.
+        """
+        if paper is None:
+            return None
+
+        existing_index = self._find(paper)
+        if existing_index is None:
+            record = {**paper, "matchedQueries": list(paper.get("matchedQueries") or [])}
+            if query is not None and query not in record["matchedQueries"]:
+                record["matchedQueries"].append(query)
+            self._papers.append(record)
+            self._register_keys(record, len(self._papers) - 1)
+            return record
+
+        existing = self._papers[existing_index]
+        self._merge(existing, paper, query)
+        # the copy's own identifiers (e.g. a preprint paperId) now point here too
+        self._register_keys(paper, existing_index)
+        self._register_keys(existing, existing_index)
+        self.num_duplicates += 1
+        logger.debug(f"Merged duplicate of {existing.get('paperId')} found by query: {query}")
+        return None
+
+    def _register_keys(self, paper: Dict, index: int):
+        for key in dedup_keys(paper):
+            self._index_by_key.setdefault(key, index)
+
+    @staticmethod
+    def _merge(existing: Dict, duplicate: Dict, query: Optional[str]):
+        for field, value in duplicate.items():
+            if field == "matchedQueries":
+                continue
+            if existing.get(field) in (None, "", [], {}) and value not in (None, "", [], {}):
+                existing[field] = value
+
+        matched_queries = existing.setdefault("matchedQueries", [])
+        for matched_query in duplicate.get("matchedQueries", []) + ([query] if query else []):
+            if matched_query not in matched_queries:
+                matched_queries.append(matched_query)
+
+    def papers(self) -> List[Dict]:
+        return list(self._papers)
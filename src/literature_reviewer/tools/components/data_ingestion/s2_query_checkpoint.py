@@ -0,0 +1,60 @@
+"""
+Checkpoint of completed Semantic Scholar queries.
+
+Each finished query is appended to a JSON-lines file as soon as its
+results are in, so a failure on one query (or a crash of the whole
+process) does not throw away the queries that already succeeded. A rerun
+pointed at the same file only issues the queries that are missing.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class S2QueryCheckpoint:
+    def __init__(self, checkpoint_path: str):
+        self.checkpoint_path = checkpoint_path
+        self._lock = threading.Lock()
+        self._completed: Dict[str, List[Optional[Dict]]] = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint_path)), exist_ok=True)
+        if os.path.exists(checkpoint_path):
+            self._load()
+
+    @staticmethod
+    def make_key(query: str, fields: Optional[str], limit: Optional[int]) -> str:
+        return json.dumps([query, fields, limit])
+
+    def _load(self):
+        with open(self.checkpoint_path, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # a crash mid-write leaves at most one truncated last line
+                    logger.warning(f"Ignoring unreadable line {line_number} of {self.checkpoint_path}")
+                    continue
+                self._completed[entry["key"]] = entry["results"]
+        logger.info(f"Loaded {len(self._completed)} completed queries from {self.checkpoint_path}")
+
+    def get(self, key: str) -> Optional[List[Optional[Dict]]]:
+        return self._completed.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._completed
+
+    def __len__(self):
+        return len(self._completed)
+
+    def record(self, key: str, results: List[Optional[Dict]]):
+        line = json.dumps({"key": key, "results": results}) + "\n"
+        with self._lock:
+            self._completed[key] = results
+            with open(self.checkpoint_path, "a", encoding="utf-8") as file:
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
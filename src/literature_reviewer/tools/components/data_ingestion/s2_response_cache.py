@@ -0,0 +1,151 @@
+"""
+Persistent on-disk cache for Semantic Scholar API responses.
+
+Runs are written to fresh timestamped folders, so without this every
+rerun re-issues identical S2 requests. Responses are stored in a single
+SQLite file that can be shared between runs, keyed on the request
+(endpoint + query parameters + body), expired after a TTL, and evicted
+least-recently-used first once the total stored size passes a cap.
+"""
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from literature_reviewer.tools.components.data_ingestion.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+class S2ResponseCache(SQLiteStore):
+    def __init__(
+        self,
+        cache_path: str,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_bytes: int = 512 * 1024 * 1024,
+    ):
+        """
+        :param cache_path: Path of the SQLite file. Parent folders are created.
+        :param ttl_seconds: Age after which an entry is treated as a miss and dropped.
+        :param max_bytes: Upper bound on the summed size of stored response bodies.
+        """
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        super().__init__(cache_path, schema=[
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS responses_last_accessed ON responses (last_accessed)",
+        ])
+
+
+    @staticmethod
+    def make_key(
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        json_body: Optional[Any] = None,
+    ) -> str:
+        """
+        Builds a stable key from everything that determines the response:
+        endpoint plus query, fields, limit, offset etc. (order-independent).
+        """
+        key_material = json.dumps(
+            {
+                "method": method.upper(),
+                "endpoint": endpoint,
+                "params": {k: str(v) for k, v in (params or {}).items() if v is not None},
+                "json": json_body,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            body, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._connection.commit()
+                self.misses += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE responses SET last_accessed = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            self.hits += 1
+        return json.loads(body)
+
+
+    def put(self, key: str, endpoint: str, data: Any):
+        body = json.dumps(data)
+        size = len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.info(f"Not caching {endpoint} response of {size} bytes, larger than the cache")
+            return
+
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, endpoint, body, size, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, endpoint, body, size, now, now),
+            )
+            self._evict_to_size()
+            self._connection.commit()
+
+
+    def _evict_to_size(self):
+        total_size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_accessed ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total_size <= self.max_bytes:
+                break
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total_size -= size
+            self.evictions += 1
+
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, total_size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total_size,
+        }
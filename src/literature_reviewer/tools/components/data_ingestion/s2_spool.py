@@ -0,0 +1,130 @@
+"""
+On-disk spool for large Semantic Scholar result sets.
+
+Bulk search for systematic reviews returns thousands of records per
+topic. Rather than holding them in a Python list, records are appended to
+a spool file as each page arrives and streamed back from disk for
+filtering, so memory use does not grow with the result count.
+
+Two formats, chosen by file extension:
+- .jsonl: one JSON record per line, no extra dependencies,
+- .parquet: needs pyarrow. Each page is written as a row group with the
+  flat columns used for filtering plus the full record as JSON.
+"""
+import json
+import logging
+import os
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+PARQUET_COLUMNS = ("paperId", "title", "year", "isOpenAccess", "abstract", "record")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Parquet spools need pyarrow (pip install pyarrow); use a .jsonl spool path otherwise."
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+class SpoolWriter:
+    """
+    Appends records to a spool file. Use as a context manager. JSONL
+    spools are appended to if they already exist; Parquet spools are
+    rewritten.
+    """
+    def __init__(self, spool_path: str):
+        self.spool_path = spool_path
+        self.is_parquet = spool_path.endswith(".parquet")
+        self.num_records = 0
+        self._file = None
+        self._parquet_writer = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.spool_path)), exist_ok=True)
+        if not self.is_parquet:
+            self._file = open(self.spool_path, "a", encoding="utf-8")
+        return self
+
+    def write_many(self, records: Iterable[Dict]):
+        records = list(records)
+        if not records:
+            return
+        if self.is_parquet:
+            self._write_parquet_row_group(records)
+        else:
+            for record in records:
+                self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+        self.num_records += len(records)
+
+    def _write_parquet_row_group(self, records):
+        pyarrow, parquet = _import_pyarrow()
+        columns = {
+            "paperId": [record.get("paperId") for record in records],
+            "title": [record.get("title") for record in records],
+            "year": [record.get("year") for record in records],
+            "isOpenAccess": [record.get("isOpenAccess") for record in records],
+            "abstract": [record.get("abstract") for record in records],
+            "record": [json.dumps(record) for record in records],
+        }
+        schema = pyarrow.schema([
+            ("paperId", pyarrow.string()),
+            ("title", pyarrow.string()),
+            ("year", pyarrow.int64()),
+            ("isOpenAccess", pyarrow.bool_()),
+            ("abstract", pyarrow.string()),
+            ("record", pyarrow.string()),
+        ])
+        table = pyarrow.table(columns, schema=schema)
+        if self._parquet_writer is None:
+            self._parquet_writer = parquet.ParquetWriter(self.spool_path, schema)
+        self._parquet_writer.write_table(table)
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            self._file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def iter_spool(
+    spool_path: str,
+    keep: Optional[Callable[[Dict], bool]] = None,
+) -> Iterator[Dict]:
+    """
+    Streams records back from a spool, one page/line at a time, yielding
+    only those `keep` accepts.
+    """
+    if spool_path.endswith(".parquet"):
+        _, parquet = _import_pyarrow()
+        parquet_file = parquet.ParquetFile(spool_path)
+        for row_group in range(parquet_file.num_row_groups):
+            for record_json in parquet_file.read_row_group(row_group, columns=["record"]).column("record").to_pylist():
+                record = json.loads(record_json)
+                if keep is None or keep(record):
+                    yield record
+        return
+
+    with open(spool_path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line {line_number} of {spool_path}")
+                continue
+            if keep is None or keep(record):
+                yield record
+
+
+def count_spool(spool_path: str) -> int:
+    if spool_path.endswith(".parquet"):
+        _, parquet = _import_pyarrow()
+        return parquet.ParquetFile(spool_path).metadata.num_rows
+    with open(spool_path, "r", encoding="utf-8") as file:
+        return sum(1 for _ in file)
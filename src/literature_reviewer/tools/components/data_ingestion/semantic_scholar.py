@@ -1,15 +1,116 @@
 import os
 import json
 import time
-import requests
+import asyncio
+import queue
+import threading
+import aiohttp
 import backoff
 import logging
-from typing import List, Dict, Optional
-import re
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Callable, Iterator, List, Dict, Optional, Tuple
+
+from literature_reviewer.tools.components.data_ingestion.rate_limiting import AsyncTokenBucket
+from literature_reviewer.tools.components.data_ingestion.s2_response_cache import S2ResponseCache
+from literature_reviewer.tools.components.data_ingestion.s2_deduplication import S2ResultDeduplicator
+from literature_reviewer.tools.components.data_ingestion.s2_query_checkpoint import S2QueryCheckpoint
+from literature_reviewer.tools.components.data_ingestion.s2_spool import SpoolWriter
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of IDs S2 accepts in one /paper/batch or /author/batch request
+S2_BATCH_SIZE_LIMIT = 500
+S2_AUTHOR_BATCH_SIZE_LIMIT = 1000
+# Largest page /paper/search serves, and the deepest offset + limit it allows
+S2_SEARCH_PAGE_LIMIT = 100
+S2_SEARCH_MAX_DEPTH = 1000
+
+
+def _run_sync(coroutine):
+    """
+    Runs a coroutine to completion from synchronous code. If an event loop
+    is already running in this thread (notebooks, streamlit), the coroutine
+    is run on a fresh loop in a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    outcome = {}
+
+    def runner():
+        try:
+            outcome["result"] = asyncio.run(coroutine)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def _iterate_in_thread(async_iterator_factory: Callable[[], AsyncIterator], max_buffered: int = 256) -> Iterator:
+    """
+    Exposes an async iterator as a plain generator. The async iterator runs
+    on its own event loop in a helper thread and hands items over through a
+    bounded queue, so a slow consumer applies backpressure to the producer.
+    Closing the generator early stops the helper thread.
+    """
+    items = queue.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+    finished = object()
+
+    def put_until_stopped(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    async def pump():
+        async_iterator = async_iterator_factory()
+        try:
+            async for item in async_iterator:
+                await asyncio.to_thread(put_until_stopped, item)
+                if stop.is_set():
+                    break
+        finally:
+            await async_iterator.aclose()
+
+    def runner():
+        try:
+            asyncio.run(pump())
+        except BaseException as e:
+            put_until_stopped(_IteratorError(e))
+        finally:
+            put_until_stopped(finished)
+
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is finished:
+                break
+            if isinstance(item, _IteratorError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class _IteratorError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
 class SemanticScholarInterface:
     """
     A class to search Semantic Scholar API for a list of references.
@@ -18,12 +119,28 @@ class SemanticScholarInterface:
         self,
         rate_limit: float = 1.0,
         query_response_length_limit: int = 3,
+        burst_size: int = 1,
+        max_concurrent_requests: int = 8,
+        cache_path: Optional[str] = None,
+        cache_ttl_seconds: float = 7 * 24 * 3600,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+        max_retries: int = 6,
+        max_backoff_seconds: float = 60.0,
+        checkpoint_path: Optional[str] = None,
     ):
         """
         Initializes the searcher with the given API key and rate limit.
 
         :param api_key: Semantic Scholar API key. If None, it will attempt to read from the environment variable 'S2_API_KEY'.
-        :param rate_limit: Time in seconds to wait between API requests to respect rate limits.
+        :param rate_limit: Minimum average time in seconds between API requests, i.e. the key's quota. Shared by all concurrent requests.
+        :param burst_size: Number of requests that may be sent back-to-back before the rate limit applies.
+        :param max_concurrent_requests: Upper bound on requests in flight at once.
+        :param cache_path: SQLite file for the persistent response cache. Defaults to the 'S2_CACHE_PATH' environment variable; no caching if neither is set.
+        :param cache_ttl_seconds: Age after which cached responses are re-fetched.
+        :param cache_max_bytes: Size cap for the cache, least recently used responses are evicted first.
+        :param max_retries: Retries per request on 429, 5xx and connection errors. Other 4xx fail immediately.
+        :param max_backoff_seconds: Cap on the exponential backoff between retries (Retry-After is honoured as sent).
+        :param checkpoint_path: JSON-lines file recording each completed query, so reruns only issue the missing ones.
         """
         self.api_key = os.getenv("S2_API_KEY")
         if not self.api_key:
@@ -31,62 +148,677 @@ class SemanticScholarInterface:
         self.rate_limit = rate_limit
         self.base_url = os.getenv("S2_BASE_GRAPH_URL")
         self.fields = os.getenv("S2_PAPER_FIELDS")
+        self.search_fields = os.getenv("S2_SEARCH_FIELDS", "paperId,title,year,externalIds")
         self.query_response_length_limit = query_response_length_limit
+        self.max_concurrent_requests = max_concurrent_requests
+        self.rate_limiter = AsyncTokenBucket(rate=1.0 / rate_limit, capacity=burst_size)
+        cache_path = cache_path or os.getenv("S2_CACHE_PATH")
+        self.response_cache = S2ResponseCache(
+            cache_path, ttl_seconds=cache_ttl_seconds, max_bytes=cache_max_bytes
+        ) if cache_path else None
+        self.max_retries = max_retries
+        self.max_backoff_seconds = max_backoff_seconds
+        self.checkpoint = S2QueryCheckpoint(checkpoint_path) if checkpoint_path else None
+
 
-    
     @staticmethod
     def _on_backoff(details):
         logger.warning(
             f"Backing off {details['wait']:0.1f} seconds after {details['tries']} tries "
-            f"calling function {details['target'].__name__} at {time.strftime('%X')}"
+            f"calling {details['target']} at {time.strftime('%X')} ({details['reason']})"
         )
 
 
-    @backoff.on_exception(
-        backoff.expo, requests.exceptions.HTTPError, on_backoff=_on_backoff
-    )
-    def search_papers_via_queries(self, queries: List[str]) -> List[Optional[Dict]]:
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Retry-After is either a number of seconds or an HTTP date.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+    @staticmethod
+    def _drop_empty_params(params: Dict) -> Dict:
+        # aiohttp rejects None values, requests used to silently drop them
+        return {key: value for key, value in params.items() if value is not None}
+
+
+    def search_papers_via_queries(self, queries: List[str], deduplicate: bool = True) -> List[Optional[Dict]]:
         """
         Searches for papers using the Semantic Scholar API for a list of queries.
+        Synchronous wrapper around async_search_papers_via_queries.
+        """
+        return _run_sync(self.async_search_papers_via_queries(queries, deduplicate=deduplicate))
+
+
+    def search_and_hydrate_papers_via_queries(
+        self,
+        queries: List[str],
+        keep: Optional[Callable[[Dict], bool]] = None,
+    ) -> List[Optional[Dict]]:
+        """
+        Synchronous wrapper around async_search_and_hydrate_papers_via_queries.
+        """
+        return _run_sync(self.async_search_and_hydrate_papers_via_queries(queries, keep=keep))
+
+
+    def hydrate_papers(self, paper_ids: List[str], fields: Optional[str] = None) -> List[Optional[Dict]]:
+        """
+        Synchronous wrapper around async_hydrate_papers.
+        """
+        return _run_sync(self.async_hydrate_papers(paper_ids, fields=fields))
+
+
+    def stream_papers_via_queries(
+        self,
+        queries: List[str],
+        max_results_per_query: Optional[int] = None,
+        fields: Optional[str] = None,
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Synchronous generator around async_stream_papers_via_queries. Requests
+        keep running in a background thread while the caller handles papers.
         """
+        return _iterate_in_thread(
+            lambda: self.async_stream_papers_via_queries(
+                queries, max_results_per_query=max_results_per_query, fields=fields
+            )
+        )
+
+
+    async def async_stream_papers_via_queries(
+        self,
+        queries: List[str],
+        max_results_per_query: Optional[int] = None,
+        fields: Optional[str] = None,
+        max_buffered: int = 256,
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Pages through /paper/search for every query concurrently, following
+        `next` offsets until a query runs out of results or hits
+        max_results_per_query (defaults to query_response_length_limit).
+        Yields (query, paper) pairs as soon as each page is parsed, in
+        arrival order rather than query order.
+        """
+        max_results_per_query = max_results_per_query or self.query_response_length_limit or S2_SEARCH_PAGE_LIMIT
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        arrivals = asyncio.Queue(maxsize=max_buffered)
+        finished = object()
+
+        async def page_through(session, query):
+            checkpoint_key = S2QueryCheckpoint.make_key(query, fields or self.fields, max_results_per_query)
+            try:
+                if self.checkpoint is not None and checkpoint_key in self.checkpoint:
+                    logger.info(f"Resuming from checkpoint for query: {query}")
+                    for paper in self.checkpoint.get(checkpoint_key):
+                        await arrivals.put((query, paper))
+                else:
+                    query_papers = []
+                    async for paper in self._paginate_single_query(
+                        session, semaphore, query, fields or self.fields, max_results_per_query
+                    ):
+                        query_papers.append(paper)
+                        await arrivals.put((query, paper))
+                    if self.checkpoint is not None:
+                        self.checkpoint.record(checkpoint_key, query_papers)
+            except Exception as e:
+                await arrivals.put(_IteratorError(e))
+                return
+            await arrivals.put(finished)
+
+        async with self._client_session() as session:
+            producers = [asyncio.create_task(page_through(session, query)) for query in queries]
+            try:
+                remaining_producers = len(producers)
+                while remaining_producers:
+                    item = await arrivals.get()
+                    if item is finished:
+                        remaining_producers -= 1
+                    elif isinstance(item, _IteratorError):
+                        raise item.error
+                    else:
+                        yield item
+            finally:
+                for producer in producers:
+                    producer.cancel()
+                await asyncio.gather(*producers, return_exceptions=True)
+
+
+    async def async_search_papers_via_queries(
+        self,
+        queries: List[str],
+        fields: Optional[str] = None,
+        deduplicate: bool = True,
+    ) -> List[Optional[Dict]]:
+        """
+        Sends all queries concurrently, paced by the shared token bucket.
+        Results are flattened in the same order as the input queries.
+
+        :param fields: Projection to request, defaults to S2_PAPER_FIELDS.
+        :param deduplicate: Merge papers found by several queries into one
+            record listing them under "matchedQueries" (see S2ResultDeduplicator).
+            Without it every hit is kept, plus a None placeholder for each
+            query that returned nothing.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async with self._client_session() as session:
+            per_query_outcomes = await asyncio.gather(*[
+                self._search_single_query(session, semaphore, query, fields or self.fields)
+                for query in queries
+            ], return_exceptions=True)
+
+        # every query gets to finish (and be checkpointed) before any failure is raised
+        failures = [outcome for outcome in per_query_outcomes if isinstance(outcome, BaseException)]
+        if failures:
+            logger.error(f"{len(failures)} of {len(queries)} queries failed after retries")
+            raise failures[0]
+        per_query_results = per_query_outcomes
+
+        if deduplicate:
+            deduplicator = S2ResultDeduplicator()
+            for query, query_results in zip(queries, per_query_results):
+                for result in query_results:
+                    deduplicator.add(result, query=query)
+            logger.info(
+                f"Found {len(deduplicator)} unique papers, "
+                f"merged {deduplicator.num_duplicates} duplicates across {len(queries)} queries"
+            )
+            return deduplicator.papers()
+
         results = []
-        headers = {"X-API-KEY": self.api_key}
-        
-        for query in queries:
-            params = {
+        for query_results in per_query_results:
+            results.extend(query_results or [None])
+        return results
+
+
+    async def async_search_and_hydrate_papers_via_queries(
+        self,
+        queries: List[str],
+        keep: Optional[Callable[[Dict], bool]] = None,
+    ) -> List[Optional[Dict]]:
+        """
+        Runs the queries with the minimal S2_SEARCH_FIELDS projection, merges
+        duplicates across queries, drops hits rejected by `keep` (called on
+        the minimal record), then fetches the full S2_PAPER_FIELDS record once
+        per surviving paper via /paper/batch. Provenance ("matchedQueries")
+        is carried over to the full records.
+        """
+        search_results = await self.async_search_papers_via_queries(queries, fields=self.search_fields)
+
+        surviving_results = [
+            result for result in search_results
+            if result.get("paperId") and (keep is None or keep(result))
+        ]
+        logger.info(
+            f"Hydrating {len(surviving_results)} unique papers "
+            f"of {len(search_results)} found"
+        )
+
+        hydrated_papers = await self.async_hydrate_papers(
+            [result["paperId"] for result in surviving_results]
+        )
+
+        results = []
+        for result, paper in zip(surviving_results, hydrated_papers):
+            if paper is None:
+                logger.warning(f"Could not hydrate paper {result['paperId']}, keeping minimal record")
+                results.append(result)
+            else:
+                paper["matchedQueries"] = result.get("matchedQueries", [])
+                results.append(paper)
+        return results
+
+
+    async def async_hydrate_papers(
+        self,
+        paper_ids: List[str],
+        fields: Optional[str] = None,
+    ) -> List[Optional[Dict]]:
+        """
+        Fetches full records for the given paper IDs (S2 IDs, or prefixed
+        external IDs like "DOI:...") via POST /paper/batch, in chunks of
+        at most S2_BATCH_SIZE_LIMIT. Returns one entry per input ID in the
+        same order, None where S2 does not know the ID.
+        """
+        return await self._async_batch_fetch(
+            "/paper/batch", paper_ids, fields or self.fields, S2_BATCH_SIZE_LIMIT
+        )
+
+
+    async def async_get_authors(
+        self,
+        author_ids: List[str],
+        fields: str = "name,paperCount,citationCount,hIndex",
+    ) -> List[Optional[Dict]]:
+        """
+        Fetches author records via POST /author/batch. Returns one entry per
+        input ID in the same order, None where S2 does not know the ID.
+        """
+        return await self._async_batch_fetch(
+            "/author/batch", author_ids, fields, S2_AUTHOR_BATCH_SIZE_LIMIT
+        )
+
+
+    async def async_get_authors_with_papers(
+        self,
+        author_ids: List[str],
+        limit: int = 100,
+        author_fields: str = "name,paperCount,citationCount,hIndex",
+        fields: Optional[str] = None,
+    ) -> Tuple[List[Optional[Dict]], List[List[Dict]]]:
+        """
+        Fetches author records together with their paper lists in one POST
+        /author/batch, the papers as a minimal papers.paperId,papers.title,
+        papers.year projection. Only the first limit papers of each author
+        are then hydrated with fields (defaults to S2_PAPER_FIELDS) via
+        /paper/batch, so papers that are cut are never fetched in full.
+
+        Returns the author records (without "papers") and the papers per
+        input ID, in the same order; None and an empty list where S2 does
+        not know the author. Both batches are cached per record.
+        """
+        batch_fields = f"{author_fields},papers.paperId,papers.title,papers.year"
+        records = await self._async_batch_fetch(
+            "/author/batch", author_ids, batch_fields, S2_AUTHOR_BATCH_SIZE_LIMIT
+        )
+        authors, kept_paper_ids = [], []
+        for record in records:
+            papers = (record or {}).get("papers") or []
+            kept_paper_ids.append([paper["paperId"] for paper in papers if paper.get("paperId")][:limit])
+            authors.append({key: value for key, value in record.items() if key != "papers"} if record else None)
+
+        unique_paper_ids = list(dict.fromkeys(paper_id for paper_ids in kept_paper_ids for paper_id in paper_ids))
+        hydrated_papers = await self.async_hydrate_papers(unique_paper_ids, fields=fields)
+        papers_by_id = {
+            paper_id: paper for paper_id, paper in zip(unique_paper_ids, hydrated_papers) if paper is not None
+        }
+        return authors, [
+            [papers_by_id[paper_id] for paper_id in paper_ids if paper_id in papers_by_id]
+            for paper_ids in kept_paper_ids
+        ]
+
+
+    async def _async_batch_fetch(
+        self,
+        endpoint: str,
+        ids: List[str],
+        fields: str,
+        batch_size: int,
+    ) -> List[Optional[Dict]]:
+        """
+        POSTs ids to a /batch endpoint in chunks of batch_size. With the
+        response cache enabled, records are cached per ID rather than per
+        request, so only IDs not seen before are sent, whichever batch they
+        were first fetched in.
+        """
+        if not ids:
+            return []
+
+        records_by_id = {}
+        if self.response_cache is not None:
+            for record_id in dict.fromkeys(ids):
+                cached = self.response_cache.get(self._batch_record_cache_key(endpoint, record_id, fields))
+                if cached is not None:
+                    records_by_id[record_id] = cached
+
+        missing_ids = [record_id for record_id in dict.fromkeys(ids) if record_id not in records_by_id]
+        logger.info(f"{endpoint}: {len(ids) - len(missing_ids)} of {len(ids)} records cached")
+
+        if missing_ids:
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            batches = [
+                missing_ids[start:start + batch_size]
+                for start in range(0, len(missing_ids), batch_size)
+            ]
+            async with self._client_session() as session:
+                batch_results = await asyncio.gather(*[
+                    self._request_json(
+                        session, semaphore, "POST", endpoint,
+                        params={"fields": fields},
+                        json_body={"ids": batch},
+                        use_cache=False,
+                    )
+                    for batch in batches
+                ])
+
+            for batch, records in zip(batches, batch_results):
+                for record_id, record in zip(batch, records):
+                    if record is None:
+                        continue
+                    records_by_id[record_id] = record
+                    if self.response_cache is not None:
+                        self.response_cache.put(
+                            self._batch_record_cache_key(endpoint, record_id, fields), endpoint, record
+                        )
+
+        return [records_by_id.get(record_id) for record_id in ids]
+
+
+    @staticmethod
+    def _batch_record_cache_key(endpoint: str, record_id: str, fields: str) -> str:
+        return S2ResponseCache.make_key("POST", endpoint, {"fields": fields, "id": record_id})
+
+
+    def bulk_search_to_spool(
+        self,
+        query: str,
+        spool_path: str,
+        max_records: Optional[int] = None,
+        fields: Optional[str] = None,
+        filters: Optional[Dict] = None,
+    ) -> int:
+        """
+        Synchronous wrapper around async_bulk_search_to_spool.
+        """
+        return _run_sync(self.async_bulk_search_to_spool(
+            query, spool_path, max_records=max_records, fields=fields, filters=filters
+        ))
+
+
+    async def async_bulk_search_to_spool(
+        self,
+        query: str,
+        spool_path: str,
+        max_records: Optional[int] = None,
+        fields: Optional[str] = None,
+        filters: Optional[Dict] = None,
+    ) -> int:
+        """
+        High-recall search via /paper/search/bulk, walking continuation
+        tokens and appending each page to a JSONL or Parquet spool (see
+        s2_spool) as it arrives, so the full result set is never held in
+        memory. Returns the number of records in the spool.
+
+        For JSONL spools the continuation token is saved next to the spool
+        after every page, so an interrupted run resumes where it stopped and
+        a finished one is not re-fetched.
+
+        :param filters: Extra bulk-search parameters, e.g. {"year": "2015-",
+            "fieldsOfStudy": "Medicine", "openAccessPdf": ""}.
+        """
+        state_path = f"{spool_path}.state.json"
+        state = {"query": query, "filters": filters, "token": None, "num_records": 0, "complete": False}
+        resumable = not spool_path.endswith(".parquet")
+        if resumable and os.path.exists(state_path) and os.path.exists(spool_path):
+            with open(state_path, "r") as file:
+                saved_state = json.load(file)
+            if saved_state.get("query") == query and saved_state.get("filters") == filters:
+                state = saved_state
+                logger.info(f"Resuming bulk search for '{query}' after {state['num_records']} records")
+
+        if state["num_records"] == 0:
+            # nothing to resume: the spool is appended to, so records from
+            # another query or other filters must not be left in it
+            for stale_path in (spool_path, state_path):
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+
+        if state["complete"]:
+            return state["num_records"]
+
+        semaphore = asyncio.Semaphore(1)
+        async with self._client_session() as session:
+            with SpoolWriter(spool_path) as spool:
+                while max_records is None or state["num_records"] < max_records:
+                    data = await self._request_json(
+                        session, semaphore, "GET", "/paper/search/bulk",
+                        params={
+                            "query": query,
+                            "fields": fields or self.fields,
+                            "token": state["token"],
+                            **(filters or {}),
+                        },
+                    )
+                    page = data.get("data") or []
+                    if max_records is not None:
+                        page = page[:max_records - state["num_records"]]
+                    spool.write_many(page)
+
+                    state["num_records"] += len(page)
+                    state["token"] = data.get("token")
+                    state["complete"] = not state["token"] or not page
+                    if resumable:
+                        self._save_bulk_state(state_path, state)
+                    logger.info(
+                        f"Bulk search '{query}': {state['num_records']} of {data.get('total', '?')} records spooled"
+                    )
+                    if state["complete"]:
+                        break
+
+        return state["num_records"]
+
+
+    @staticmethod
+    def _save_bulk_state(state_path: str, state: Dict):
+        temporary_path = f"{state_path}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(state, file)
+        os.replace(temporary_path, state_path)
+
+
+    async def async_get_related_papers(
+        self,
+        paper_ids: List[str],
+        direction: str = "references",
+        limit: int = 100,
+        fields: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> List[List[Dict]]:
+        """
+        Fetches the papers cited by ("references") or citing ("citations")
+        each input paper, one request per paper, sent concurrently. Returns
+        one list of papers per input ID; unresolved entries without a paperId
+        are dropped. A paper whose request fails (e.g. a 404, or retries run
+        out) is logged and gets an empty list, so it does not cost the
+        neighbours of the others.
+        """
+        if direction not in ("references", "citations"):
+            raise ValueError(f"direction must be 'references' or 'citations', got {direction}")
+        if not paper_ids:
+            return []
+
+        neighbour_key = "citedPaper" if direction == "references" else "citingPaper"
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def fetch(active_session, paper_id):
+            data = await self._request_json(
+                active_session, semaphore, "GET", f"/paper/{paper_id}/{direction}",
+                params={"fields": fields or self.fields, "limit": limit},
+            )
+            return [
+                entry[neighbour_key] for entry in (data.get("data") or [])
+                if entry.get(neighbour_key) and entry[neighbour_key].get("paperId")
+            ]
+
+        async def fetch_all(active_session):
+            outcomes = await asyncio.gather(
+                *[fetch(active_session, paper_id) for paper_id in paper_ids], return_exceptions=True
+            )
+            related_papers = []
+            for paper_id, outcome in zip(paper_ids, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.warning(f"Skipping {direction} of {paper_id}: {outcome!r}")
+                    outcome = []
+                related_papers.append(outcome)
+            return related_papers
+
+        if session is not None:
+            return await fetch_all(session)
+        async with self._client_session() as new_session:
+            return await fetch_all(new_session)
+
+
+    def _client_session(self) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(headers={"X-API-KEY": self.api_key})
+
+
+    async def _request_json(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        json_body: Optional[Dict] = None,
+        use_cache: bool = True,
+    ):
+        """
+        Sends a single rate-limited request to the graph API and returns the
+        decoded JSON body, answering from the response cache when possible
+        (unless use_cache is False, e.g. for batches cached per record).
+
+        Retries apply to this request only:
+        - 429: waits for Retry-After (or backs off) and pauses the shared
+          token bucket for that long, since the key itself is over quota,
+        - 5xx and connection errors: exponential backoff with full jitter,
+        - any other 4xx: raised immediately, retrying cannot help.
+        """
+        params = self._drop_empty_params(params or {})
+        cache_key = None
+        if self.response_cache is not None and use_cache:
+            cache_key = self.response_cache.make_key(method, endpoint, params, json_body)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"{method} {endpoint} | Cache hit")
+                return cached
+
+        request_url = f"{self.base_url}{endpoint}"
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            try:
+                async with semaphore:
+                    await self.rate_limiter.acquire()
+                    async with session.request(
+                        method, request_url, params=params, json=json_body
+                    ) as response:
+                        logger.debug(f"{method} {endpoint} | Status Code: {response.status}")
+                        if response.status < 400:
+                            data = await response.json()
+                            break
+                        if response.status == 429:
+                            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                        elif response.status < 500:
+                            # bad request, unknown id, bad key...
+                            error_body = await response.text()
+                            logger.error(f"{method} {endpoint} failed with {response.status}: {error_body[:500]}")
+                        response.raise_for_status()
+            except (aiohttp.ClientResponseError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                status = getattr(e, "status", None)
+                retryable = status is None or status == 429 or status >= 500
+                if not retryable or attempt > self.max_retries:
+                    raise
+
+                if retry_after is not None:
+                    wait = retry_after
+                else:
+                    wait = backoff.full_jitter(min(self.max_backoff_seconds, 2 ** (attempt - 1)))
+                self._on_backoff({
+                    "wait": wait,
+                    "tries": attempt,
+                    "target": f"{method} {endpoint}",
+                    "reason": f"status {status}" if status else type(e).__name__,
+                })
+                if status == 429:
+                    # the whole key is over quota, so every request waits, this one included
+                    self.rate_limiter.pause(wait)
+                else:
+                    await asyncio.sleep(wait)
+
+        if cache_key is not None:
+            self.response_cache.put(cache_key, endpoint, data)
+        return data
+
+
+    async def _paginate_single_query(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        query: str,
+        fields: str,
+        max_results: int,
+    ) -> AsyncIterator[Dict]:
+        offset = 0
+        num_yielded = 0
+        while num_yielded < max_results:
+            page_size = min(S2_SEARCH_PAGE_LIMIT, max_results - num_yielded, S2_SEARCH_MAX_DEPTH - offset)
+            if page_size <= 0:
+                break
+
+            data = await self._request_json(
+                session, semaphore, "GET", "/paper/search",
+                params={
+                    "query": query,
+                    "offset": offset,
+                    "limit": page_size,
+                    "fields": fields,
+                },
+            )
+            page = data.get("data", [])
+            logger.info(f"Searching for: {query} | Offset: {offset} | Page results: {len(page)}")
+            for paper in page:
+                yield paper
+            num_yielded += len(page)
+
+            next_offset = data.get("next")
+            if not page or next_offset is None:
+                break
+            offset = next_offset
+
+
+    async def _search_single_query(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        query: str,
+        fields: str,
+    ) -> List[Dict]:
+        checkpoint_key = S2QueryCheckpoint.make_key(query, fields, self.query_response_length_limit)
+        if self.checkpoint is not None and checkpoint_key in self.checkpoint:
+            logger.info(f"Resuming from checkpoint for query: {query}")
+            return self.checkpoint.get(checkpoint_key)
+
+        data = await self._request_json(
+            session, semaphore, "GET", "/paper/search",
+            params={
                 "query": query,
                 "limit": self.query_response_length_limit,
-                "fields": self.fields,
-            }
-
-            request_url = f"{self.base_url}/paper/search"
-            response = requests.get(request_url, headers=headers, params=params)
-            logger.info(f"Searching for: {query} | Status Code: {response.status_code}")
-            response.raise_for_status()
-
-            data = response.json()
-            if data.get("total", 0) == 0:
-                logger.info(f"No results found for query: {query}")
-                results.append(None)
-            else:
-                results.extend(data.get("data", []))
+                "fields": fields,
+            },
+        )
+        logger.info(f"Searching for: {query} | Results: {data.get('total', 0)}")
 
-            time.sleep(self.rate_limit)
+        results = data.get("data") or []
+        if not results:
+            logger.info(f"No results found for query: {query}")
 
+        if self.checkpoint is not None:
+            self.checkpoint.record(checkpoint_key, results)
         return results
-    
+
 
 if __name__ == "__main__":
     from dotenv import load_dotenv
     import json
     from pprint import pprint
-    
+
     load_dotenv()
-    
+
     s2_interface = SemanticScholarInterface(query_response_length_limit=5)
     query = "Patient-specific finite element modeling of scoliotic curve progression"
     results = s2_interface.search_papers_via_queries([query])
-    
+
     print("Search Results:")
     for result in results:
         if result:
@@ -94,5 +826,3 @@ if __name__ == "__main__":
         else:
             print("No results found for this query.")
         print("\n" + "-"*80 + "\n")
-    
-    
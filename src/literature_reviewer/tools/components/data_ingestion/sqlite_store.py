@@ -0,0 +1,33 @@
+"""
+Shared setup of the SQLite files behind the S2 response cache, the PDF
+store, the PDF download manifest and the PDF extraction cache.
+
+Each file gets one connection shared by all threads behind a lock, in WAL
+mode so that a run reading the file is not blocked by another one writing
+to it. Connection settings belong here, so they apply to every store.
+"""
+import os
+import sqlite3
+import threading
+from typing import Sequence
+
+
+class SQLiteStore:
+    def __init__(self, database_path: str, schema: Sequence[str]):
+        """
+        :param database_path: Path of the SQLite file. Parent folders are created.
+        :param schema: CREATE TABLE / CREATE INDEX IF NOT EXISTS statements run on open.
+        """
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        for statement in schema:
+            self._connection.execute(statement)
+        self._connection.commit()
+
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -9,33 +9,62 @@ from literature_reviewer.agents.components.frameworks.langchain import get_embed
 import numpy as np
 import pandas as pd
 import logging
+from itertools import islice
+from typing import Iterable, Iterator
 
-def add_to_chromadb(chunks_with_ids: list[Document], chroma_path: str, model: str = "text-embedding-3-large"):
+def add_to_chromadb(
+    chunks_with_ids: Iterable[Document],
+    chroma_path: str,
+    model: str = "text-embedding-3-large",
+    batch_size: int = 256,
+) -> int:
+    """
+    Embeds and adds the chunks whose IDs are not in the database yet.
+
+    chunks_with_ids can be a generator: it is consumed batch_size chunks at
+    a time, each batch checked against the database and embedded before the
+    next is pulled, so memory use does not depend on the number of chunks.
+    Returns the number of chunks added.
+    """
     # Load the existing database.
     db = Chroma(
         persist_directory=chroma_path, embedding_function=get_embedding_function(model)
     )
 
-    # Add or Update the documents.
-    existing_items = db.get(include=[])  # IDs are always included by default
-    existing_ids = set(existing_items["ids"])
-    print(f"Number of existing documents in DB: {len(existing_ids)}")
-
-    # Only add documents that don't exist in the DB.
-    new_chunks = []
-    for chunk in chunks_with_ids:
-        if chunk.metadata["id"] not in existing_ids:
-            new_chunks.append(chunk)
+    num_added = 0
+    num_existing = 0
+    for batch in _batched(chunks_with_ids, batch_size):
+        # Only add documents that don't exist in the DB (or earlier in this batch).
+        batch_ids = [chunk.metadata["id"] for chunk in batch]
+        existing_ids = set(db.get(ids=batch_ids, include=[])["ids"])  # IDs are always included by default
+        num_existing += len(existing_ids)
+        new_chunks = []
+        for chunk in batch:
+            if chunk.metadata["id"] not in existing_ids:
+                existing_ids.add(chunk.metadata["id"])
+                new_chunks.append(chunk)
+        if not new_chunks:
+            continue
 
-    if len(new_chunks):
-        print(f"Adding new documents: {len(new_chunks)}")
         new_chunk_ids = [chunk.metadata["id"] for chunk in new_chunks]
         try:
             db.add_documents(new_chunks, ids=new_chunk_ids)
+            num_added += len(new_chunks)
         except Exception as e:
             logging.warning(f"Error adding documents to ChromaDB: {str(e)}")
+
+    print(f"Number of chunks already in DB: {num_existing}")
+    if num_added:
+        print(f"Added new documents: {num_added}")
     else:
         print("No new documents to add")
+    return num_added
+
+
+def _batched(items: Iterable, batch_size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
         
         
 def query_chromadb(
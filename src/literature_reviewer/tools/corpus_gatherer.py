@@ -14,18 +14,27 @@ back to the user goals directly in the output list.
 batches of chunks per evaluation for filtering the search results
 depends on chunk size, set elsewhere
 """
-import json, logging, os, requests
+import hashlib, json, logging, os
+from collections import Counter
 from langchain.schema import Document
 from typing import Any
 
 from literature_reviewer.tools.basetool import BaseTool, ToolResponse
 from literature_reviewer.tools.components.data_ingestion.semantic_scholar import SemanticScholarInterface
+from literature_reviewer.tools.components.data_ingestion.s2_deduplication import S2ResultDeduplicator
+from literature_reviewer.tools.components.data_ingestion.citation_graph_expansion import CitationGraphExpander
+from literature_reviewer.tools.components.data_ingestion.author_expansion import AuthorExpander
+from literature_reviewer.tools.components.data_ingestion.s2_spool import iter_spool
+from literature_reviewer.tools.components.data_ingestion.pdf_downloader import PDFDownloadManager
+from literature_reviewer.tools.components.data_ingestion import pdf_download_manifest
+from literature_reviewer.agents.components.frameworks.langchain import get_embedding_function
 from literature_reviewer.tools.components.data_ingestion.preprocessing.langchain_extract_from_pdf import LangchainPDFTextExtractor
 from literature_reviewer.tools.components.database_operations.chroma_operations import add_to_chromadb
 from literature_reviewer.agents.components.model_call import ModelInterface
 from literature_reviewer.tools.components.prompts.literature_search_query import generate_s2_results_evaluation_system_prompt
 from literature_reviewer.tools.components.input_output_models.response_formats import CorpusInclusionVerdict
 from literature_reviewer.tools.components.data_ingestion.preprocessing.image_based_abstract_extraction import extract_abstract_from_pdf
+from literature_reviewer.tools.components.data_ingestion.preprocessing.text_layer_abstract_extraction import extract_abstract_from_text_layer
 
 
 class CorpusGatherer(BaseTool):
@@ -36,9 +45,33 @@ class CorpusGatherer(BaseTool):
         model_interface: ModelInterface,
         chunk_size=800,
         chunk_overlap=80,
+        chunk_size_unit="characters",
         s2_interface=None,
         s2_results_num_eval_loops=1,
+        evaluate_abstracts_before_download=False,
+        text_layer_abstract_min_confidence=0.7,
         s2_query_response_length_limit=None,
+        s2_batch_hydration=True,
+        s2_stream_results=False,
+        s2_max_results_per_query=None,
+        s2_checkpoint_path=None,
+        s2_bulk_search=False,
+        s2_bulk_max_records_per_query=None,
+        s2_bulk_filters=None,
+        s2_bulk_keep=None,
+        s2_bulk_spool_folder=None,
+        related_papers_max=0,
+        related_papers_max_requests=200,
+        related_papers_max_seconds=300,
+        author_expansion_top_n=0,
+        author_expansion_top_n_collaborators=0,
+        author_expansion_papers_per_author=100,
+        embedding_model="text-embedding-3-large",
+        pdf_downloader=None,
+        pdf_download_max_attempts=3,
+        pdf_extraction_cache_path=None,
+        pdf_parsing_workers=1,
+        embedding_batch_size=256,
         pdf_download_path=None,
         chromadb_path=None,
     ):
@@ -49,9 +82,46 @@ class CorpusGatherer(BaseTool):
         self.user_goals_text = user_goals_text
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.s2_interface = s2_interface or SemanticScholarInterface(query_response_length_limit=s2_query_response_length_limit)
+        self.chunk_size_unit = chunk_size_unit
+        self.s2_interface = s2_interface or SemanticScholarInterface(
+            query_response_length_limit=s2_query_response_length_limit,
+            checkpoint_path=s2_checkpoint_path,
+        )
         self.s2_results_num_eval_loops = s2_results_num_eval_loops
+        self.evaluate_abstracts_before_download = evaluate_abstracts_before_download
+        self.text_layer_abstract_min_confidence = text_layer_abstract_min_confidence
+        # where the evaluated abstracts came from: s2, text_layer or vision
+        self.abstract_source_counts = Counter()
+        self.s2_batch_hydration = s2_batch_hydration
+        self.s2_stream_results = s2_stream_results
+        self.s2_max_results_per_query = s2_max_results_per_query
+        self.s2_bulk_search = s2_bulk_search
+        self.s2_bulk_max_records_per_query = s2_bulk_max_records_per_query
+        self.s2_bulk_filters = s2_bulk_filters
+        self.s2_bulk_keep = s2_bulk_keep
+        self.s2_bulk_spool_folder = s2_bulk_spool_folder or (
+            os.path.join(os.path.dirname(os.path.abspath(pdf_download_path)), "s2_bulk_spool")
+            if pdf_download_path else None
+        )
+        self.related_papers_max = related_papers_max
+        self.related_papers_max_requests = related_papers_max_requests
+        self.related_papers_max_seconds = related_papers_max_seconds
+        self.author_expansion_top_n = author_expansion_top_n
+        self.author_expansion_top_n_collaborators = author_expansion_top_n_collaborators
+        self.author_expansion_papers_per_author = author_expansion_papers_per_author
+        self.embedding_model = embedding_model
+        self.pdf_downloader = pdf_downloader or PDFDownloadManager()
+        self.pdf_download_max_attempts = pdf_download_max_attempts
         self.pdf_download_path = pdf_download_path
+        self.download_manifest = pdf_download_manifest.PDFDownloadManifest(
+            os.path.join(pdf_download_path, "download_manifest.sqlite")
+        ) if pdf_download_path else None
+        self.pdf_extraction_cache_path = pdf_extraction_cache_path or os.getenv("PDF_EXTRACTION_CACHE_PATH") or (
+            os.path.join(os.path.dirname(os.path.abspath(pdf_download_path)), "pdf_extraction_cache.sqlite")
+            if pdf_download_path else None
+        )
+        self.pdf_parsing_workers = pdf_parsing_workers
+        self.embedding_batch_size = embedding_batch_size
         self.chromadb_path = chromadb_path
         self.required_input = 'generate_queries'  # Specify the required input tool
 
@@ -74,7 +144,58 @@ class CorpusGatherer(BaseTool):
             )
 
     def search_s2_for_queries(self):
+        """
+        With batch hydration the queries only fetch paperId/title and full
+        records are pulled once per unique paper via /paper/batch.
+        """
+        if self.s2_batch_hydration:
+            return self.s2_interface.search_and_hydrate_papers_via_queries(self.search_queries)
         return self.s2_interface.search_papers_via_queries(self.search_queries)
+
+    def bulk_search_s2_for_queries(self):
+        """
+        High-recall mode: spools every bulk-search record for each query to
+        disk first, then streams them back through s2_bulk_keep, yielding
+        each paper once. Only paperIds are kept in memory.
+        """
+        spool_paths = []
+        for query in self.search_queries:
+            query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+            spool_path = os.path.join(self.s2_bulk_spool_folder, f"bulk_{query_hash}.jsonl")
+            num_records = self.s2_interface.bulk_search_to_spool(
+                query,
+                spool_path,
+                max_records=self.s2_bulk_max_records_per_query,
+                filters=self.s2_bulk_filters,
+            )
+            logging.info(f"Spooled {num_records} bulk search records for query: {query}")
+            spool_paths.append(spool_path)
+
+        seen_paper_ids = set()
+        for spool_path in spool_paths:
+            for paper in iter_spool(spool_path, keep=self.s2_bulk_keep):
+                if paper.get("paperId") in seen_paper_ids:
+                    continue
+                seen_paper_ids.add(paper.get("paperId"))
+                yield paper
+        logging.info(f"{len(seen_paper_ids)} unique papers passed the bulk search filter")
+
+    def stream_s2_for_queries(self):
+        """
+        Yields full-field papers page by page while later queries and pages
+        are still in flight, so downloads can start on the first results.
+        Each paper is yielded once; later matches only extend its
+        "matchedQueries".
+        """
+        deduplicator = S2ResultDeduplicator()
+        for query, paper in self.s2_interface.stream_papers_via_queries(
+            self.search_queries,
+            max_results_per_query=self.s2_max_results_per_query,
+        ):
+            record = deduplicator.add(paper, query=query)
+            if record is not None:
+                yield record
+        logging.info(f"Skipped {deduplicator.num_duplicates} duplicate search results")
         
     
     def populate_s2_search_results_text(self, search_results):
@@ -82,62 +203,74 @@ class CorpusGatherer(BaseTool):
         Removes the "openAccessPdf" and "abstract" fields, so that they
         can be re-written to a more flexible "text" field containing
         chunks
+
+        search_results can be a list or a generator of results as they arrive.
+        """
+        processed_results = self.format_results_and_download_pdfs(search_results)
+        all_chunks_with_ids = self.extract_pdf_text_into_results(processed_results)
+        return processed_results, all_chunks_with_ids
+
+    def format_results_and_download_pdfs(self, search_results):
+        """
+        Moves abstracts into the "text" field and downloads the open-access
+        PDFs of the results.
         """
-        logging.info(f"Processing {len(search_results)} search results")
+        logging.info("Processing search results")
         processed_results = []
-        for index, result in enumerate(search_results):
-            if result is None:
-                logging.warning(f"Skipping None result at index {index}")
-                continue
+        processed_paper_ids = set()
+        # downloads run in the background while the remaining results arrive;
+        # leaving the with-block waits for all of them
+        with self.pdf_downloader as downloader:
+            for index, result in enumerate(search_results):
+                if result is None:
+                    logging.warning(f"Skipping None result at index {index}")
+                    continue
             
-            try:
-                paper_id = result.get('paperId', 'unknown')
-                processed_result = {
-                    key: value for key, value in result.items() 
-                    if key not in ['openAccessPdf', 'abstract']
-                }
-                processed_result['text'] = {
-                    'abstract': None,
-                    'pdf_extraction': []
-                }
+                try:
+                    paper_id = result.get('paperId', 'unknown')
+                    if paper_id in processed_paper_ids:
+                        logging.info(f"Skipping duplicate result for {paper_id}")
+                        continue
+                    processed_paper_ids.add(paper_id)
+                    processed_result = {
+                        key: value for key, value in result.items() 
+                        if key not in ['openAccessPdf', 'abstract']
+                    }
+                    processed_result['text'] = {
+                        'abstract': None,
+                        'pdf_extraction': []
+                    }
                 
-                if result.get('abstract'):
-                    processed_result['text']['abstract'] = result['abstract']
+                    if result.get('abstract'):
+                        processed_result['text']['abstract'] = result['abstract']
                 
-                if (
-                    result.get('isOpenAccess') and result.get('openAccessPdf') and result['openAccessPdf'].get('url') and
-                    f"{result.get('paperId', 'unknown')}.pdf" not in os.listdir(self.pdf_download_path)
-                ):
-                    pdf_url = result['openAccessPdf']['url']
-                    pdf_filename = f"{result.get('paperId', 'unknown')}.pdf"
-                    pdf_path = os.path.join(self.pdf_download_path, pdf_filename)
-                    
-                    try:
-                        response = requests.get(pdf_url)
-                        response.raise_for_status()
-                        with open(pdf_path, 'wb') as pdf_file:
-                            pdf_file.write(response.content)
-                        logging.info(f"Downloaded PDF: {pdf_filename}")
-                    except Exception as e:
-                        logging.error(f"Failed to download PDF: {pdf_url}. Error: {str(e)}")
-                else:
-                    logging.info(f"PDF for {paper_id} already downloaded...")
+                    if result.get('isOpenAccess') and result.get('openAccessPdf') and result['openAccessPdf'].get('url'):
+                        pdf_url = result['openAccessPdf']['url']
+                        pdf_filename = f"{paper_id}.pdf"
+                        pdf_path = os.path.join(self.pdf_download_path, pdf_filename)
+                        if self._should_download(paper_id, pdf_path):
+                            self.download_manifest.mark_pending(paper_id, pdf_url)
+                            downloader.submit(paper_id, pdf_url, pdf_path).add_done_callback(
+                                self._record_download
+                            )
                 
-                processed_results.append(processed_result)
+                    processed_results.append(processed_result)
                 
-            except Exception as e:
-                logging.error(f"Error processing result at index {index}: {str(e)}")
-                continue
+                except Exception as e:
+                    logging.error(f"Error processing result at index {index}: {str(e)}")
+                    continue
 
         logging.info(f"Processed {len(processed_results)} valid results")
-        
-        extractor = LangchainPDFTextExtractor(
-            input_folder=self.pdf_download_path,
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-        )
+        logging.info(f"PDF download states: {self.download_manifest.counts()}")
+        return processed_results
+
+    def extract_pdf_text_into_results(self, processed_results):
+        """
+        Extracts and chunks the downloaded PDFs, fills each result's
+        "pdf_extraction" with its chunks and returns all chunks.
+        """
         try:
-            all_chunks_with_ids = extractor.pdf_directory_to_chunks_with_ids()
+            all_chunks_with_ids = self._pdf_text_extractor().pdf_directory_to_chunks_with_ids()
         except TypeError as e:
             logging.error(f"Error processing PDFs: {str(e)}")
             logging.warning("Skipping PDF extraction due to error")
@@ -169,16 +302,93 @@ class CorpusGatherer(BaseTool):
             else:
                 logging.warning(f"PDF not found for paper ID: {paper_id}")
 
-        return processed_results, all_chunks_with_ids
+        return all_chunks_with_ids
+
+    def _pdf_text_extractor(self):
+        return LangchainPDFTextExtractor(
+            input_folder=self.pdf_download_path,
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            cache_path=self.pdf_extraction_cache_path,
+            num_workers=self.pdf_parsing_workers,
+            chunk_size_unit=self.chunk_size_unit,
+        )
     
-    #TODO
-    def search_for_related_papers():
+    def _should_download(self, paper_id, pdf_path):
         """
-        finds papers related to a given input paper
-        possibly useful for each of the initial findings
-        which are found based on the created queries
+        Decides from the download manifest whether a paper's PDF still has
+        to be fetched. Pending entries left behind by a crashed run are
+        downloaded again. A PDF already in the folder without an entry
+        (fetched before the manifest existed) is recorded as downloaded.
         """
-        pass
+        entry = self.download_manifest.get(paper_id)
+        if entry is None:
+            if os.path.exists(pdf_path):
+                logging.info(f"PDF for {paper_id} already in the folder, recording it as downloaded")
+                self.download_manifest.mark_downloaded(paper_id)
+                return False
+            return True
+        if entry['state'] == pdf_download_manifest.DOWNLOADED and os.path.exists(pdf_path):
+            logging.info(f"PDF for {paper_id} already downloaded...")
+            return False
+        if entry['state'] == pdf_download_manifest.EXCLUDED:
+            logging.info(f"PDF for {paper_id} was excluded earlier, not downloading")
+            return False
+        if entry['state'] == pdf_download_manifest.FAILED and entry['attempts'] >= self.pdf_download_max_attempts:
+            logging.info(f"PDF for {paper_id} failed {entry['attempts']} times ({entry['reason']}), not retrying")
+            return False
+        return True
+
+    def _record_download(self, future):
+        download = future.result()
+        if download.ok:
+            self.download_manifest.mark_downloaded(download.paper_id)
+        else:
+            self.download_manifest.mark_failed(download.paper_id, download.error)
+
+    def search_for_related_papers(self, seed_results):
+        """
+        finds papers related to the given input papers by crawling their
+        references and citations, best match to the user goals first,
+        within the related_papers_* budgets
+        """
+        seed_papers = [result for result in seed_results if result is not None]
+        expander = CitationGraphExpander(
+            s2_interface=self.s2_interface,
+            embedding_function=get_embedding_function(self.embedding_model),
+            user_goals_text=self.user_goals_text,
+            max_papers=self.related_papers_max,
+            max_requests=self.related_papers_max_requests,
+            max_seconds=self.related_papers_max_seconds,
+        )
+        return expander.expand(seed_papers)
+
+    def search_for_author_papers(self, seed_results):
+        """
+        finds papers by the most frequent authors of the given papers and
+        by their most-cited collaborators
+        """
+        expander = AuthorExpander(
+            s2_interface=self.s2_interface,
+            top_n_authors=self.author_expansion_top_n,
+            papers_per_author=self.author_expansion_papers_per_author,
+            top_n_collaborators=self.author_expansion_top_n_collaborators,
+        )
+        return expander.expand([result for result in seed_results if result is not None])
+
+    def _with_expanded_papers(self, search_results):
+        """
+        Passes search results through as they arrive, then follows them
+        with the papers found from them by the enabled expansion strategies.
+        """
+        seed_results = []
+        for result in search_results:
+            seed_results.append(result)
+            yield result
+        if self.related_papers_max > 0:
+            yield from self.search_for_related_papers(seed_results)
+        if self.author_expansion_top_n > 0:
+            yield from self.search_for_author_papers(seed_results)
     
     
     #TODO
@@ -191,17 +401,24 @@ class CorpusGatherer(BaseTool):
         Evaluate papers based on their full abstracts.
         """
         paper_verdicts = []
+        evaluated_paper_ids = set()
 
         for result in results:
             paper_id = result.get('paperId', 'unknown')
+            if paper_id in evaluated_paper_ids:
+                logging.info(f"Already evaluated {paper_id}, skipping duplicate")
+                continue
+            evaluated_paper_ids.add(paper_id)
             
             # Get the abstract text
             abstract_text = result.get('text', {}).get('abstract')
             
-            if not abstract_text:
+            if abstract_text:
+                self.abstract_source_counts['s2'] += 1
+            else:
                 pdf_filename = f"{paper_id}.pdf"
                 pdf_path = os.path.join(self.pdf_download_path, pdf_filename)
-                abstract_text = extract_abstract_from_pdf(pdf_path=pdf_path, model_interface=self.model_interface)
+                abstract_text = self._abstract_from_pdf(paper_id, pdf_path)
 
             if not abstract_text:
                 logging.warning(f"No abstract found for paper {paper_id}.pdf in {self.pdf_download_path}. Skipping evaluation.")
@@ -230,14 +447,78 @@ class CorpusGatherer(BaseTool):
         
         logging.info(f"Number of papers approved: {len(approved_paper_ids)}")
         logging.info(f"Number of papers rejected: {len(excluded_paper_ids)}")
+        logging.info(f"Abstract sources so far: {dict(self.abstract_source_counts)}")
             
         return approved_paper_ids, excluded_paper_ids
     
     
+    def _abstract_from_pdf(self, paper_id, pdf_path):
+        """
+        Takes the abstract from the PDF's text layer when the heuristics are
+        confident enough, and from the vision model otherwise. Returns None
+        when the PDF was not downloaded.
+        """
+        if not pdf_path or not os.path.exists(pdf_path):
+            logging.info(f"No PDF of {paper_id} to take the abstract from")
+            return None
+
+        text_layer_abstract = extract_abstract_from_text_layer(pdf_path)
+        if text_layer_abstract.text and text_layer_abstract.confidence >= self.text_layer_abstract_min_confidence:
+            logging.info(f"Abstract of {paper_id} taken from the text layer (confidence {text_layer_abstract.confidence})")
+            self.abstract_source_counts['text_layer'] += 1
+            return text_layer_abstract.text
+
+        logging.info(
+            f"Text layer abstract of {paper_id} below confidence threshold "
+            f"({text_layer_abstract.confidence}), using vision extraction"
+        )
+        self.abstract_source_counts['vision'] += 1
+        return extract_abstract_from_pdf(pdf_path=pdf_path, model_interface=self.model_interface)
+    
+    
+    def evaluate_abstracts_then_download(self, search_results):
+        """
+        Runs the inclusion verdicts on S2 abstracts before anything is
+        downloaded, then downloads only the approved papers. Papers without
+        an abstract are downloaded for the vision-based abstract extraction
+        and evaluated afterwards; the rejected ones are deleted again, so
+        only approved PDFs are left to extract.
+
+        Returns the approved paper IDs.
+        """
+        results = [result for result in search_results if result]
+        with_abstract = [result for result in results if result.get('abstract')]
+        approved_paper_ids, excluded_paper_ids = self.evaluate_formatted_s2_results(
+            results=[
+                {**result, 'text': {'abstract': result['abstract'], 'pdf_extraction': []}}
+                for result in with_abstract
+            ],
+        )
+        self.download_manifest.mark_excluded(excluded_paper_ids)
+
+        approved = set(approved_paper_ids)
+        to_download = [
+            result for result in results
+            if result.get('paperId') in approved or not result.get('abstract')
+        ]
+        logging.info(
+            f"Abstract verdicts excluded {len(excluded_paper_ids)} of {len(with_abstract)} papers before download; "
+            f"fetching {len(to_download)} of {len(results)} results"
+        )
+        formatted_results = self.format_results_and_download_pdfs(to_download)
+
+        fallback_approved_ids, fallback_excluded_ids = self.evaluate_formatted_s2_results(
+            results=[result for result in formatted_results if not result['text']['abstract']],
+        )
+        self.delete_excluded_papers(ids_to_delete=fallback_excluded_ids)
+        return approved_paper_ids + fallback_approved_ids
+
+
     def delete_excluded_papers(self, ids_to_delete):
         """
         Delete PDF files for papers that were not approved for inclusion.
         """
+        self.download_manifest.mark_excluded(ids_to_delete)
         for paper_id in ids_to_delete:
             pdf_filename = f"{paper_id}.pdf"
             pdf_path = os.path.join(self.pdf_download_path, pdf_filename)
@@ -254,36 +535,54 @@ class CorpusGatherer(BaseTool):
     def embed_approved_search_results(self, approved_paper_ids, all_chunks_with_ids):
         """
         Gets chunks with ids for the selected papers and adds them to the database.
+
+        all_chunks_with_ids can be a generator (e.g. the extractor's
+        iter_chunks_with_ids); chunks are filtered and embedded in batches
+        as they arrive.
         """
-        approved_chunks = []
-        for chunk in all_chunks_with_ids:
-            # Extract paper ID from the chunk's source path
-            paper_id = chunk.metadata['source'].split('/')[-1].split('.')[0]
-            if paper_id in approved_paper_ids:
-                approved_chunks.append(Document(
-                    page_content=chunk.page_content,
-                    metadata={
-                        'id': chunk.metadata['id'],
-                        **chunk.metadata
-                    }
-                ))
+        approved_paper_ids = set(approved_paper_ids)
+
+        def approved_chunks():
+            for chunk in all_chunks_with_ids:
+                if chunk.metadata['paper_id'] in approved_paper_ids:
+                    yield Document(
+                        page_content=chunk.page_content,
+                        metadata={
+                            'id': chunk.metadata['id'],
+                            **chunk.metadata
+                        }
+                    )
         
         # Add the approved chunks to the vector database
-        if approved_chunks:
-            add_to_chromadb(approved_chunks, chroma_path=self.chromadb_path)
+        num_added = add_to_chromadb(
+            approved_chunks(), chroma_path=self.chromadb_path, batch_size=self.embedding_batch_size
+        )
         
-        logging.info(f"Added {len(approved_chunks)} chunks from {len(approved_paper_ids)} papers to the vector database.")
+        logging.info(f"Added {num_added} chunks from {len(approved_paper_ids)} papers to the vector database.")
 
     def gather_and_embed_corpus(self):
-        search_results = self.search_s2_for_queries()
-        formatted_search_results_with_text, all_chunks_with_ids = self.populate_s2_search_results_text(
-            search_results=search_results
-        )
-        approved_paper_ids, excluded_paper_ids = self.evaluate_formatted_s2_results(
-            results=formatted_search_results_with_text,
+        if self.s2_bulk_search:
+            search_results = self.bulk_search_s2_for_queries()
+        elif self.s2_stream_results:
+            search_results = self.stream_s2_for_queries()
+        else:
+            search_results = self.search_s2_for_queries()
+        if self.related_papers_max > 0 or self.author_expansion_top_n > 0:
+            search_results = self._with_expanded_papers(search_results)
+        if self.evaluate_abstracts_before_download:
+            approved_paper_ids = self.evaluate_abstracts_then_download(search_results)
+        else:
+            formatted_search_results_with_text = self.format_results_and_download_pdfs(search_results)
+            approved_paper_ids, excluded_paper_ids = self.evaluate_formatted_s2_results(
+                results=formatted_search_results_with_text,
+            )
+            self.delete_excluded_papers(ids_to_delete=excluded_paper_ids)
+        # excluded PDFs are deleted by now; the remaining ones are extracted,
+        # split and embedded a batch at a time
+        self.embed_approved_search_results(
+            approved_paper_ids=approved_paper_ids,
+            all_chunks_with_ids=self._pdf_text_extractor().iter_chunks_with_ids(),
         )
-        self.delete_excluded_papers(ids_to_delete=excluded_paper_ids)
-        self.embed_approved_search_results(approved_paper_ids=approved_paper_ids, all_chunks_with_ids=all_chunks_with_ids)
         return approved_paper_ids
 
 if __name__ == "__main__":
@@ -33,6 +33,7 @@ class ResearchQueryGenerator(BaseTool):
         model_interface,
         chunk_size=800,
         chunk_overlap=80,
+        chunk_size_unit="characters",
         num_vec_db_queries=1,
         vec_db_query_num_results=1,
         num_s2_queries=1,
@@ -45,6 +46,7 @@ class ResearchQueryGenerator(BaseTool):
         self.user_supplied_pdfs_directory = user_supplied_pdfs_directory
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.chunk_size_unit = chunk_size_unit
         self.num_vec_db_queries = num_vec_db_queries
         self.vec_db_query_num_results = vec_db_query_num_results
         self.num_s2_queries = num_s2_queries
@@ -62,7 +64,8 @@ class ResearchQueryGenerator(BaseTool):
             self.user_supplied_pdfs_directory,
             chunk_size=self.chunk_size,
             chunk_overlap=self.chunk_overlap,
-        ).pdf_directory_to_chunks_with_ids()
+            chunk_size_unit=self.chunk_size_unit,
+        ).iter_chunks_with_ids()
         add_to_chromadb(chunks_with_ids, chroma_path=self.chromadb_path)
         
     def search_initial_corpus_for_queries_based_on_goals(self):
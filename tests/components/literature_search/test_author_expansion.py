@@ -0,0 +1,56 @@
+import os
+
+from literature_reviewer.tools.components.data_ingestion.author_expansion import AuthorExpander, rank_authors
+from literature_reviewer.tools.components.data_ingestion.semantic_scholar import SemanticScholarInterface
+
+FIXTURE_QUERY = "Patient-specific finite element modeling of scoliotic curve progression"
+GROWTH_REMODELLING_PAPER = "7e6d5c4b3a29180f7e6d5c4b3a29180f7e6d5c4b"
+DISC_DEGENERATION_PAPER = "3b2a19087f6e5d4c3b2a19087f6e5d4c3b2a1908"
+
+
+def test_rank_authors_by_frequency():
+    papers = [
+        {"authors": [{"authorId": "b"}, {"authorId": "a"}]},
+        {"authors": [{"authorId": "b"}, {"authorId": None}]},
+        None,
+    ]
+    assert rank_authors(papers) == [("b", 2), ("a", 1)]
+    assert rank_authors(papers, exclude_ids={"b"}) == [("a", 1)]
+
+
+async def test_author_and_collaborator_papers_are_added_once(s2_stand_in, tmp_path):
+    cache_path = os.path.join(tmp_path, "s2_cache.sqlite")
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, burst_size=10, query_response_length_limit=10, cache_path=cache_path)
+    search_results = await s2_interface.async_search_papers_via_queries([FIXTURE_QUERY])
+
+    expander = AuthorExpander(s2_interface, top_n_authors=3, top_n_collaborators=1)
+    new_papers = await expander.async_expand(search_results)
+
+    assert [paper["paperId"] for paper in new_papers] == [GROWTH_REMODELLING_PAPER, DISC_DEGENERATION_PAPER]
+    assert new_papers[0]["matchedQueries"] == ["papers of author A. Researcher", "papers of author D. Modeller"]
+    assert new_papers[1]["matchedQueries"] == ["papers of author D. Modeller"]
+    # authors with their paper lists: top authors, collaborator candidates,
+    # collaborators; kept papers hydrated once per author group
+    assert s2_stand_in.request_counts["author_batch"] == 3
+    assert s2_stand_in.request_counts["batch"] == 2
+
+    requests_after_first_review = dict(s2_stand_in.request_counts)
+    second_review = SemanticScholarInterface(rate_limit=0.001, cache_path=cache_path)
+    await AuthorExpander(second_review, top_n_authors=3, top_n_collaborators=1).async_expand(search_results)
+    assert dict(s2_stand_in.request_counts) == requests_after_first_review
+
+
+async def test_authors_and_their_kept_papers_come_in_one_batch_each(s2_stand_in):
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, burst_size=10)
+    paper = s2_stand_in.papers[GROWTH_REMODELLING_PAPER]
+    author_ids = [author["authorId"] for author in paper["authors"]]
+
+    authors, author_papers = await s2_interface.async_get_authors_with_papers(author_ids + ["unknown"], limit=1)
+
+    assert s2_stand_in.request_counts["author_batch"] == 1
+    assert s2_stand_in.request_counts["batch"] == 1
+    assert [author["authorId"] for author in authors[:-1]] == author_ids
+    assert all("papers" not in author for author in authors[:-1])
+    # full records, not the minimal projection of the author batch
+    assert all(len(papers) == 1 and papers[0]["authors"] for papers in author_papers[:-1])
+    assert authors[-1] is None and author_papers[-1] == []
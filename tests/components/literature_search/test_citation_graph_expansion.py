@@ -0,0 +1,98 @@
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from pytest import fixture
+
+from literature_reviewer.tools.components.data_ingestion.citation_graph_expansion import CitationGraphExpander
+from literature_reviewer.tools.components.data_ingestion.semantic_scholar import SemanticScholarInterface
+
+# seed -> refs a (relevant), b (irrelevant); a -> ref c (relevant); b -> ref d (irrelevant)
+REFERENCES = {
+    "seed": ["a", "b"],
+    "a": ["c", "seed"],
+    "b": ["d"],
+    "c": [],
+    "d": [],
+}
+TITLES = {"a": "spine growth", "b": "pasta recipes", "c": "spine growth model", "d": "pasta shapes"}
+
+
+class KeywordEmbeddings:
+    """Two-dimensional stand-in for an embedding model: [spine, pasta]."""
+    def embed_query(self, text):
+        return self._embed(text)
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    @staticmethod
+    def _embed(text):
+        return [float("spine" in text), float("pasta" in text) + 0.01]
+
+
+@fixture
+async def citation_graph_s2(monkeypatch):
+    expanded = []
+
+    async def references(request):
+        paper_id = request.match_info["paper_id"]
+        expanded.append(paper_id)
+        if paper_id not in REFERENCES:
+            return web.json_response({"error": "Paper not found"}, status=404)
+        return web.json_response({"data": [
+            {"citedPaper": {"paperId": ref, "title": TITLES.get(ref, ref)}}
+            for ref in REFERENCES[paper_id]
+        ] + [{"citedPaper": {"paperId": None, "title": "unresolved"}}]})
+
+    app = web.Application()
+    app.router.add_get("/paper/{paper_id}/references", references)
+    async with TestServer(app) as server:
+        monkeypatch.setenv("S2_API_KEY", "test-key")
+        monkeypatch.setenv("S2_BASE_GRAPH_URL", str(server.make_url("")).rstrip("/"))
+        monkeypatch.setenv("S2_PAPER_FIELDS", "title")
+        yield expanded
+
+
+def make_expander(**kwargs):
+    return CitationGraphExpander(
+        s2_interface=SemanticScholarInterface(rate_limit=0.001, burst_size=10),
+        embedding_function=KeywordEmbeddings(),
+        user_goals_text="spine",
+        directions=("references",),
+        batch_size=1,
+        **kwargs,
+    )
+
+
+async def test_expansion_is_best_first_and_skips_known_papers(citation_graph_s2):
+    expander = make_expander(max_papers=3)
+    found = await expander.async_expand([{"paperId": "seed", "title": "seed"}])
+
+    assert citation_graph_s2 == ["seed", "a"]
+    assert [paper["paperId"] for paper in found] == ["a", "c", "b"]
+    assert found[1]["matchedQueries"] == ["references of a"]
+
+
+async def test_expansion_respects_request_budget(citation_graph_s2):
+    expander = make_expander(max_papers=10, max_requests=1)
+    found = await expander.async_expand([{"paperId": "seed", "title": "seed"}])
+
+    assert citation_graph_s2 == ["seed"]
+    assert expander.num_requests == 1
+    assert {paper["paperId"] for paper in found} == {"a", "b"}
+
+
+async def test_min_similarity_prunes_frontier(citation_graph_s2):
+    expander = make_expander(max_papers=10, min_similarity=0.5)
+    found = await expander.async_expand([{"paperId": "seed", "title": "seed"}])
+
+    assert "b" not in citation_graph_s2
+    assert [paper["paperId"] for paper in found] == ["a", "c"]
+
+
+async def test_failed_seed_is_skipped_and_counted(citation_graph_s2):
+    expander = make_expander(max_papers=10)
+    found = await expander.async_expand([{"paperId": "missing", "title": "missing"}, {"paperId": "seed", "title": "seed"}])
+
+    assert "missing" in citation_graph_s2
+    assert {paper["paperId"] for paper in found} == {"a", "b", "c", "d"}
+    assert expander.num_requests == 6
@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from pytest import fixture
+
+from literature_reviewer.tools.components.data_ingestion.rate_limiting import AsyncTokenBucket
+from literature_reviewer.tools.components.data_ingestion.semantic_scholar import SemanticScholarInterface
+
+
+@fixture
+async def reversed_latency_s2_url(monkeypatch):
+    """
+    Serves /paper/search where earlier queries answer more slowly, so
+    completion order is the reverse of submission order.
+    """
+    async def search(request):
+        query = request.query["query"]
+        await asyncio.sleep(0.05 * (5 - int(query)))
+        if query == "3":
+            return web.json_response({"total": 0, "data": []})
+        return web.json_response({"total": 1, "data": [{"paperId": f"paper-{query}"}]})
+
+    app = web.Application()
+    app.router.add_get("/paper/search", search)
+    async with TestServer(app) as server:
+        base_url = str(server.make_url("")).rstrip("/")
+        monkeypatch.setenv("S2_API_KEY", "test-key")
+        monkeypatch.setenv("S2_BASE_GRAPH_URL", base_url)
+        monkeypatch.setenv("S2_PAPER_FIELDS", "title")
+        yield base_url
+
+
+async def test_token_bucket_spaces_requests():
+    bucket = AsyncTokenBucket(rate=20.0, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    # first token is free, the remaining four are spaced 1/20 s apart
+    assert time.monotonic() - start >= 0.19
+
+
+async def test_async_search_preserves_query_order(reversed_latency_s2_url):
+    s2_interface = SemanticScholarInterface(rate_limit=0.01, burst_size=5)
+    results = await s2_interface.async_search_papers_via_queries(
+        ["0", "1", "2", "3", "4"], deduplicate=False
+    )
+    assert [r["paperId"] if r else None for r in results] == [
+        "paper-0", "paper-1", "paper-2", None, "paper-4"
+    ]
+
+
+@fixture
+async def batch_s2_url(monkeypatch):
+    """
+    Serves /paper/search returning overlapping minimal hits and /paper/batch
+    echoing full records, recording the size of every batch request.
+    """
+    batch_sizes = []
+
+    async def search(request):
+        query = request.query["query"]
+        assert request.query["fields"] == "paperId,title,externalIds"
+        return web.json_response({"total": 2, "data": [
+            {"paperId": f"paper-{query}", "title": query},
+            {"paperId": "paper-shared", "title": "shared"},
+        ]})
+
+    async def batch(request):
+        ids = (await request.json())["ids"]
+        batch_sizes.append(len(ids))
+        return web.json_response([
+            None if paper_id == "unknown" else {"paperId": paper_id, "abstract": f"about {paper_id}"}
+            for paper_id in ids
+        ])
+
+    app = web.Application()
+    app.router.add_get("/paper/search", search)
+    app.router.add_post("/paper/batch", batch)
+    async with TestServer(app) as server:
+        monkeypatch.setenv("S2_API_KEY", "test-key")
+        monkeypatch.setenv("S2_BASE_GRAPH_URL", str(server.make_url("")).rstrip("/"))
+        monkeypatch.setenv("S2_PAPER_FIELDS", "title,abstract")
+        monkeypatch.setenv("S2_SEARCH_FIELDS", "paperId,title,externalIds")
+        yield batch_sizes
+
+
+async def test_hydrate_papers_batches_of_500(batch_s2_url):
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, burst_size=10)
+    paper_ids = [f"id-{i}" for i in range(1001)] + ["unknown"]
+    papers = await s2_interface.async_hydrate_papers(paper_ids)
+    assert sorted(batch_s2_url) == [2, 500, 500]
+    assert [p["paperId"] for p in papers[:-1]] == paper_ids[:-1]
+    assert papers[-1] is None
+
+
+async def test_search_and_hydrate_fetches_each_paper_once(batch_s2_url):
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, burst_size=10)
+    results = await s2_interface.async_search_and_hydrate_papers_via_queries(
+        ["a", "b"], keep=lambda paper: paper["paperId"] != "paper-b"
+    )
+    assert batch_s2_url == [2]
+    assert [r["paperId"] for r in results] == ["paper-a", "paper-shared"]
+    assert all(r["abstract"] for r in results)
+    assert results[1]["matchedQueries"] == ["a", "b"]
+
+
+@fixture
+async def paginated_s2_url(monkeypatch):
+    """
+    Serves 250 results per query, at most `limit` per page, with `next`
+    offsets until the results run out.
+    """
+    requested_offsets = []
+
+    async def search(request):
+        query = request.query["query"]
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query["limit"])
+        requested_offsets.append((query, offset, limit))
+        end = min(offset + limit, 250)
+        body = {
+            "total": 250,
+            "offset": offset,
+            "data": [{"paperId": f"{query}-{i}"} for i in range(offset, end)],
+        }
+        if end < 250:
+            body["next"] = end
+        return web.json_response(body)
+
+    app = web.Application()
+    app.router.add_get("/paper/search", search)
+    async with TestServer(app) as server:
+        monkeypatch.setenv("S2_API_KEY", "test-key")
+        monkeypatch.setenv("S2_BASE_GRAPH_URL", str(server.make_url("")).rstrip("/"))
+        monkeypatch.setenv("S2_PAPER_FIELDS", "title")
+        yield requested_offsets
+
+
+async def test_stream_follows_next_offsets_up_to_cap(paginated_s2_url):
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, burst_size=10)
+    streamed = [
+        pair async for pair in s2_interface.async_stream_papers_via_queries(
+            ["a", "b"], max_results_per_query=230
+        )
+    ]
+    assert len(streamed) == 460
+    for query in ["a", "b"]:
+        paper_ids = [paper["paperId"] for q, paper in streamed if q == query]
+        assert paper_ids == [f"{query}-{i}" for i in range(230)]
+        assert sorted(
+            (offset, limit) for q, offset, limit in paginated_s2_url if q == query
+        ) == [(0, 100), (100, 100), (200, 30)]
+
+
+async def test_stream_stops_requesting_when_closed_early(paginated_s2_url):
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, burst_size=10)
+    stream = s2_interface.async_stream_papers_via_queries(["a"], max_results_per_query=250, max_buffered=1)
+    async for _query, paper in stream:
+        break
+    await stream.aclose()
+    assert len(paginated_s2_url) == 1
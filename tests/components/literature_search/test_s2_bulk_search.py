@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from literature_reviewer.tools.components.data_ingestion.s2_spool import SpoolWriter, count_spool, iter_spool
+from literature_reviewer.tools.components.data_ingestion.semantic_scholar import SemanticScholarInterface
+
+
+async def test_bulk_search_walks_tokens_into_spool(s2_stand_in, tmp_path):
+    spool_path = os.path.join(tmp_path, "bulk.jsonl")
+    s2_interface = SemanticScholarInterface(rate_limit=0.001)
+
+    num_records = await s2_interface.async_bulk_search_to_spool("idiopathic scoliosis", spool_path)
+
+    assert num_records == 2500
+    assert count_spool(spool_path) == 2500
+    assert s2_stand_in.request_counts["bulk_search"] == 3
+    open_access = list(iter_spool(spool_path, keep=lambda paper: paper["isOpenAccess"]))
+    assert len(open_access) == 1250
+
+
+async def test_bulk_search_resumes_from_saved_token(s2_stand_in, tmp_path):
+    spool_path = os.path.join(tmp_path, "bulk.jsonl")
+    s2_interface = SemanticScholarInterface(rate_limit=0.001)
+
+    assert await s2_interface.async_bulk_search_to_spool("growth plates", spool_path, max_records=1000) == 1000
+    assert await s2_interface.async_bulk_search_to_spool("growth plates", spool_path) == 2500
+    assert s2_stand_in.request_counts["bulk_search"] == 3
+
+    # finished spools are not fetched again
+    assert await s2_interface.async_bulk_search_to_spool("growth plates", spool_path) == 2500
+    assert s2_stand_in.request_counts["bulk_search"] == 3
+    paper_ids = [paper["paperId"] for paper in iter_spool(spool_path)]
+    assert len(set(paper_ids)) == 2500
+
+
+async def test_bulk_search_passes_filters(s2_stand_in, tmp_path):
+    spool_path = os.path.join(tmp_path, "bulk.jsonl")
+    s2_interface = SemanticScholarInterface(rate_limit=0.001)
+    num_records = await s2_interface.async_bulk_search_to_spool(
+        "brace treatment", spool_path, filters={"year": "2020-"}
+    )
+    assert num_records == 500
+    assert all(paper["year"] >= 2020 for paper in iter_spool(spool_path))
+
+
+async def test_rerun_with_other_filters_replaces_the_spool(s2_stand_in, tmp_path):
+    spool_path = os.path.join(tmp_path, "bulk.jsonl")
+    s2_interface = SemanticScholarInterface(rate_limit=0.001)
+
+    assert await s2_interface.async_bulk_search_to_spool("brace treatment", spool_path) == 2500
+    num_records = await s2_interface.async_bulk_search_to_spool(
+        "brace treatment", spool_path, filters={"year": "2020-"}
+    )
+
+    assert num_records == 500
+    assert count_spool(spool_path) == 500
+    assert all(paper["year"] >= 2020 for paper in iter_spool(spool_path))
+
+
+async def test_interrupted_run_with_other_filters_is_not_resumed(s2_stand_in, tmp_path):
+    spool_path = os.path.join(tmp_path, "bulk.jsonl")
+    s2_interface = SemanticScholarInterface(rate_limit=0.001)
+
+    assert await s2_interface.async_bulk_search_to_spool("brace treatment", spool_path, max_records=1000) == 1000
+    num_records = await s2_interface.async_bulk_search_to_spool(
+        "brace treatment", spool_path, filters={"year": "2020-"}
+    )
+
+    assert num_records == count_spool(spool_path) == 500
+
+
+def test_parquet_spool_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    spool_path = os.path.join(tmp_path, "bulk.parquet")
+    with SpoolWriter(spool_path) as spool:
+        spool.write_many([{"paperId": "a", "year": 2020, "authors": [{"name": "A"}]}])
+        spool.write_many([{"paperId": "b", "year": None, "isOpenAccess": True}])
+    assert count_spool(spool_path) == 2
+    assert [paper["paperId"] for paper in iter_spool(spool_path, keep=lambda paper: paper.get("year"))] == ["a"]
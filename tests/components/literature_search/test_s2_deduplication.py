@@ -0,0 +1,70 @@
+from literature_reviewer.tools.components.data_ingestion.s2_deduplication import (
+    S2ResultDeduplicator,
+    normalize_title,
+)
+
+
+def test_normalize_title_ignores_case_accents_and_punctuation():
+    assert normalize_title("Vertebral Growth: A Finite-Element Review.") == normalize_title(
+        "vertebral growth  a finite element review"
+    )
+    assert normalize_title("Modèle   Éléments-finis") == "modele elements finis"
+    assert normalize_title("...") is None
+
+
+def test_duplicates_merge_on_paper_id_doi_or_title():
+    deduplicator = S2ResultDeduplicator()
+    assert deduplicator.add({"paperId": "p1", "title": "Spine Growth", "year": 2021, "abstract": None}, query="q1")
+    assert not deduplicator.add({"paperId": "p1", "abstract": "Growth of the spine."}, query="q2")
+    assert deduplicator.add(
+        {"paperId": "p2", "title": "Bracing", "externalIds": {"DOI": "10.1/ABC"}}, query="q1"
+    )
+    assert not deduplicator.add(
+        {"paperId": "p2-preprint", "title": "Bracing trial", "externalIds": {"DOI": "10.1/abc"}}, query="q3"
+    )
+    assert not deduplicator.add({"paperId": "p3", "title": "spine growth.", "year": 2021}, query="q3")
+    assert not deduplicator.add({"paperId": "p1", "title": "Spine Growth"}, query="q1")
+
+    papers = deduplicator.papers()
+    assert [paper["paperId"] for paper in papers] == ["p1", "p2"]
+    assert papers[0]["abstract"] == "Growth of the spine."
+    assert papers[0]["matchedQueries"] == ["q1", "q2", "q3"]
+    assert papers[1]["matchedQueries"] == ["q1", "q3"]
+    assert deduplicator.num_duplicates == 4
+    assert {"paperId": "p3"} in deduplicator
+
+
+def test_none_results_are_ignored():
+    deduplicator = S2ResultDeduplicator()
+    assert not deduplicator.add(None, query="empty query")
+    assert len(deduplicator) == 0
+
+
+def test_title_only_matches_with_the_year_or_first_author():
+    deduplicator = S2ResultDeduplicator()
+    assert deduplicator.add({"title": "Editorial", "year": 2020, "authors": [{"name": "A. Editor"}]})
+    # same title, nothing else to go on
+    assert deduplicator.add({"title": "Editorial"})
+    # same title, another year and author
+    assert deduplicator.add({"title": "Editorial", "year": 2022, "authors": [{"name": "B. Other"}]})
+    assert not deduplicator.add({"title": "editorial", "year": 2020})
+    assert not deduplicator.add({"title": "Editorial.", "authors": [{"name": "Alice Editor"}]})
+
+    assert len(deduplicator) == 3
+    assert deduplicator.num_duplicates == 2
+
+
+def test_callers_records_are_not_modified():
+    first = {"paperId": "p1", "title": "Spine Growth", "abstract": None}
+    duplicate = {"paperId": "p1", "abstract": "Growth of the spine.", "matchedQueries": ["q0"]}
+    deduplicator = S2ResultDeduplicator()
+
+    record = deduplicator.add(first, query="q1")
+    assert deduplicator.add(duplicate, query="q2") is None
+
+    assert first == {"paperId": "p1", "title": "Spine Growth", "abstract": None}
+    assert duplicate == {"paperId": "p1", "abstract": "Growth of the spine.", "matchedQueries": ["q0"]}
+    # the returned record is the stored one and carries the merged fields
+    assert record is deduplicator.papers()[0]
+    assert record["abstract"] == "Growth of the spine."
+    assert record["matchedQueries"] == ["q1", "q0", "q2"]
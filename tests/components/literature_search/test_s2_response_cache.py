@@ -0,0 +1,72 @@
+import os
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from pytest import fixture
+
+from literature_reviewer.tools.components.data_ingestion.s2_response_cache import S2ResponseCache
+from literature_reviewer.tools.components.data_ingestion.semantic_scholar import SemanticScholarInterface
+
+
+@fixture
+async def counting_s2_url(monkeypatch):
+    request_counts = {"search": 0}
+
+    async def search(request):
+        request_counts["search"] += 1
+        query = request.query["query"]
+        return web.json_response({"total": 1, "data": [{"paperId": f"paper-{query}"}]})
+
+    app = web.Application()
+    app.router.add_get("/paper/search", search)
+    async with TestServer(app) as server:
+        monkeypatch.setenv("S2_API_KEY", "test-key")
+        monkeypatch.setenv("S2_BASE_GRAPH_URL", str(server.make_url("")).rstrip("/"))
+        monkeypatch.setenv("S2_PAPER_FIELDS", "title")
+        yield request_counts
+
+
+async def test_rerun_with_identical_queries_makes_no_requests(counting_s2_url, tmp_path):
+    cache_path = os.path.join(tmp_path, "s2_cache.sqlite")
+    queries = ["spine growth", "scoliosis progression"]
+
+    first_run = SemanticScholarInterface(rate_limit=0.001, cache_path=cache_path)
+    first_results = await first_run.async_search_papers_via_queries(queries)
+    assert counting_s2_url["search"] == 2
+
+    second_run = SemanticScholarInterface(rate_limit=0.001, cache_path=cache_path)
+    second_results = await second_run.async_search_papers_via_queries(queries)
+    assert counting_s2_url["search"] == 2
+    assert second_results == first_results
+    assert second_run.response_cache.stats()["hits"] == 2
+
+
+def test_cache_key_ignores_param_order():
+    key_a = S2ResponseCache.make_key("GET", "/paper/search", {"query": "q", "limit": 3, "offset": 0})
+    key_b = S2ResponseCache.make_key("get", "/paper/search", {"offset": 0, "limit": "3", "query": "q"})
+    key_c = S2ResponseCache.make_key("GET", "/paper/search", {"query": "q", "limit": 3, "offset": 3})
+    assert key_a == key_b
+    assert key_a != key_c
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = S2ResponseCache(os.path.join(tmp_path, "cache.sqlite"), ttl_seconds=-1)
+    cache.put("key", "/paper/search", {"data": []})
+    assert cache.get("key") is None
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path):
+    entry = {"data": "x" * 100}
+    entry_size = len('{"data": "' + "x" * 100 + '"}')
+    cache = S2ResponseCache(os.path.join(tmp_path, "cache.sqlite"), max_bytes=2 * entry_size)
+    cache.put("a", "/paper/search", entry)
+    cache.put("b", "/paper/search", entry)
+    assert cache.get("a") == entry  # "b" is now least recently used
+    cache.put("c", "/paper/search", entry)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == entry
+    assert cache.get("c") == entry
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import time
+
+import aiohttp
+import pytest
+
+from literature_reviewer.tools.components.data_ingestion.semantic_scholar import SemanticScholarInterface
+
+FIXTURE_QUERY = "Patient-specific finite element modeling of scoliotic curve progression"
+
+
+async def test_429_honours_retry_after_and_only_retries_that_request(s2_stand_in):
+    s2_stand_in.burst_429_every = 2
+    s2_stand_in.burst_429_length = 1
+    s2_stand_in.retry_after = 0.2
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, max_concurrent_requests=1)
+
+    start = time.monotonic()
+    results = await s2_interface.async_search_papers_via_queries(["a", "b"], deduplicate=False)
+
+    assert time.monotonic() - start >= 0.2
+    assert s2_stand_in.status_counts[429] == 1
+    assert s2_stand_in.request_counts["search"] == 3
+    assert len(results) == 6
+
+
+async def test_client_errors_are_not_retried(s2_stand_in):
+    s2_interface = SemanticScholarInterface(rate_limit=0.001)
+    semaphore = asyncio.Semaphore(1)
+    with pytest.raises(aiohttp.ClientResponseError) as error:
+        async with s2_interface._client_session() as session:
+            # over the 500-id batch limit, the stand-in answers 400
+            await s2_interface._request_json(
+                session, semaphore, "POST", "/paper/batch", json_body={"ids": ["x"] * 501}
+            )
+    assert error.value.status == 400
+    assert s2_stand_in.request_counts["batch"] == 1
+
+
+async def test_server_errors_give_up_after_max_retries(s2_stand_in):
+    s2_stand_in.failure_rate = 1.0
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, max_retries=2, max_backoff_seconds=0.01)
+    with pytest.raises(aiohttp.ClientResponseError) as error:
+        await s2_interface.async_search_papers_via_queries([FIXTURE_QUERY])
+    assert error.value.status == 500
+    assert s2_stand_in.request_counts["search"] == 3
+
+
+async def test_completed_queries_survive_a_failed_run(s2_stand_in, tmp_path):
+    checkpoint_path = os.path.join(tmp_path, "s2_query_checkpoint.jsonl")
+    s2_stand_in.failure_rate = 1.0
+    s2_stand_in.queries["fails"] = []
+
+    first_run = SemanticScholarInterface(
+        rate_limit=0.001, max_retries=0, checkpoint_path=checkpoint_path
+    )
+    # the stand-in fails everything, so let two queries through first
+    s2_stand_in.failure_rate = 0.0
+    partial = await first_run.async_search_papers_via_queries([FIXTURE_QUERY, "some other query"])
+    s2_stand_in.failure_rate = 1.0
+    with pytest.raises(aiohttp.ClientResponseError):
+        await first_run.async_search_papers_via_queries([FIXTURE_QUERY, "some other query", "fails"])
+    assert s2_stand_in.request_counts["search"] == 3
+
+    s2_stand_in.failure_rate = 0.0
+    restarted_run = SemanticScholarInterface(rate_limit=0.001, checkpoint_path=checkpoint_path)
+    results = await restarted_run.async_search_papers_via_queries([FIXTURE_QUERY, "some other query", "fails"])
+    assert s2_stand_in.request_counts["search"] == 4
+    assert results == partial
+
+
+async def test_empty_query_is_checkpointed_without_a_placeholder(s2_stand_in, tmp_path):
+    checkpoint_path = os.path.join(tmp_path, "s2_query_checkpoint.jsonl")
+    s2_stand_in.queries["nothing"] = []
+
+    first_run = SemanticScholarInterface(rate_limit=0.001, query_response_length_limit=10, checkpoint_path=checkpoint_path)
+    assert await first_run.async_search_papers_via_queries(["nothing"], deduplicate=False) == [None]
+    assert await first_run.async_search_papers_via_queries(["nothing"]) == []
+
+    # the streaming path resumes from the same checkpoint entry
+    restarted_run = SemanticScholarInterface(rate_limit=0.001, query_response_length_limit=10, checkpoint_path=checkpoint_path)
+    streamed = [item async for item in restarted_run.async_stream_papers_via_queries(["nothing"])]
+    assert streamed == []
+    assert s2_stand_in.request_counts["search"] == 1
@@ -0,0 +1,62 @@
+import io
+
+from pypdf import PdfReader
+
+from literature_reviewer.tools.components.data_ingestion.semantic_scholar import SemanticScholarInterface
+
+FIXTURE_QUERY = "Patient-specific finite element modeling of scoliotic curve progression"
+
+
+async def test_search_and_hydrate_against_recorded_fixtures(s2_stand_in):
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, burst_size=10, query_response_length_limit=10)
+    results = await s2_interface.async_search_and_hydrate_papers_via_queries(
+        [FIXTURE_QUERY, "vertebral growth modulation mechanobiology", "query with no results"]
+    )
+
+    assert len(results) == 3
+    assert results[0]["title"] == FIXTURE_QUERY
+    assert results[0]["openAccessPdf"]["url"].startswith(s2_stand_in.url)
+    assert results[1]["matchedQueries"] == [FIXTURE_QUERY, "vertebral growth modulation mechanobiology"]
+    assert s2_stand_in.request_counts == {"search": 3, "batch": 1}
+
+
+def test_sync_stream_pages_synthetic_results(s2_stand_in_thread):
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, burst_size=10)
+    streamed = list(s2_interface.stream_papers_via_queries(["load test a", "load test b"], max_results_per_query=250))
+
+    assert len(streamed) == 500
+    assert len({paper["paperId"] for _query, paper in streamed}) == 500
+    assert s2_stand_in_thread.request_counts["search"] == 6
+
+
+async def test_open_access_pdfs_have_a_text_layer(s2_stand_in, test_client):
+    s2_interface = SemanticScholarInterface(rate_limit=0.001, burst_size=10, query_response_length_limit=1)
+    [paper] = await s2_interface.async_search_papers_via_queries([FIXTURE_QUERY])
+
+    async with test_client.get(paper["openAccessPdf"]["url"]) as response:
+        assert response.status == 200
+        pdf_bytes = await response.read()
+
+    assert pdf_bytes.startswith(b"%PDF-")
+    page_text = PdfReader(io.BytesIO(pdf_bytes)).pages[0].extract_text()
+    assert "Abstract" in page_text
+    assert "asymmetric growth" in page_text
+
+
+async def test_configured_429_bursts_and_failures(s2_stand_in, test_client):
+    s2_stand_in.burst_429_every = 3
+    s2_stand_in.burst_429_length = 2
+    s2_stand_in.retry_after = 7
+
+    statuses, retry_afters = [], []
+    for _ in range(8):
+        async with test_client.get(f"{s2_stand_in.url}/paper/search", params={"query": "x"}) as response:
+            statuses.append(response.status)
+            retry_afters.append(response.headers.get("Retry-After"))
+    assert statuses == [200, 200, 429, 429, 200, 429, 429, 200]
+    assert retry_afters[2] == "7"
+
+    s2_stand_in.burst_429_every = 0
+    s2_stand_in.failure_rate = 1.0
+    async with test_client.post(f"{s2_stand_in.url}/paper/batch", json={"ids": ["a"]}) as response:
+        assert response.status == 500
@@ -0,0 +1,91 @@
+import json
+import os
+
+from pypdf import PdfWriter
+
+from literature_reviewer.tools import corpus_gatherer
+from literature_reviewer.tools.components.data_ingestion import pdf_download_manifest
+from literature_reviewer.tools.components.data_ingestion.pdf_downloader import PDFDownloadManager
+
+LONG_ABSTRACT = (
+    "Adolescent idiopathic scoliosis progresses during growth. We built patient-specific "
+    "finite element models of twelve spines and simulated three years of vertebral growth "
+    "under asymmetric loading. Simulated curve progression matched the measured progression "
+    "within four degrees in ten of twelve patients, suggesting that mechanically modulated "
+    "growth explains much of the progression seen in the clinic."
+)
+
+
+class VerdictByKeyword:
+    """
+    Stands in for the model: rejects every abstract mentioning "irrelevant".
+    """
+    def __init__(self):
+        self.prompts = []
+
+    def chat_completion_call(self, system_prompt, user_prompt, response_format=None):
+        self.prompts.append(user_prompt)
+        return json.dumps({"verdict": "irrelevant" not in user_prompt, "reason": "keyword"})
+
+
+def _result(server, paper_id, abstract=None):
+    return {
+        "paperId": paper_id,
+        "title": server.papers[paper_id]["title"],
+        "abstract": abstract,
+        "isOpenAccess": True,
+        "openAccessPdf": {"url": f"{server.url}/pdfs/{paper_id}.pdf"},
+    }
+
+
+def test_abstracts_are_judged_before_download_with_pdf_fallbacks(s2_stand_in_thread, tmp_path, monkeypatch):
+    server = s2_stand_in_thread
+    approved_s2, rejected_s2, text_layer, scanned, paywalled = list(server.papers)
+    server.papers[text_layer]["abstract"] = LONG_ABSTRACT
+    server.paywalled_pdfs.add(paywalled)
+
+    vision_calls = []
+
+    def fake_vision_extraction(pdf_path, model_interface):
+        vision_calls.append(pdf_path)
+        return "An irrelevant abstract read from the page images."
+
+    monkeypatch.setattr(corpus_gatherer, "extract_abstract_from_pdf", fake_vision_extraction)
+    model_interface = VerdictByKeyword()
+    gatherer = corpus_gatherer.CorpusGatherer(
+        search_queries=[],
+        user_goals_text="Scoliosis progression",
+        model_interface=model_interface,
+        pdf_downloader=PDFDownloadManager(max_workers=4),
+        pdf_download_path=str(tmp_path),
+    )
+    # a PDF without a text layer, downloaded by an earlier run
+    scanned_path = os.path.join(tmp_path, f"{scanned}.pdf")
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    with open(scanned_path, "wb") as pdf_file:
+        writer.write(pdf_file)
+    gatherer.download_manifest.mark_downloaded(scanned)
+
+    approved = gatherer.evaluate_abstracts_then_download([
+        _result(server, approved_s2, abstract="Growth modulation of scoliotic curves."),
+        _result(server, rejected_s2, abstract="An irrelevant study of knee cartilage."),
+        _result(server, text_layer),
+        _result(server, scanned),
+        _result(server, paywalled),
+    ])
+
+    assert sorted(approved) == sorted([approved_s2, text_layer])
+    # the rejected paper was never fetched, the approved ones were
+    assert os.path.exists(os.path.join(tmp_path, f"{approved_s2}.pdf"))
+    assert not os.path.exists(os.path.join(tmp_path, f"{rejected_s2}.pdf"))
+    assert server.request_counts["pdf"] == 3
+    assert gatherer.download_manifest.state(rejected_s2) == pdf_download_manifest.EXCLUDED
+    # abstracts came from S2, the text layer and the vision model; the
+    # paywalled paper had no PDF, so the vision model was not asked
+    assert LONG_ABSTRACT in model_interface.prompts
+    assert vision_calls == [scanned_path]
+    assert gatherer.abstract_source_counts == {"s2": 2, "text_layer": 1, "vision": 1}
+    # the paper rejected on its vision abstract is deleted again
+    assert not os.path.exists(scanned_path)
+    assert gatherer.download_manifest.state(scanned) == pdf_download_manifest.EXCLUDED
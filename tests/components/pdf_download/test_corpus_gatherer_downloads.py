@@ -0,0 +1,31 @@
+import os
+
+from literature_reviewer.tools.corpus_gatherer import CorpusGatherer
+from literature_reviewer.tools.components.data_ingestion import pdf_download_manifest
+from literature_reviewer.tools.components.data_ingestion.pdf_downloader import PDFDownloadManager
+
+
+def test_pdfs_from_before_the_manifest_are_not_downloaded_again(s2_stand_in_thread, tmp_path):
+    server = s2_stand_in_thread
+    existing, new = list(server.papers)[:2]
+    existing_path = os.path.join(tmp_path, f"{existing}.pdf")
+    with open(existing_path, "wb") as pdf_file:
+        pdf_file.write(b"%PDF-1.4 fetched by an earlier run")
+    gatherer = CorpusGatherer(
+        search_queries=[],
+        user_goals_text="Scoliosis progression",
+        model_interface=None,
+        pdf_downloader=PDFDownloadManager(max_workers=2),
+        pdf_download_path=str(tmp_path),
+    )
+
+    gatherer.format_results_and_download_pdfs([
+        {"paperId": paper_id, "isOpenAccess": True, "openAccessPdf": {"url": f"{server.url}/pdfs/{paper_id}.pdf"}}
+        for paper_id in (existing, new)
+    ])
+
+    assert server.request_counts["pdf"] == 1
+    with open(existing_path, "rb") as pdf_file:
+        assert pdf_file.read() == b"%PDF-1.4 fetched by an earlier run"
+    assert gatherer.download_manifest.state(existing) == pdf_download_manifest.DOWNLOADED
+    assert gatherer.download_manifest.state(new) == pdf_download_manifest.DOWNLOADED
@@ -0,0 +1,40 @@
+import os
+
+from literature_reviewer.tools.components.data_ingestion import pdf_download_manifest
+from literature_reviewer.tools.components.data_ingestion.pdf_download_manifest import PDFDownloadManifest
+
+
+def test_states_and_attempts_are_tracked(tmp_path):
+    manifest = PDFDownloadManifest(os.path.join(tmp_path, "download_manifest.sqlite"))
+    manifest.mark_pending("a", "https://example.org/a.pdf")
+    manifest.mark_failed("a", "404 Client Error")
+    manifest.mark_pending("a", "https://example.org/a.pdf")
+    manifest.mark_failed("a", "Read timed out")
+    manifest.mark_pending("b", "https://example.org/b.pdf")
+    manifest.mark_downloaded("b")
+
+    assert manifest.get("a") == {
+        "paper_id": "a",
+        "url": "https://example.org/a.pdf",
+        "state": pdf_download_manifest.FAILED,
+        "reason": "Read timed out",
+        "attempts": 2,
+    }
+    assert manifest.state("b") == pdf_download_manifest.DOWNLOADED
+    assert manifest.state("c") is None
+
+    manifest.mark_excluded(["b", "c"])
+    assert manifest.counts() == {"failed": 1, "excluded": 2}
+
+
+def test_pending_entries_survive_a_crash(tmp_path):
+    manifest_path = os.path.join(tmp_path, "download_manifest.sqlite")
+    manifest = PDFDownloadManifest(manifest_path)
+    for paper_id in ("a", "b", "c"):
+        manifest.mark_pending(paper_id, f"https://example.org/{paper_id}.pdf")
+    manifest.mark_downloaded("b")
+    manifest.close()
+
+    reopened = PDFDownloadManifest(manifest_path)
+    assert reopened.paper_ids_in_state(pdf_download_manifest.PENDING) == ["a", "c"]
+    assert reopened.get("b")["attempts"] == 1
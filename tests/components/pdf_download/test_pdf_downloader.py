@@ -0,0 +1,92 @@
+import os
+import time
+
+from literature_reviewer.tools.components.data_ingestion.pdf_downloader import PDFDownloadManager
+
+
+def _jobs(server, tmp_path, paper_ids):
+    return [
+        (paper_id, f"{server.url}/pdfs/{paper_id}.pdf", os.path.join(tmp_path, f"{paper_id}.pdf"))
+        for paper_id in paper_ids
+    ]
+
+
+def test_downloads_run_concurrently(s2_stand_in_thread, tmp_path):
+    s2_stand_in_thread.pdf_latency = 0.3
+    paper_ids = list(s2_stand_in_thread.papers)
+    manager = PDFDownloadManager(max_workers=8, max_per_host=8)
+
+    start = time.monotonic()
+    results = manager.download_all(_jobs(s2_stand_in_thread, tmp_path, paper_ids))
+
+    assert time.monotonic() - start < 0.3 * len(paper_ids)
+    assert all(result.ok for result in results)
+    for paper_id in paper_ids:
+        with open(os.path.join(tmp_path, f"{paper_id}.pdf"), "rb") as pdf_file:
+            assert pdf_file.read(5) == b"%PDF-"
+    assert manager.stats.succeeded == len(paper_ids)
+    assert manager.stats.num_bytes == sum(result.num_bytes for result in results)
+
+
+def test_per_host_cap_serializes_one_host(s2_stand_in_thread, tmp_path):
+    s2_stand_in_thread.pdf_latency = 0.2
+    paper_ids = list(s2_stand_in_thread.papers)[:3]
+    manager = PDFDownloadManager(max_workers=8, max_per_host=1)
+
+    start = time.monotonic()
+    manager.download_all(_jobs(s2_stand_in_thread, tmp_path, paper_ids))
+
+    assert time.monotonic() - start >= 0.2 * len(paper_ids)
+
+
+def test_busy_host_does_not_hold_up_other_hosts(s2_stand_in_thread, tmp_path):
+    s2_stand_in_thread.pdf_latency = 0.3
+    paper_id = next(iter(s2_stand_in_thread.papers))
+    # the same server under a second host name
+    hosts = {"busy": s2_stand_in_thread.url, "other": s2_stand_in_thread.url.replace("127.0.0.1", "localhost")}
+    jobs = [("busy", index) for index in range(6)] + [("other", index) for index in range(2)]
+    finished_at = {}
+
+    start = time.monotonic()
+    with PDFDownloadManager(max_workers=2, max_per_host=1) as manager:
+        for host, index in jobs:
+            future = manager.submit(
+                f"{host}-{index}", f"{hosts[host]}/pdfs/{paper_id}.pdf", os.path.join(tmp_path, f"{host}-{index}.pdf")
+            )
+            future.add_done_callback(lambda done: finished_at.setdefault(done.result().paper_id, time.monotonic()))
+        results = manager.wait()
+
+    assert all(result.ok for result in results)
+    # the other host's downloads run beside the busy host's queue, not after it
+    assert max(finished_at["other-0"], finished_at["other-1"]) - start < 0.3 * 3
+    assert max(finished_at.values()) - start >= 0.3 * 6
+
+
+def test_failures_are_reported_not_raised(s2_stand_in_thread, tmp_path):
+    manager = PDFDownloadManager(read_timeout=5)
+    results = manager.download_all(_jobs(s2_stand_in_thread, tmp_path, ["no-such-paper"]))
+
+    assert not results[0].ok
+    assert "404" in results[0].error
+    assert not os.path.exists(results[0].path)
+    assert manager.stats.failed == 1
+    assert manager.stats.failures_by_host
+
+
+def test_non_pdf_responses_are_rejected(s2_stand_in_thread, tmp_path):
+    paper_id = next(iter(s2_stand_in_thread.papers))
+    s2_stand_in_thread.paywalled_pdfs.add(paper_id)
+    results = PDFDownloadManager().download_all(_jobs(s2_stand_in_thread, tmp_path, [paper_id]))
+
+    assert not results[0].ok
+    assert "not a PDF" in results[0].error
+    assert os.listdir(tmp_path) == []
+
+
+def test_oversized_downloads_are_abandoned(s2_stand_in_thread, tmp_path):
+    paper_id = next(iter(s2_stand_in_thread.papers))
+    results = PDFDownloadManager(max_bytes=100).download_all(_jobs(s2_stand_in_thread, tmp_path, [paper_id]))
+
+    assert not results[0].ok
+    assert "100 byte limit" in results[0].error
+    assert os.listdir(tmp_path) == []
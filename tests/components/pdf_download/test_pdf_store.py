@@ -0,0 +1,66 @@
+import os
+import time
+
+from literature_reviewer.tools.components.data_ingestion.pdf_downloader import PDFDownloadManager
+from literature_reviewer.tools.components.data_ingestion.pdf_store import PDFStore
+
+
+def _write(path, content):
+    with open(path, "wb") as file:
+        file.write(content)
+    return path
+
+
+def test_store_links_into_other_folders(tmp_path):
+    store = PDFStore(os.path.join(tmp_path, "store"))
+    source = _write(os.path.join(tmp_path, "a.pdf"), b"%PDF-1.4 first")
+    sha256 = store.add("paper-a", source)
+
+    dest = os.path.join(tmp_path, "other_run.pdf")
+    assert store.link_into("paper-a", dest)
+    assert os.path.samefile(dest, store.blob_path(sha256))
+    assert not store.link_into("paper-b", dest)
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = PDFStore(os.path.join(tmp_path, "store"))
+    store.add("paper-a", _write(os.path.join(tmp_path, "a.pdf"), b"%PDF-1.4 same"))
+    store.add("paper-b", _write(os.path.join(tmp_path, "b.pdf"), b"%PDF-1.4 same"))
+    stats = store.stats()
+    assert stats["papers"] == 2
+    assert stats["files"] == 1
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    store = PDFStore(os.path.join(tmp_path, "store"), max_bytes=250)
+    for name in ("a", "b"):
+        store.add(f"paper-{name}", _write(os.path.join(tmp_path, f"{name}.pdf"), name.encode() * 100))
+        time.sleep(0.01)
+    store.lookup("paper-a")
+    time.sleep(0.01)
+    store.add("paper-c", _write(os.path.join(tmp_path, "c.pdf"), b"c" * 100))
+
+    assert store.lookup("paper-b") is None
+    assert store.lookup("paper-a") is not None
+    assert store.evictions == 1
+    # run folders keep their hardlinks to evicted files
+    assert os.path.getsize(os.path.join(tmp_path, "b.pdf")) == 100
+
+
+def test_second_run_does_not_download_again(s2_stand_in_thread, tmp_path):
+    store_path = os.path.join(tmp_path, "store")
+    paper_ids = list(s2_stand_in_thread.papers)[:3]
+    for run in ("run_1", "run_2"):
+        run_folder = os.path.join(tmp_path, run)
+        os.makedirs(run_folder)
+        manager = PDFDownloadManager(store_path=store_path)
+        results = manager.download_all([
+            (paper_id, f"{s2_stand_in_thread.url}/pdfs/{paper_id}.pdf", os.path.join(run_folder, f"{paper_id}.pdf"))
+            for paper_id in paper_ids
+        ])
+        assert all(result.ok for result in results)
+
+    assert s2_stand_in_thread.request_counts["pdf"] == 3
+    assert manager.stats.from_store == 3
+    assert sorted(os.listdir(os.path.join(tmp_path, "run_2"))) == sorted(f"{paper_id}.pdf" for paper_id in paper_ids)
@@ -0,0 +1,50 @@
+import os
+import shutil
+
+from langchain.schema.document import Document
+from s2_stand_in_server import make_pdf
+
+from literature_reviewer.tools.components.data_ingestion.preprocessing.langchain_extract_from_pdf import LangchainPDFTextExtractor
+
+
+def _ids(folder):
+    chunks = LangchainPDFTextExtractor(input_folder=folder, chunk_size=200, chunk_overlap=20).pdf_directory_to_chunks_with_ids()
+    return [chunk.metadata["id"] for chunk in chunks], chunks
+
+
+def test_same_paper_in_another_run_folder_keeps_its_chunk_ids(tmp_path):
+    run_1 = os.path.join(tmp_path, "run_1")
+    os.makedirs(run_1)
+    with open(os.path.join(run_1, "649def34.pdf"), "wb") as pdf_file:
+        pdf_file.write(make_pdf("Scoliosis progression", "Growth modulation of the vertebral endplates. " * 20))
+    shutil.copytree(run_1, os.path.join(tmp_path, "run_2"))
+
+    first_ids, _ = _ids(run_1)
+    second_ids, chunks = _ids(os.path.join(tmp_path, "run_2"))
+
+    assert second_ids == first_ids
+    assert len(set(first_ids)) == len(first_ids)
+    assert all(chunk_id.startswith("649def34:") for chunk_id in first_ids)
+    assert all(chunk.metadata["paper_id"] == "649def34" for chunk in chunks)
+    assert all(chunk.metadata["source"] == os.path.join(tmp_path, "run_2", "649def34.pdf") for chunk in chunks)
+
+
+def test_ids_depend_on_paper_and_normalized_text_only():
+    def chunk(source, text, page=0):
+        return Document(page_content=text, metadata={"source": source, "page": page})
+
+    def ids(*chunks):
+        return [chunk.metadata["id"] for chunk in LangchainPDFTextExtractor._calculate_chunk_ids(list(chunks))]
+
+    run_1 = ids(
+        chunk("/run_1/a.pdf", "Conflict of interest: none."),
+        chunk("/run_1/a.pdf", "Conflict of interest: none.", page=1),
+    )
+    run_2 = ids(chunk("/run_2/a.pdf", "Conflict of\n interest:  none.", page=3))
+    other_paper = ids(chunk("/run_1/b.pdf", "Conflict of interest: none."))
+
+    # same paper and text, whatever the path, page or whitespace
+    assert run_2[0] == run_1[0]
+    assert other_paper[0] != run_1[0]
+    # a repeat within the paper is the text's second occurrence
+    assert run_1[1] != run_1[0]
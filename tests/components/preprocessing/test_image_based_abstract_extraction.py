@@ -0,0 +1,19 @@
+import base64
+import io
+
+from PIL import Image
+
+from literature_reviewer.tools.components.data_ingestion.preprocessing.image_based_abstract_extraction import encode_page_as_jpeg
+
+
+def test_pages_are_sent_as_small_grayscale_jpegs():
+    # a US letter page rendered in colour at pdf2image's default 200 dpi
+    page = Image.new("RGB", (1700, 2200), color=(250, 250, 245))
+
+    encoded = encode_page_as_jpeg(page, max_dimension=1000)
+    image = Image.open(io.BytesIO(base64.b64decode(encoded)))
+
+    assert image.format == "JPEG"
+    assert image.mode == "L"
+    assert max(image.size) == 1000
+    assert abs(image.size[0] / image.size[1] - 1700 / 2200) < 0.01
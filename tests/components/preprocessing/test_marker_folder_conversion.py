@@ -0,0 +1,144 @@
+import importlib.util
+import json
+import os
+import queue
+import time
+
+import pytest
+from s2_stand_in_server import make_pdf
+
+from literature_reviewer.tools.components.data_ingestion.pdf_store import sha256_of_file
+from literature_reviewer.tools.components.data_ingestion.preprocessing import marker_folder_conversion
+from literature_reviewer.tools.components.data_ingestion.preprocessing.marker_folder_conversion import (
+    MANIFEST_FILENAME,
+    ShardedMarkerConverter,
+)
+from literature_reviewer.tools.components.data_ingestion.preprocessing.marker_worker import MarkerJobResult
+
+MARKER_INSTALLED = importlib.util.find_spec("marker") is not None
+
+
+def _write_pdfs(folder, count):
+    os.makedirs(folder, exist_ok=True)
+    for index in range(count):
+        with open(os.path.join(folder, f"paper_{index}.pdf"), "wb") as pdf_file:
+            pdf_file.write(make_pdf(f"Paper {index}", "Vertebral growth modulation. " * 40))
+
+
+class StubWorker:
+    """
+    Stands in for MarkerWorker: a conversion takes convert_seconds, except
+    for files named hang*.pdf, which never finish. Loading the models takes
+    model_load_seconds.
+    """
+    convert_seconds = 0.1
+    model_load_seconds = 0.0
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.launches = []
+        self.converted = []
+        self._job = None
+        StubWorker.instances.append(self)
+
+    def launch(self):
+        self.launches.append(time.monotonic())
+        self._job = None
+
+    def is_ready(self, timeout=0.0):
+        remaining = self.launches[-1] + self.model_load_seconds - time.monotonic()
+        time.sleep(min(max(remaining, 0), timeout))
+        return remaining <= timeout
+
+    def wait_until_ready(self):
+        self.is_ready(timeout=self.model_load_seconds)
+
+    def start(self):
+        self.launch()
+        self.wait_until_ready()
+
+    def submit(self, pdf_path, output_folder, max_pages=None):
+        self._job = (len(self.converted), pdf_path, output_folder)
+        return self._job[0]
+
+    def next_result(self, timeout=None):
+        job_id, pdf_path, output_folder = self._job
+        if os.path.basename(pdf_path).startswith("hang"):
+            time.sleep(timeout)
+            raise queue.Empty
+        time.sleep(self.convert_seconds)
+        output_path = os.path.join(output_folder, os.path.basename(pdf_path) + ".md")
+        open(output_path, "w").close()
+        self.converted.append((os.path.basename(pdf_path), time.monotonic()))
+        return MarkerJobResult(job_id, pdf_path, True, output_path, num_pages=1)
+
+    def close(self, timeout=30.0):
+        pass
+
+
+def test_hanging_file_fails_while_its_worker_restarts_in_the_background(tmp_path, monkeypatch):
+    input_folder, output_folder = str(tmp_path / "pdfs"), str(tmp_path / "markdown")
+    _write_pdfs(input_folder, 4)
+    with open(os.path.join(input_folder, "hang.pdf"), "wb") as pdf_file:
+        pdf_file.write(make_pdf("Pathological", "Never finishes."))
+    monkeypatch.setattr(marker_folder_conversion, "MarkerWorker", StubWorker)
+    monkeypatch.setattr(StubWorker, "instances", [])
+    monkeypatch.setattr(StubWorker, "model_load_seconds", 1.0)
+
+    converter = ShardedMarkerConverter(num_workers=2, timeout_per_file=0.3, poll_interval=0.05)
+    summary = converter.convert_folder(input_folder, output_folder)
+
+    assert summary["failed"] == ["hang.pdf"]
+    assert sorted(summary["converted"]) == ["paper_0.pdf", "paper_1.pdf", "paper_2.pdf", "paper_3.pdf"]
+    hung_worker, other_worker = StubWorker.instances
+    assert len(hung_worker.launches) == 2
+    # the other shard converted everything while the hung worker reloaded
+    reloaded_at = hung_worker.launches[-1] + StubWorker.model_load_seconds
+    assert len(other_worker.converted) == 4
+    assert all(finished_at < reloaded_at for _, finished_at in other_worker.converted)
+
+
+def test_unchanged_converted_pdfs_are_skipped_without_starting_workers(tmp_path):
+    input_folder, output_folder = str(tmp_path / "pdfs"), str(tmp_path / "markdown")
+    _write_pdfs(input_folder, 2)
+    os.makedirs(output_folder)
+    manifest = {}
+    for filename in ("paper_0.pdf", "paper_1.pdf"):
+        output_path = os.path.join(output_folder, f"{filename}.md")
+        open(output_path, "w").close()
+        manifest[filename] = {"sha256": sha256_of_file(os.path.join(input_folder, filename)), "output_path": output_path}
+    with open(os.path.join(output_folder, MANIFEST_FILENAME), "w") as manifest_file:
+        json.dump(manifest, manifest_file)
+
+    summary = ShardedMarkerConverter(num_workers=2).convert_folder(input_folder, output_folder)
+
+    assert summary == {"converted": [], "skipped": ["paper_0.pdf", "paper_1.pdf"], "failed": []}
+
+
+@pytest.mark.skipif(MARKER_INSTALLED, reason="checks the failure mode without marker-pdf")
+def test_changed_pdf_is_converted_again(tmp_path):
+    input_folder, output_folder = str(tmp_path / "pdfs"), str(tmp_path / "markdown")
+    _write_pdfs(input_folder, 1)
+    os.makedirs(output_folder)
+    output_path = os.path.join(output_folder, "paper_0.md")
+    open(output_path, "w").close()
+    with open(os.path.join(output_folder, MANIFEST_FILENAME), "w") as manifest_file:
+        json.dump({"paper_0.pdf": {"sha256": "stale", "output_path": output_path}}, manifest_file)
+
+    converter = ShardedMarkerConverter(num_workers=1, threads_per_worker=1)
+    with pytest.raises(RuntimeError, match="failed to load its models"):
+        converter.convert_folder(input_folder, output_folder)
+
+
+@pytest.mark.skipif(not MARKER_INSTALLED, reason="needs marker-pdf and its models")
+def test_folder_is_converted_once_across_runs(tmp_path):
+    input_folder, output_folder = str(tmp_path / "pdfs"), str(tmp_path / "markdown")
+    _write_pdfs(input_folder, 3)
+    converter = ShardedMarkerConverter(num_workers=2, threads_per_worker=1)
+
+    first = converter.convert_folder(input_folder, output_folder)
+    second = converter.convert_folder(input_folder, output_folder)
+
+    assert sorted(first["converted"]) == ["paper_0.pdf", "paper_1.pdf", "paper_2.pdf"]
+    assert second["skipped"] == ["paper_0.pdf", "paper_1.pdf", "paper_2.pdf"]
+    assert second["converted"] == []
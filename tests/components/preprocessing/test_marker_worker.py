@@ -0,0 +1,35 @@
+import importlib.util
+import os
+
+import pytest
+from s2_stand_in_server import make_pdf
+
+from literature_reviewer.tools.components.data_ingestion.preprocessing.marker_worker import MarkerWorker
+
+MARKER_INSTALLED = importlib.util.find_spec("marker") is not None
+
+
+@pytest.mark.skipif(MARKER_INSTALLED, reason="checks the failure mode without marker-pdf")
+def test_worker_fails_fast_without_marker():
+    worker = MarkerWorker(startup_timeout=60)
+    with pytest.raises(RuntimeError, match="failed to load its models"):
+        worker.start()
+    assert not worker.is_alive
+
+
+@pytest.mark.skipif(not MARKER_INSTALLED, reason="needs marker-pdf and its models")
+def test_models_load_once_for_many_files(tmp_path):
+    pdf_paths = []
+    for index in range(2):
+        pdf_path = os.path.join(tmp_path, f"paper_{index}.pdf")
+        with open(pdf_path, "wb") as pdf_file:
+            pdf_file.write(make_pdf(f"Paper {index}", "Vertebral growth modulation. " * 40))
+        pdf_paths.append(pdf_path)
+
+    with MarkerWorker() as worker:
+        results = worker.convert_many(pdf_paths, os.path.join(tmp_path, "markdown"))
+        stats = worker.stats()
+
+    assert all(result.ok and os.path.exists(result.output_path) for result in results)
+    assert stats["jobs"] == 2 and stats["pages"] == 2
+    assert stats["queue_depth"] == 0
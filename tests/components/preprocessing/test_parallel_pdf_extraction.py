@@ -0,0 +1,60 @@
+import os
+
+from s2_stand_in_server import make_pdf
+
+from literature_reviewer.tools.components.data_ingestion.preprocessing.langchain_extract_from_pdf import LangchainPDFTextExtractor
+
+
+def _write_pdfs(folder, num_pdfs):
+    os.makedirs(folder, exist_ok=True)
+    for index in range(num_pdfs):
+        with open(os.path.join(folder, f"paper_{index:02d}.pdf"), "wb") as pdf_file:
+            pdf_file.write(make_pdf(f"Paper {index}", f"Finding number {index} about spinal growth. " * 30))
+    with open(os.path.join(folder, "paywall.pdf"), "wb") as not_a_pdf:
+        not_a_pdf.write(b"<html>Sign in</html>")
+
+
+def _chunk_ids_and_text(extractor):
+    return [(chunk.metadata["id"], chunk.page_content) for chunk in extractor.pdf_directory_to_chunks_with_ids()]
+
+
+def test_process_pool_matches_serial_extraction(tmp_path):
+    _write_pdfs(tmp_path, 6)
+    serial = LangchainPDFTextExtractor(input_folder=tmp_path, chunk_size=200, chunk_overlap=20)
+    parallel = LangchainPDFTextExtractor(
+        input_folder=tmp_path, chunk_size=200, chunk_overlap=20, num_workers=3, worker_chunksize=2
+    )
+
+    assert _chunk_ids_and_text(parallel) == _chunk_ids_and_text(serial)
+    assert parallel.load_stats["files"] == 6
+    assert parallel.load_stats["pages"] == 6
+    assert parallel.load_stats["pool_startup_seconds"] > 0
+    assert serial.load_stats["pool_startup_seconds"] == 0
+
+
+def test_process_pool_with_extraction_cache(tmp_path):
+    folder = os.path.join(tmp_path, "pdfs")
+    _write_pdfs(folder, 4)
+    cache_path = os.path.join(tmp_path, "cache.sqlite")
+    extractor = LangchainPDFTextExtractor(input_folder=folder, chunk_size=200, chunk_overlap=20, num_workers=2, cache_path=cache_path)
+    first = _chunk_ids_and_text(extractor)
+
+    extractor = LangchainPDFTextExtractor(input_folder=folder, chunk_size=200, chunk_overlap=20, num_workers=2, cache_path=cache_path)
+    assert _chunk_ids_and_text(extractor) == first
+    assert extractor.load_stats["files"] == 0
+
+
+def test_chunks_stream_without_parsing_ahead(tmp_path):
+    _write_pdfs(tmp_path, 20)
+    extractor = LangchainPDFTextExtractor(
+        input_folder=tmp_path, chunk_size=200, chunk_overlap=20, num_workers=2, worker_chunksize=1
+    )
+    chunks = extractor.iter_chunks_with_ids()
+
+    first_chunk = next(chunks)
+    assert first_chunk.metadata["id"].startswith("paper_00:")
+    assert extractor.load_stats["files"] == 1
+    chunks.close()
+
+    streamed = [(chunk.metadata["id"], chunk.page_content) for chunk in extractor.iter_chunks_with_ids()]
+    assert streamed == _chunk_ids_and_text(LangchainPDFTextExtractor(input_folder=tmp_path, chunk_size=200, chunk_overlap=20))
@@ -0,0 +1,61 @@
+import os
+import shutil
+
+from s2_stand_in_server import make_pdf
+
+from literature_reviewer.tools.components.data_ingestion.preprocessing.langchain_extract_from_pdf import LangchainPDFTextExtractor
+
+
+def _write_pdf(folder, name, title):
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, name), "wb") as pdf_file:
+        pdf_file.write(make_pdf(title, "Growth modulation of the vertebral endplates. " * 20))
+
+
+def _chunks(folder, cache_path, chunk_size=200):
+    extractor = LangchainPDFTextExtractor(
+        input_folder=folder, chunk_size=chunk_size, chunk_overlap=20, cache_path=cache_path
+    )
+    return extractor, extractor.pdf_directory_to_chunks_with_ids()
+
+
+def test_cached_extraction_matches_uncached(tmp_path):
+    folder = os.path.join(tmp_path, "pdfs")
+    _write_pdf(folder, "a.pdf", "Scoliosis progression")
+    _write_pdf(folder, "b.pdf", "Brace treatment")
+    uncached = LangchainPDFTextExtractor(input_folder=folder, chunk_size=200, chunk_overlap=20).pdf_directory_to_chunks_with_ids()
+
+    cache_path = os.path.join(tmp_path, "cache.sqlite")
+    _, first = _chunks(folder, cache_path)
+    extractor, second = _chunks(folder, cache_path)
+
+    assert extractor.cache.hits == 2 and extractor.cache.misses == 0
+    for chunks in (first, second):
+        assert [(chunk.page_content, chunk.metadata) for chunk in chunks] == \
+            [(chunk.page_content, chunk.metadata) for chunk in uncached]
+
+
+def test_only_new_files_and_parameters_are_parsed(tmp_path):
+    folder = os.path.join(tmp_path, "pdfs")
+    cache_path = os.path.join(tmp_path, "cache.sqlite")
+    _write_pdf(folder, "a.pdf", "Scoliosis progression")
+    _chunks(folder, cache_path)
+
+    _write_pdf(folder, "b.pdf", "Brace treatment")
+    extractor, _ = _chunks(folder, cache_path)
+    assert (extractor.cache.hits, extractor.cache.misses) == (1, 1)
+
+    extractor, _ = _chunks(folder, cache_path, chunk_size=300)
+    assert (extractor.cache.hits, extractor.cache.misses) == (0, 2)
+
+
+def test_moved_files_hit_the_cache_with_their_new_path(tmp_path):
+    cache_path = os.path.join(tmp_path, "cache.sqlite")
+    _write_pdf(os.path.join(tmp_path, "run_1"), "a.pdf", "Scoliosis progression")
+    _, first_run_chunks = _chunks(os.path.join(tmp_path, "run_1"), cache_path)
+
+    shutil.copytree(os.path.join(tmp_path, "run_1"), os.path.join(tmp_path, "run_2"))
+    extractor, chunks = _chunks(os.path.join(tmp_path, "run_2"), cache_path)
+    assert extractor.cache.hits == 1
+    assert all(chunk.metadata["source"] == os.path.join(tmp_path, "run_2", "a.pdf") for chunk in chunks)
+    assert [chunk.metadata["id"] for chunk in chunks] == [chunk.metadata["id"] for chunk in first_run_chunks]
@@ -0,0 +1,60 @@
+import os
+
+from pypdf import PdfWriter
+from s2_stand_in_server import make_pdf
+
+from literature_reviewer.tools.components.data_ingestion.preprocessing.text_layer_abstract_extraction import extract_abstract_from_text_layer
+
+ABSTRACT = (
+    "Adolescent idiopathic scoliosis progresses during growth. We built patient-specific "
+    "finite element models of twelve spines and simulated three years of vertebral growth "
+    "under asymmetric loading. Simulated curve progression matched the measured progression "
+    "within four degrees in ten of twelve patients, suggesting that mechanically modulated "
+    "growth explains much of the progression seen in the clinic."
+)
+
+
+def _write(tmp_path, name, content):
+    path = os.path.join(tmp_path, name)
+    with open(path, "wb") as pdf_file:
+        pdf_file.write(content)
+    return path
+
+
+def test_delimited_abstract_is_found_with_high_confidence(tmp_path):
+    path = _write(tmp_path, "paper.pdf", make_pdf("Finite element modeling of scoliotic progression", ABSTRACT))
+    result = extract_abstract_from_text_layer(path)
+
+    assert result.text == ABSTRACT
+    assert result.confidence == 1.0
+
+
+def test_implausibly_short_abstract_stays_below_the_default_threshold(tmp_path):
+    path = _write(tmp_path, "paper.pdf", make_pdf("Short", "Growth modulates curves."))
+    result = extract_abstract_from_text_layer(path)
+
+    assert result.text == "Growth modulates curves."
+    # heading and end marker alone do not reach 0.7
+    assert result.confidence == 0.6
+
+
+def test_undelimited_abstract_is_left_to_the_vision_fallback(tmp_path):
+    pdf = make_pdf("Finite element modeling of scoliotic progression", ABSTRACT)
+    # no section heading after the abstract (same length, so the PDF stays valid)
+    path = _write(tmp_path, "paper.pdf", pdf.replace(b"(1 Introduction)", b"(More findings.)"))
+    result = extract_abstract_from_text_layer(path)
+
+    # the slice runs into the body text, so its length earns nothing
+    assert result.text.startswith(ABSTRACT)
+    assert result.confidence == 0.4
+
+
+def test_pdf_without_text_layer_has_zero_confidence(tmp_path):
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    path = os.path.join(tmp_path, "scanned.pdf")
+    with open(path, "wb") as pdf_file:
+        writer.write(pdf_file)
+
+    assert extract_abstract_from_text_layer(path) == (None, 0.0)
+    assert extract_abstract_from_text_layer(os.path.join(tmp_path, "missing.pdf")) == (None, 0.0)
@@ -0,0 +1,57 @@
+from literature_reviewer.tools.components.data_ingestion.preprocessing.text_normalization import (
+    benchmark_normalization,
+    normalize_flat_text,
+    normalize_markdown,
+    normalize_text,
+)
+
+
+def test_text_layer_cleanup_keeps_paragraphs():
+    text = "The eﬀect of growth modu­\nlation­ was  measured \n in 42 patients.\x0c\n\n\n\nSecond​ paragraph. "
+
+    assert normalize_text(text) == "The effect of growth modulation was measured\nin 42 patients.\n\nSecond paragraph."
+
+
+def test_hyphens_that_are_not_line_break_hyphenation_are_kept():
+    assert normalize_text("growth-\nModulation and x - y") == "growth-\nModulation and x - y"
+
+
+def test_hyphens_at_line_breaks_are_kept_for_compounds():
+    assert normalize_text("patient self-\nreported pain") == "patient self-reported pain"
+    assert normalize_flat_text(normalize_text("a non-\ninvasive\nbrace")) == "a non-invasive brace"
+
+
+def test_ascii_and_unicode_text_get_the_same_character_fixes():
+    assert normalize_text("a\tb\x0bc") == "a b c"
+    assert normalize_text("a\tb\x0bc é") == "a b c é"
+
+
+def test_markdown_cleanup_matches_previous_corrections():
+    markdown = "**Results** were __significant__ (see ![](_Image_1.Png) and ![](fig.Jpeg))ઠdone"
+
+    assert normalize_markdown(markdown) == "Results were significant (see ![](_image_1.png) and ![](fig.jpeg)) done"
+
+
+def test_flat_text_has_single_spaces_only():
+    assert normalize_flat_text("  Vertebral\r\n growth\tmodulation\x0c\x85 ") == "Vertebral growth modulation"
+
+
+def test_benchmark_reports_throughput():
+    results = benchmark_normalization(num_bytes=64 * 1024, repeat=1)
+
+    assert set(results) >= {"normalize_text", "normalize_markdown", "normalize_flat_text"}
+    assert all(megabytes_per_second > 0 for megabytes_per_second in results.values())
+
+
+def test_crlf_and_lone_carriage_returns_are_single_line_breaks():
+    assert normalize_text("first line\r\nsecond line\r\n\r\nnext paragraph\rlast") == (
+        "first line\nsecond line\n\nnext paragraph\nlast"
+    )
+    assert normalize_text("é\r\nmore") == "é\nmore"
+    assert normalize_flat_text("a\r\nb") == "a b"
+
+
+def test_markdown_keeps_tabs_and_crlf_lines():
+    markdown = "| a\t| b |\r\n|---|---|\r\n\tindented **code**"
+
+    assert normalize_markdown(markdown) == "| a\t| b |\n|---|---|\n\tindented code"
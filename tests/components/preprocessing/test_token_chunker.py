@@ -0,0 +1,83 @@
+import os
+
+import pytest
+from langchain.schema.document import Document
+from s2_stand_in_server import make_pdf
+
+from literature_reviewer.tools.components.data_ingestion.preprocessing.langchain_extract_from_pdf import LangchainPDFTextExtractor
+from literature_reviewer.tools.components.data_ingestion.preprocessing.token_chunker import TokenChunker, get_tokenizer
+
+
+def _tiktoken_available():
+    # tiktoken downloads its encoding files on first use
+    try:
+        get_tokenizer()
+    except Exception:
+        return False
+    return True
+
+
+def _count_words(text):
+    return len(text.split())
+
+
+def _pages(*texts):
+    return [Document(page_content=text, metadata={"source": "paper.pdf", "page": page}) for page, text in enumerate(texts)]
+
+
+def test_paragraphs_are_packed_across_pages_up_to_the_target():
+    chunker = TokenChunker(chunk_tokens=20, overlap_tokens=0, count_tokens=_count_words)
+    paragraph = "Vertebral growth modulation slows curve progression."
+
+    chunks = chunker.split_documents(_pages(f"{paragraph}\n\n{paragraph}", f"{paragraph}\n\n{paragraph}"))
+
+    assert [chunk.metadata["num_tokens"] for chunk in chunks] == [18, 6]
+    assert [chunk.metadata["page"] for chunk in chunks] == [0, 1]
+    assert chunks[0].page_content.count("\n\n") == 2
+
+
+def test_sections_start_new_chunks_once_half_full():
+    chunker = TokenChunker(chunk_tokens=20, overlap_tokens=0, count_tokens=_count_words)
+    text = (
+        "Patients with adolescent idiopathic scoliosis were followed for two years.\n"
+        "2 Methods\nAnterior vertebral body tethering was performed.\n\nShort."
+    )
+
+    chunks = chunker.split_documents(_pages(text))
+
+    assert chunks[0].page_content.startswith("Patients")
+    assert chunks[1].page_content.startswith("2 Methods")
+    assert chunks[1].page_content.endswith("Short.")
+
+
+def test_long_paragraphs_are_split_at_sentences_then_words_with_overlap():
+    chunker = TokenChunker(chunk_tokens=10, overlap_tokens=4, count_tokens=_count_words)
+    sentences = " ".join(f"Sentence {index} has four." for index in range(6))
+    table = " ".join(str(value) for value in range(25))
+
+    chunks = chunker.split_documents(_pages(f"{sentences}\n\n{table}"))
+
+    assert all(chunk.metadata["num_tokens"] <= 10 for chunk in chunks)
+    assert chunks[0].page_content == "Sentence 0 has four. Sentence 1 has four."
+    # the next chunk repeats the last sentence of the previous one
+    assert chunks[1].page_content.startswith("Sentence 1 has four.")
+    assert " ".join(chunk.page_content for chunk in chunks).endswith("20 21 22 23 24")
+
+
+@pytest.mark.skipif(not _tiktoken_available(), reason="needs tiktoken and its encoding files")
+def test_extractor_counts_chunk_size_in_tokens(tmp_path):
+    with open(os.path.join(tmp_path, "paper.pdf"), "wb") as pdf_file:
+        pdf_file.write(make_pdf("Paper", "Finding about spinal growth and tethering outcomes. " * 60))
+    extractor = LangchainPDFTextExtractor(input_folder=tmp_path, chunk_size=64, chunk_overlap=8, chunk_size_unit="tokens")
+
+    chunks = extractor.pdf_directory_to_chunks_with_ids()
+
+    encoding = get_tokenizer()
+    assert get_tokenizer() is encoding
+    assert len(chunks) > 1
+    assert all(len(encoding.encode(chunk.page_content)) <= 64 + 2 for chunk in chunks)
+
+
+def test_unknown_chunk_size_unit_is_rejected():
+    with pytest.raises(ValueError, match="chunk_size_unit"):
+        LangchainPDFTextExtractor(chunk_size_unit="pages")
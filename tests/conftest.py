@@ -12,6 +12,16 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 src_path = os.path.join(project_root, 'src')
 sys.path.insert(0, src_path)
 
+from s2_stand_in_server import S2StandInServer
+
+
+def _point_s2_env_at(monkeypatch, url):
+    monkeypatch.setenv("S2_API_KEY", "stand-in-key")
+    monkeypatch.setenv("S2_BASE_GRAPH_URL", url)
+    monkeypatch.setenv("S2_PAPER_FIELDS", "title,authors,year,isOpenAccess,openAccessPdf,fieldsOfStudy,journal,abstract,externalIds")
+    monkeypatch.setenv("S2_SEARCH_FIELDS", "paperId,title,externalIds")
+    monkeypatch.delenv("S2_CACHE_PATH", raising=False)
+
 @fixture
 async def test_client():
     async with aiohttp.ClientSession() as session:
@@ -43,4 +53,24 @@ def test_query() -> dict:
         "authors": "Christian D'Andrea",
         "year": "2023"
     }
-    
\ No newline at end of file
+
+@fixture
+async def s2_stand_in(monkeypatch):
+    """
+    Local Semantic Scholar stand-in on the test's event loop, with the S2_*
+    environment pointed at it. Adjust its behaviour attributes as needed.
+    """
+    server = S2StandInServer()
+    _point_s2_env_at(monkeypatch, await server.start())
+    yield server
+    await server.close()
+
+@fixture
+def s2_stand_in_thread(monkeypatch):
+    """
+    Same stand-in served from a background thread, for synchronous code.
+    """
+    server = S2StandInServer()
+    with server.running_in_thread():
+        _point_s2_env_at(monkeypatch, server.url)
+        yield server
@@ -0,0 +1,385 @@
+"""
+Local stand-in for the Semantic Scholar graph API, for offline and
+deterministic testing and benchmarking of the search and download path.
+
+Serves /paper/search, /paper/search/bulk, /paper/batch, /author/batch
+and open-access PDF URLs from the recorded fixtures in tests/fixtures/s2.
+Queries that are not recorded get deterministic synthetic results, so
+load tests can use any query list.
+Latency, bursts of 429s and random failure rates are configurable.
+
+Point SemanticScholarInterface at it through S2_BASE_GRAPH_URL, e.g.
+
+    python tests/s2_stand_in_server.py --port 8765 --latency 0.2 --burst-429-every 20
+    S2_BASE_GRAPH_URL=http://127.0.0.1:8765 python -m ...
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import random
+import threading
+from collections import Counter
+
+from aiohttp import web
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "s2", "search_responses.json")
+SYNTHETIC_RESULTS_PER_QUERY = 250
+SYNTHETIC_BULK_RESULTS_PER_QUERY = 2500
+BULK_PAGE_SIZE = 1000
+
+
+def make_pdf(title: str, body: str) -> bytes:
+    """
+    Builds a minimal, valid single-page PDF with a real text layer: the
+    title, an "Abstract" heading and the body text.
+    """
+    def escape(text):
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    lines = [title, "", "Abstract"]
+    words, line = body.split(), ""
+    for word in words:
+        if len(line) + len(word) > 80:
+            lines.append(line)
+            line = ""
+        line = f"{line} {word}".strip()
+    lines.append(line)
+    lines.extend(["", "1 Introduction", "The remainder of the paper is not part of the abstract."])
+
+    text_ops = ["BT", "/F1 11 Tf", "14 TL", "72 720 Td"]
+    for line in lines:
+        text_ops.append(f"({escape(line)}) Tj T*")
+    text_ops.append("ET")
+    stream = "\n".join(text_ops).encode("latin-1", "replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+def _synthetic_paper(query: str, rank: int) -> dict:
+    paper_id = hashlib.sha1(f"{query}:{rank}".encode("utf-8")).hexdigest()
+    return {
+        "paperId": paper_id,
+        "externalIds": {"DOI": f"10.5555/synthetic.{paper_id[:12]}"},
+        "title": f"{query} (synthetic result {rank})",
+        "authors": [{"authorId": f"9{int(paper_id[:6], 16)}", "name": f"Synthetic Author {paper_id[:4]}"}],
+        "year": 2000 + rank % 25,
+        "isOpenAccess": rank % 2 == 0,
+        "openAccessPdf": {"url": f"/pdfs/{paper_id}.pdf", "status": "GREEN"} if rank % 2 == 0 else None,
+        "fieldsOfStudy": ["Medicine"],
+        "journal": {"name": "Journal of Synthetic Results"},
+        "abstract": f"Synthetic abstract number {rank} for the query {query}." if rank % 3 else None,
+    }
+
+
+class S2StandInServer:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        burst_429_every: int = 0,
+        burst_429_length: int = 1,
+        retry_after: float = 0.0,
+        failure_rate: float = 0.0,
+        pdf_latency: float = 0.0,
+        seed: int = 0,
+        fixtures_path: str = FIXTURES_PATH,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        :param latency: Seconds added before every API response.
+        :param latency_jitter: Extra uniformly random latency, up to this many seconds.
+        :param burst_429_every: Every Nth API request starts a burst of 429s (0 disables).
+        :param burst_429_length: Number of consecutive 429 responses per burst.
+        :param retry_after: Value of the Retry-After header sent with 429s.
+        :param failure_rate: Probability of answering an API request with a 500.
+        :param pdf_latency: Seconds added before every PDF response.
+        :param seed: Seed for jitter and failures, so runs are reproducible.
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.burst_429_every = burst_429_every
+        self.burst_429_length = burst_429_length
+        self.retry_after = retry_after
+        self.failure_rate = failure_rate
+        self.pdf_latency = pdf_latency
+        self.random = random.Random(seed)
+        self.host = host
+        self.port = port
+
+        with open(fixtures_path, "r") as file:
+            fixtures = json.load(file)
+        self.papers = {paper["paperId"]: paper for paper in fixtures["papers"]}
+        self.queries = fixtures["queries"]
+        # paper ids whose PDF link leads to an HTML landing page instead
+        self.paywalled_pdfs = set()
+
+        self.request_counts = Counter()
+        self.status_counts = Counter()
+        self._num_api_requests = 0
+        self._remaining_429s = 0
+        self._runner = None
+        self.url = None
+
+    def _results_for_query(self, query: str, num_synthetic: int = SYNTHETIC_RESULTS_PER_QUERY) -> list:
+        if query in self.queries:
+            return [self.papers[paper_id] for paper_id in self.queries[query]]
+        results = [_synthetic_paper(query, rank) for rank in range(num_synthetic)]
+        for paper in results:
+            self.papers.setdefault(paper["paperId"], paper)
+        return results
+
+    def _project(self, paper: dict, fields: str, base_url: str) -> dict:
+        requested = {field.strip() for field in (fields or "title").split(",") if field.strip()}
+        projected = {"paperId": paper["paperId"]}
+        for field in requested:
+            if field in paper:
+                projected[field] = paper[field]
+        pdf = projected.get("openAccessPdf")
+        if pdf and pdf.get("url", "").startswith("/"):
+            projected["openAccessPdf"] = {**pdf, "url": f"{base_url}{pdf['url']}"}
+        return projected
+
+    async def _misbehave(self, request):
+        """
+        Applies latency, 429 bursts and random failures. Returns a response
+        to send instead of the real one, or None.
+        """
+        self._num_api_requests += 1
+        delay = self.latency + self.random.uniform(0, self.latency_jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.burst_429_every and self._num_api_requests % self.burst_429_every == 0:
+            self._remaining_429s = self.burst_429_length
+        if self._remaining_429s > 0:
+            self._remaining_429s -= 1
+            self.status_counts[429] += 1
+            return web.json_response(
+                {"message": "Too Many Requests"}, status=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            self.status_counts[500] += 1
+            return web.json_response({"message": "Internal Server Error"}, status=500)
+        return None
+
+    async def _search(self, request):
+        self.request_counts["search"] += 1
+        failure = await self._misbehave(request)
+        if failure is not None:
+            return failure
+
+        query = request.query.get("query", "")
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 10))
+        results = self._results_for_query(query)
+        page = results[offset:offset + limit]
+        body = {
+            "total": len(results),
+            "offset": offset,
+            "data": [self._project(paper, request.query.get("fields"), self.url) for paper in page],
+        }
+        if offset + limit < len(results):
+            body["next"] = offset + limit
+        self.status_counts[200] += 1
+        return web.json_response(body)
+
+    async def _bulk_search(self, request):
+        self.request_counts["bulk_search"] += 1
+        failure = await self._misbehave(request)
+        if failure is not None:
+            return failure
+
+        query = request.query.get("query", "")
+        offset = int(request.query.get("token") or 0)
+        results = self._results_for_query(query, num_synthetic=SYNTHETIC_BULK_RESULTS_PER_QUERY)
+        if "year" in request.query:
+            min_year = int(request.query["year"].rstrip("-"))
+            results = [paper for paper in results if (paper.get("year") or 0) >= min_year]
+        page = results[offset:offset + BULK_PAGE_SIZE]
+        body = {
+            "total": len(results),
+            "token": str(offset + BULK_PAGE_SIZE) if offset + BULK_PAGE_SIZE < len(results) else None,
+            "data": [self._project(paper, request.query.get("fields"), self.url) for paper in page],
+        }
+        self.status_counts[200] += 1
+        return web.json_response(body)
+
+    async def _batch(self, request):
+        self.request_counts["batch"] += 1
+        failure = await self._misbehave(request)
+        if failure is not None:
+            return failure
+
+        ids = (await request.json()).get("ids", [])
+        if len(ids) > 500:
+            self.status_counts[400] += 1
+            return web.json_response({"error": "Cannot process more than 500 ids"}, status=400)
+        fields = request.query.get("fields")
+        self.status_counts[200] += 1
+        return web.json_response([
+            self._project(self.papers[paper_id], fields, self.url) if paper_id in self.papers else None
+            for paper_id in ids
+        ])
+
+    def _papers_by_author(self, author_id: str) -> list:
+        return [
+            paper for paper in self.papers.values()
+            if any(author.get("authorId") == author_id for author in paper.get("authors") or [])
+        ]
+
+    def _author_record(self, author_id: str, fields: str = ""):
+        papers = self._papers_by_author(author_id)
+        if not papers:
+            return None
+        name = next(
+            author["name"] for author in papers[0]["authors"] if author.get("authorId") == author_id
+        )
+        record = {
+            "authorId": author_id,
+            "name": name,
+            "paperCount": len(papers),
+            # deterministic stand-in for a citation count
+            "citationCount": int(hashlib.sha1(author_id.encode("utf-8")).hexdigest()[:4], 16),
+            "hIndex": len(papers),
+        }
+        # nested paper fields, e.g. "papers.title,papers.year"
+        paper_fields = [field.strip()[len("papers."):] for field in fields.split(",") if field.strip().startswith("papers.")]
+        if paper_fields:
+            record["papers"] = [self._project(paper, ",".join(paper_fields), self.url) for paper in papers]
+        return record
+
+    async def _author_batch(self, request):
+        self.request_counts["author_batch"] += 1
+        failure = await self._misbehave(request)
+        if failure is not None:
+            return failure
+
+        ids = (await request.json()).get("ids", [])
+        if len(ids) > 1000:
+            self.status_counts[400] += 1
+            return web.json_response({"error": "Cannot process more than 1000 ids"}, status=400)
+        fields = request.query.get("fields", "")
+        self.status_counts[200] += 1
+        return web.json_response([self._author_record(author_id, fields) for author_id in ids])
+
+    async def _pdf(self, request):
+        self.request_counts["pdf"] += 1
+        if self.pdf_latency:
+            await asyncio.sleep(self.pdf_latency)
+        paper_id = request.match_info["paper_id"]
+        paper = self.papers.get(paper_id)
+        if paper is None:
+            self.status_counts[404] += 1
+            return web.Response(status=404, text="Not Found")
+        self.status_counts[200] += 1
+        if paper_id in self.paywalled_pdfs:
+            return web.Response(
+                text=f"<html><body><h1>{paper['title']}</h1><p>Sign in to read.</p></body></html>",
+                content_type="text/html",
+            )
+        return web.Response(
+            body=make_pdf(paper["title"], paper.get("abstract") or "Abstract not provided."),
+            content_type="application/pdf",
+        )
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/paper/search", self._search)
+        app.router.add_get("/paper/search/bulk", self._bulk_search)
+        app.router.add_post("/paper/batch", self._batch)
+        app.router.add_post("/author/batch", self._author_batch)
+        app.router.add_get("/pdfs/{paper_id}.pdf", self._pdf)
+        return app
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{self.host}:{port}"
+        return self.url
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @contextlib.contextmanager
+    def running_in_thread(self):
+        """
+        Serves from a background event loop, for tests of synchronous code.
+        """
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+        try:
+            yield self
+        finally:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Semantic Scholar stand-in server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--burst-429-every", type=int, default=0)
+    parser.add_argument("--burst-429-length", type=int, default=1)
+    parser.add_argument("--retry-after", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--pdf-latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = S2StandInServer(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        burst_429_every=args.burst_429_every,
+        burst_429_length=args.burst_429_length,
+        retry_after=args.retry_after,
+        failure_rate=args.failure_rate,
+        pdf_latency=args.pdf_latency,
+        seed=args.seed,
+        port=args.port,
+    )
+
+    async def serve_forever():
+        url = await server.start()
+        print(f"S2 stand-in serving on {url} (set S2_BASE_GRAPH_URL={url})")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        pass